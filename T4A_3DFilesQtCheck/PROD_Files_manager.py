@@ -8,6 +8,7 @@ import mathutils
 import bmesh
 
 from typing import List
+from . import PROD_file_scanner
 from . import PROD_texture_manager
 from . import PROD_uv_analyzer
 from . import PROD_topology_analyzer
@@ -46,19 +47,31 @@ class _SimpleLogger:
 
 logger = _SimpleLogger()
 
+SUPPORTED_EXTENSIONS = ['.fbx', '.glb', '.gltf', '.obj', '.blend', '.abc', '.usd', '.stl']
 
-def _gather_files(path: str, exts: List[str]) -> List[str]:
-    found = []
+
+def _gather_files(path: str, exts: List[str], index=None, only_changes: bool = False) -> List[str]:
+    """Liste les fichiers de ``path`` (voir ``PROD_file_scanner.scan_directory``)."""
     if not path:
-        return found
-    for root, dirs, files in os.walk(path):
-        for f in files:
-            fn = f.lower()
-            for e in exts:
-                if fn.endswith(e):
-                    found.append(os.path.join(root, f))
-                    break
-    return found
+        return []
+    return [entry.path for entry in PROD_file_scanner.scan_directory(path, exts, index, only_changes)]
+
+
+def _get_scan_index(path: str):
+    """Index des fichiers 3D déjà importés depuis ``path`` (None si indisponible)."""
+    if not path or not os.path.isdir(path):
+        return None
+    return PROD_file_scanner.ScanIndex(path, 'models', SUPPORTED_EXTENSIONS)
+
+
+def _log_removed_files(index):
+    """Signale les fichiers indexés supprimés depuis le dernier scan ; retourne leur nombre."""
+    removed = index.removed if index is not None else []
+    if removed:
+        logger.info("[T4A] %d fichier(s) supprimé(s) depuis le dernier scan", len(removed))
+        for path in removed:
+            logger.debug("[T4A] Fichier supprimé: %s", path)
+    return len(removed)
 
 
 def _import_file(filepath: str) -> bool:
@@ -112,10 +125,14 @@ class T4A_OT_ScanAndImport(bpy.types.Operator):
             prefs = None
 
         path = getattr(prefs, 'scan_path', '') if prefs is not None else ''
-        exts = ['.fbx', '.glb', '.gltf', '.obj', '.blend', '.abc', '.usd', '.stl']
-        files = _gather_files(path, exts)
+        only_changes = getattr(prefs, 'scan_only_changes', False) if prefs is not None else False
+        self._scan_path = path
+        self._scan_index = _get_scan_index(path)
+        files = _gather_files(path, SUPPORTED_EXTENSIONS, self._scan_index, only_changes)
+        self._removed_count = _log_removed_files(self._scan_index)
         self.files_count = len(files)
         self._files_list = files
+        self._batch_workers = getattr(prefs, 'batch_import_workers', 0) if prefs is not None else 0
 
         if self.files_count == 0:
             self.report({'INFO'}, "Aucun fichier trouvé dans le chemin configuré.")
@@ -126,9 +143,24 @@ class T4A_OT_ScanAndImport(bpy.types.Operator):
     def draw(self, context):
         layout = self.layout
         layout.label(text=f"Nombre de fichiers trouvés: {self.files_count}")
-        layout.label(text="Souhaitez-vous importer tous ces fichiers dans la scène actuelle ?")
+        if getattr(self, '_removed_count', 0):
+            layout.label(text=f"Fichiers supprimés depuis le dernier scan: {self._removed_count}")
+        if getattr(self, '_batch_workers', 0) > 0:
+            layout.label(text=f"Mode batch: {self._batch_workers} instance(s) Blender en arrière-plan")
+            layout.label(text="Seuls les résultats d'analyse seront ajoutés à la scène.")
+        else:
+            layout.label(text="Souhaitez-vous importer tous ces fichiers dans la scène actuelle ?")
 
     def execute(self, context):
+        # Mode batch : import et analyses dans des workers blender -b
+        if getattr(self, '_batch_workers', 0) > 0 and not bpy.app.background:
+            # Le scan de invoke est repris tel quel
+            from . import PROD_batch_import
+            PROD_batch_import.hand_over_scan(getattr(self, '_scan_path', ''), getattr(self, '_files_list', []),
+                                             getattr(self, '_scan_index', None))
+            result = bpy.ops.t4a.batch_import_directory('INVOKE_DEFAULT')
+            return {'FINISHED'} if 'RUNNING_MODAL' in result else {'CANCELLED'}
+
         # Run scene setup before importing files
         try:
             result = bpy.ops.t4a.setup_scene(targetVolumCube=1.0)
@@ -140,6 +172,7 @@ class T4A_OT_ScanAndImport(bpy.types.Operator):
             self.report({'WARNING'}, "SetupScene call failed — import aborted.")
             return {'CANCELLED'}
 
+        scan_index = getattr(self, '_scan_index', None)
         imported = 0
         failed = 0
         for f in getattr(self, '_files_list', []):
@@ -153,6 +186,12 @@ class T4A_OT_ScanAndImport(bpy.types.Operator):
                 imported += 1
             else:
                 failed += 1
+                if scan_index is not None:
+                    scan_index.discard(f)
+
+        # Les fichiers importés ne seront plus proposés tant qu'ils ne changent pas
+        if scan_index is not None:
+            scan_index.save()
 
         # store results into scene props for UI reporting
         try:
@@ -446,6 +485,9 @@ class T4A_OT_ImportFileToCollection(bpy.types.Operator):
                                 uv_res.max_texel_density = texel_result['summary']['max_density']
                                 uv_res.texel_density_variance = texel_result['summary']['global_variance']
                                 uv_res.texel_density_status = texel_result['summary']['density_status']
+                                uv_res.texel_density_p5 = texel_result['summary'].get('p5', 0.0)
+                                uv_res.texel_density_p50 = texel_result['summary'].get('p50', 0.0)
+                                uv_res.texel_density_p95 = texel_result['summary'].get('p95', 0.0)
                                 
                                 logger.info("[T4A] Analyse texel density réussie: %.1f px/cm (variance: %.1f%%)",
                                            uv_res.average_texel_density, uv_res.texel_density_variance)
@@ -501,6 +543,10 @@ class T4A_OT_ImportFileToCollection(bpy.types.Operator):
                         # Problèmes manifold
                         topo_res.has_manifold_issues = summary['total_manifold_issues'] > 0
                         topo_res.manifold_error_count = summary['total_manifold_issues']
+                        topo_res.boundary_edges_count = summary['total_boundary_edges']
+                        topo_res.non_manifold_edges_count = summary['total_non_manifold_edges']
+                        topo_res.wire_edges_count = summary['total_wire_edges']
+                        topo_res.bowtie_vertices_count = summary['total_bowtie_vertices']
                         
                         # Normales
                         topo_res.inverted_faces_count = summary['total_inverted_faces']
@@ -521,6 +567,7 @@ class T4A_OT_ImportFileToCollection(bpy.types.Operator):
                         topo_res.isolated_vertices_count = summary['total_isolated_vertices']
                         topo_res.has_isolated_vertices = summary['total_isolated_vertices'] > 0
                         topo_res.duplicate_vertices_count = summary['total_duplicate_vertices']
+                        topo_res.duplicate_clusters_count = summary['total_duplicate_clusters']
                         topo_res.has_duplicate_vertices = summary['total_duplicate_vertices'] > 0
                         
                         # Vertex colors
@@ -1076,6 +1123,206 @@ class T4A_OT_NormalizeImportedObjects(bpy.types.Operator):
 # classes tuple will be defined at file end to include all operators
 
 
+def _submit_analysis(request: dict, store, filepath: str):
+    """Envoie une requête Gemini en arrière-plan ; ``store(context, filepath, res)``
+    est appelé sur le thread principal à l'arrivée de la réponse."""
+    from . import PROD_gemini_async
+
+    def on_done(res):
+        store(bpy.context, filepath, res)
+        logger.info('[T4A Analyze] result for %s: %s', os.path.basename(filepath), res)
+        _tag_view3d_redraw()
+
+    PROD_gemini_async.submit_request(request, on_done, os.path.basename(filepath))
+
+
+def _tag_view3d_redraw():
+    try:
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                if area.type == 'VIEW_3D':
+                    area.tag_redraw()
+    except Exception:
+        pass
+
+
+def _submit_batch_analysis(context, found_files, force_refresh=False):
+    """Analyse groupée des fichiers trouvés (plusieurs documents par requête).
+
+    Args:
+        found_files: liste ``[(chemin, 'image' | 'text'), ...]``
+
+    Returns:
+        int: nombre de fichiers envoyés ou relus du cache
+    """
+    from . import PROD_gemini, PROD_gemini_async, PROD_gemini_batch, PROD_text_extract
+
+    stores = {}
+    requests = []
+    processed = 0
+    for filepath, found_type in found_files:
+        try:
+            if found_type == 'image':
+                request, error = PROD_gemini.build_image_request(None, filepath, context=context, use_text_prompt=True,
+                                                                 force_refresh=force_refresh)
+                stores[filepath] = _store_image_dimensions_result
+            else:
+                text = PROD_text_extract.extract_document_text(filepath)['text']
+                request, error = PROD_gemini.build_text_request(None, text, context=context, file_path=filepath,
+                                                                force_refresh=force_refresh)
+                stores[filepath] = _store_text_analysis_result
+        except Exception as e:
+            logger.error('[T4A] Analysis failed for %s: %s', filepath, e)
+            continue
+        if error:
+            logger.error('[T4A] Analysis failed for %s: %s', filepath, error['detail'])
+            continue
+        processed += 1
+        cached = PROD_gemini_batch.lookup_cached(request)
+        if cached is not None:
+            stores[filepath](context, filepath, cached)
+            continue
+        requests.append((filepath, request))
+
+    def on_error(detail):
+        # Exception dans le thread : tout le lot est en erreur
+        logger.error('[T4A] Batch analysis failed: %s', detail)
+
+    def on_done(results):
+        for filepath, res in results.items():
+            stores[filepath](bpy.context, filepath, res)
+            logger.info('[T4A Analyze] result for %s: %s', os.path.basename(filepath), res)
+        _tag_view3d_redraw()
+
+    batches = PROD_gemini_batch.plan_batches(requests)
+    for batch in batches:
+        header, entries = PROD_gemini_batch.prepare_batch(batch, context)
+        PROD_gemini_async.client.submit_call(PROD_gemini_batch.generate_batch, on_done,
+                                             f"lot de {len(entries)}", header, entries, on_error=on_error)
+    logger.info('[T4A] %d fichier(s) à analyser en %d requête(s) (%d en cache)',
+                len(requests), len(batches), processed - len(requests))
+    if not requests:
+        _tag_view3d_redraw()
+    return processed
+
+
+def _store_text_analysis_result(context, filepath: str, res: dict):
+    """Écrit le résultat d'une analyse texte/PDF dans ``scene.t4a_dimensions``."""
+    detail = res.get('detail')
+    # coerce detail to string
+    if isinstance(detail, dict):
+        detail_str = str(detail)
+    else:
+        detail_str = str(detail)
+
+    # store into scene collection - chercher l'entrée existante ou créer
+    try:
+        scene = context.scene
+        dims = getattr(scene, 't4a_dimensions', None)
+        if dims is not None:
+            # Chercher l'entrée existante par nom de fichier
+            base_name = os.path.basename(filepath)
+            # Enlever l'extension pour correspondre au nom utilisé lors de l'import
+            file_stem = os.path.splitext(base_name)[0]
+            
+            item = None
+            for existing_item in dims:
+                # Correspondance exacte ou nom contenu dans le nom du fichier importé
+                if existing_item.name == base_name or existing_item.name == file_stem or file_stem in existing_item.name:
+                    item = existing_item
+                    break
+            
+            # Si aucune entrée existante trouvée, créer une nouvelle
+            if item is None:
+                item = dims.add()
+                item.name = base_name
+                item.expanded = False
+            
+            # === NOUVELLE LOGIQUE: Utiliser le système amélioré ===
+            # Mettre à jour les dimensions IA
+            item.dimensions = detail_str  # Garder pour compatibilité
+            item.ai_dimensions = detail_str
+            item.ai_analysis_success = True
+            item.ai_analysis_error = ""
+            
+            # Essayer de calculer les dimensions de la scène si une collection existe
+            try:
+                from . import PROD_dimension_analyzer
+                
+                # Chercher la collection correspondante
+                collection_name = ""
+                for coll in bpy.data.collections:
+                    if file_stem in coll.name:
+                        collection_name = coll.name
+                        break
+                
+                if collection_name:
+                    # Effectuer l'analyse complète
+                    analysis_result = PROD_dimension_analyzer.analyze_collection_dimensions(
+                        collection_name, detail_str
+                    )
+                    
+                    # Mettre à jour le résultat avec toutes les nouvelles propriétés
+                    PROD_dimension_analyzer.update_dimension_result(item, analysis_result)
+                    
+                    logger.info(f'[T4A] Analyse dimensions complète effectuée pour {collection_name}')
+                else:
+                    # Pas de collection trouvée, juste marquer l'IA comme réussie
+                    item.tolerance_status = 'NO_AI_DATA'
+                    logger.info(f'[T4A] Aucune collection trouvée pour {file_stem}, IA seule mise à jour')
+                    
+            except Exception as analysis_error:
+                # En cas d'erreur d'analyse, au moins marquer l'IA comme réussie
+                item.ai_analysis_error = f"Erreur analyse auto: {str(analysis_error)[:50]}"
+                logger.warning(f'[T4A] Erreur analyse auto dimensions: {analysis_error}')
+    except Exception:
+        pass
+
+
+def _store_image_dimensions_result(context, filepath: str, res: dict):
+    """Écrit le résultat d'une analyse d'image (dimensions) dans ``scene.t4a_dimensions``."""
+    detail = res.get('detail')
+    # coerce detail to string
+    if isinstance(detail, dict):
+        detail_str = str(detail)
+    else:
+        detail_str = str(detail)
+
+    # store into scene collection - chercher l'entrée existante ou créer
+    scene = context.scene
+    dims = getattr(scene, 't4a_dimensions', None)
+    if dims is not None:
+        # Chercher l'entrée existante par nom de fichier
+        base_name = os.path.basename(filepath)
+        # Enlever l'extension pour correspondre au nom utilisé lors de l'import
+        file_stem = os.path.splitext(base_name)[0]
+
+        item = None
+        for existing_item in dims:
+            # Correspondance exacte ou nom contenu dans le nom du fichier importé
+            if existing_item.name == base_name or existing_item.name == file_stem or file_stem in existing_item.name:
+                item = existing_item
+                break
+
+        # Si aucune entrée existante trouvée, créer une nouvelle avec préfixe IMG_
+        if item is None:
+            item = dims.add()
+            item.name = f"IMG_{base_name}"
+            item.expanded = False
+
+        # === NOUVELLE LOGIQUE: Utiliser le système amélioré ===
+        # Mettre à jour les dimensions IA (analyse d'image)
+        item.dimensions = detail_str  # Garder pour compatibilité
+        item.ai_dimensions = detail_str
+        item.ai_analysis_success = True
+        item.ai_analysis_error = ""
+
+        # Pour les images, pas de collection 3D associée généralement
+        # Marquer comme données IA uniquement
+        item.tolerance_status = 'NO_AI_DATA'  # Pas de comparaison possible
+        item.scene_dimensions = "Image - pas de modèle 3D"
+
+
 class T4A_OT_TestGeminiConnection(bpy.types.Operator):
     bl_idname = "t4a.test_gemini_connection"
     bl_label = "Test Gemini Connection"
@@ -1115,6 +1362,18 @@ class T4A_OT_AnalyzeTextFile(bpy.types.Operator):
     bl_description = "Extract text from a TXT or PDF and ask Gemini to extract 3D dimensions"
 
     filepath: bpy.props.StringProperty(name="Filepath", subtype='FILE_PATH')
+    run_async: bpy.props.BoolProperty(
+        name="Asynchrone",
+        description="Envoie la requête en arrière-plan ; le résultat est écrit à son arrivée",
+        default=False,
+        options={'SKIP_SAVE'}
+    )
+    force_refresh: bpy.props.BoolProperty(
+        name="Forcer l'actualisation",
+        description="Ignore la réponse IA en cache et interroge à nouveau l'API",
+        default=False,
+        options={'SKIP_SAVE'}
+    )
 
     def execute(self, context):
         filepath = self.filepath
@@ -1122,30 +1381,22 @@ class T4A_OT_AnalyzeTextFile(bpy.types.Operator):
             self.report({'ERROR'}, "File not found")
             return {'CANCELLED'}
 
-        # extract text
+        # extract text (pages limitées et préfiltrées, voir PROD_text_extract)
         text = ''
         ext = os.path.splitext(filepath)[1].lower()
         try:
-            if ext == '.txt':
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    text = f.read()
-            elif ext == '.pdf':
-                try:
-                    import PyPDF2
-                    reader = PyPDF2.PdfReader(filepath)
-                    pages = []
-                    for p in reader.pages:
-                        try:
-                            pages.append(p.extract_text() or '')
-                        except Exception:
-                            pages.append('')
-                    text = '\n'.join(pages)
-                except Exception:
-                    self.report({'ERROR'}, 'PyPDF2 not available or failed to read PDF')
-                    return {'CANCELLED'}
-            else:
+            if ext not in ('.txt', '.pdf'):
                 self.report({'ERROR'}, 'Unsupported file type')
                 return {'CANCELLED'}
+            from . import PROD_text_extract
+            try:
+                extracted = PROD_text_extract.extract_document_text(filepath)
+            except Exception:
+                if ext != '.pdf':
+                    raise
+                self.report({'ERROR'}, 'PyPDF2 not available or failed to read PDF')
+                return {'CANCELLED'}
+            text = extracted['text']
         except Exception as e:
             self.report({'ERROR'}, f'Failed to read file: {e}')
             return {'CANCELLED'}
@@ -1214,79 +1465,24 @@ class T4A_OT_AnalyzeTextFile(bpy.types.Operator):
 
             from . import PROD_gemini
 
+            if self.run_async and not bpy.app.background:
+                request, error = PROD_gemini.build_text_request(api_key, text, model=model_name,
+                                                                context=context, file_path=filepath,
+                                                                force_refresh=self.force_refresh)
+                if error:
+                    self.report({'ERROR'}, f"Analyze failed: {error['detail']}")
+                    return {'CANCELLED'}
+                _submit_analysis(request, _store_text_analysis_result, filepath)
+                self.report({'INFO'}, f'Analyse envoyée: {os.path.basename(filepath)}')
+                return {'FINISHED'}
+
             if model_name:
-                res = PROD_gemini.analyze_text_dimensions(api_key, text, model=model_name, context=context, file_path=filepath)
-            else:
-                res = PROD_gemini.analyze_text_dimensions(api_key, text, context=context, file_path=filepath)
-            detail = res.get('detail')
-            # coerce detail to string
-            if isinstance(detail, dict):
-                detail_str = str(detail)
+                res = PROD_gemini.analyze_text_dimensions(api_key, text, model=model_name, context=context, file_path=filepath,
+                                                          force_refresh=self.force_refresh)
             else:
-                detail_str = str(detail)
-
-            # store into scene collection - chercher l'entrée existante ou créer
-            try:
-                scene = context.scene
-                dims = getattr(scene, 't4a_dimensions', None)
-                if dims is not None:
-                    # Chercher l'entrée existante par nom de fichier
-                    base_name = os.path.basename(filepath)
-                    # Enlever l'extension pour correspondre au nom utilisé lors de l'import
-                    file_stem = os.path.splitext(base_name)[0]
-                    
-                    item = None
-                    for existing_item in dims:
-                        # Correspondance exacte ou nom contenu dans le nom du fichier importé
-                        if existing_item.name == base_name or existing_item.name == file_stem or file_stem in existing_item.name:
-                            item = existing_item
-                            break
-                    
-                    # Si aucune entrée existante trouvée, créer une nouvelle
-                    if item is None:
-                        item = dims.add()
-                        item.name = base_name
-                        item.expanded = False
-                    
-                    # === NOUVELLE LOGIQUE: Utiliser le système amélioré ===
-                    # Mettre à jour les dimensions IA
-                    item.dimensions = detail_str  # Garder pour compatibilité
-                    item.ai_dimensions = detail_str
-                    item.ai_analysis_success = True
-                    item.ai_analysis_error = ""
-                    
-                    # Essayer de calculer les dimensions de la scène si une collection existe
-                    try:
-                        from . import PROD_dimension_analyzer
-                        
-                        # Chercher la collection correspondante
-                        collection_name = ""
-                        for coll in bpy.data.collections:
-                            if file_stem in coll.name:
-                                collection_name = coll.name
-                                break
-                        
-                        if collection_name:
-                            # Effectuer l'analyse complète
-                            analysis_result = PROD_dimension_analyzer.analyze_collection_dimensions(
-                                collection_name, detail_str
-                            )
-                            
-                            # Mettre à jour le résultat avec toutes les nouvelles propriétés
-                            PROD_dimension_analyzer.update_dimension_result(item, analysis_result)
-                            
-                            logger.info(f'[T4A] Analyse dimensions complète effectuée pour {collection_name}')
-                        else:
-                            # Pas de collection trouvée, juste marquer l'IA comme réussie
-                            item.tolerance_status = 'NO_AI_DATA'
-                            logger.info(f'[T4A] Aucune collection trouvée pour {file_stem}, IA seule mise à jour')
-                            
-                    except Exception as analysis_error:
-                        # En cas d'erreur d'analyse, au moins marquer l'IA comme réussie
-                        item.ai_analysis_error = f"Erreur analyse auto: {str(analysis_error)[:50]}"
-                        logger.warning(f'[T4A] Erreur analyse auto dimensions: {analysis_error}')
-            except Exception:
-                pass
+                res = PROD_gemini.analyze_text_dimensions(api_key, text, context=context, file_path=filepath,
+                                                          force_refresh=self.force_refresh)
+            _store_text_analysis_result(context, filepath, res)
 
             logger.info('[T4A Analyze] result: %s', res)
             # If server returned 404, give a helpful report to the user
@@ -1363,6 +1559,18 @@ class T4A_OT_AnalyzeImageFileForDimensions(bpy.types.Operator):
     bl_description = "Analyze a JPG/PNG image using text analysis prompt to extract dimensions"
 
     filepath: bpy.props.StringProperty(name="Filepath", subtype='FILE_PATH')
+    run_async: bpy.props.BoolProperty(
+        name="Asynchrone",
+        description="Envoie la requête en arrière-plan ; le résultat est écrit à son arrivée",
+        default=False,
+        options={'SKIP_SAVE'}
+    )
+    force_refresh: bpy.props.BoolProperty(
+        name="Forcer l'actualisation",
+        description="Ignore la réponse IA en cache et interroge à nouveau l'API",
+        default=False,
+        options={'SKIP_SAVE'}
+    )
 
     def execute(self, context):
         filepath = self.filepath
@@ -1395,63 +1603,36 @@ class T4A_OT_AnalyzeImageFileForDimensions(bpy.types.Operator):
 
             from . import PROD_gemini
 
+            if self.run_async and not bpy.app.background:
+                request, error = PROD_gemini.build_image_request(api_key, filepath, model=model_name or None,
+                                                                 context=context, use_text_prompt=True,
+                                                                 force_refresh=self.force_refresh)
+                if error:
+                    self.report({'ERROR'}, f"Image analysis failed: {error['detail']}")
+                    return {'CANCELLED'}
+                _submit_analysis(request, _store_image_dimensions_result, filepath)
+                self.report({'INFO'}, f'Analyse envoyée: {os.path.basename(filepath)}')
+                return {'FINISHED'}
+
             # Call the image analysis function with text prompt
             if model_name:
                 res = PROD_gemini.analyze_image_with_ocr(
                     api_key, filepath, 
                     model=model_name, 
                     context=context, 
-                    use_text_prompt=True  # Utiliser le prompt text pour extraire les dimensions
+                    use_text_prompt=True,  # Utiliser le prompt text pour extraire les dimensions
+                    force_refresh=self.force_refresh
                 )
             else:
                 res = PROD_gemini.analyze_image_with_ocr(
                     api_key, filepath, 
                     context=context, 
-                    use_text_prompt=True  # Utiliser le prompt text pour extraire les dimensions
+                    use_text_prompt=True,  # Utiliser le prompt text pour extraire les dimensions
+                    force_refresh=self.force_refresh
                 )
                 
-            detail = res.get('detail')
-            # coerce detail to string
-            if isinstance(detail, dict):
-                detail_str = str(detail)
-            else:
-                detail_str = str(detail)
-
-            # store into scene collection - chercher l'entrée existante ou créer
             try:
-                scene = context.scene
-                dims = getattr(scene, 't4a_dimensions', None)
-                if dims is not None:
-                    # Chercher l'entrée existante par nom de fichier
-                    base_name = os.path.basename(filepath)
-                    # Enlever l'extension pour correspondre au nom utilisé lors de l'import
-                    file_stem = os.path.splitext(base_name)[0]
-                    
-                    item = None
-                    for existing_item in dims:
-                        # Correspondance exacte ou nom contenu dans le nom du fichier importé
-                        if existing_item.name == base_name or existing_item.name == file_stem or file_stem in existing_item.name:
-                            item = existing_item
-                            break
-                    
-                    # Si aucune entrée existante trouvée, créer une nouvelle avec préfixe IMG_
-                    if item is None:
-                        item = dims.add()
-                        item.name = f"IMG_{base_name}"
-                        item.expanded = False
-                    
-                    # === NOUVELLE LOGIQUE: Utiliser le système amélioré ===
-                    # Mettre à jour les dimensions IA (analyse d'image)
-                    item.dimensions = detail_str  # Garder pour compatibilité
-                    item.ai_dimensions = detail_str
-                    item.ai_analysis_success = True
-                    item.ai_analysis_error = ""
-                    
-                    # Pour les images, pas de collection 3D associée généralement
-                    # Marquer comme données IA uniquement
-                    item.tolerance_status = 'NO_AI_DATA'  # Pas de comparaison possible
-                    item.scene_dimensions = "Image - pas de modèle 3D"
-                
+                _store_image_dimensions_result(context, filepath, res)
                 self.report({'INFO'}, f'Image analyzed for dimensions: {os.path.basename(filepath)}')
                 
                 # log debug if debug_mode is enabled
@@ -1459,7 +1640,7 @@ class T4A_OT_AnalyzeImageFileForDimensions(bpy.types.Operator):
                     from . import PROD_Parameters
                     prefs = PROD_Parameters.get_addon_preferences()
                     if getattr(prefs, 'debug_mode', False):
-                        print(f"[DEBUG] Image dimensions analysis result: {detail_str}")
+                        print(f"[DEBUG] Image dimensions analysis result: {res.get('detail')}")
                 except Exception:
                     pass
                     
@@ -1622,6 +1803,13 @@ class T4A_OT_FindMatchingTextAndAnalyze(bpy.types.Operator):
     bl_label = "Find matching files and analyze"
     bl_description = "Look for JPG/PNG/TXT/PDF files with same base name as imported 3D files and analyze them (Images prioritized)"
 
+    force_refresh: bpy.props.BoolProperty(
+        name="Forcer l'actualisation",
+        description="Ignore les réponses IA en cache et interroge à nouveau l'API",
+        default=False,
+        options={'SKIP_SAVE'}
+    )
+
     def execute(self, context):
         try:
             from . import PROD_Parameters
@@ -1635,6 +1823,11 @@ class T4A_OT_FindMatchingTextAndAnalyze(bpy.types.Operator):
                 self.report({'ERROR'}, 'No scan path configured')
                 return {'CANCELLED'}
 
+            # Analyse groupée si activée (plusieurs documents par requête)
+            from . import PROD_gemini_batch
+            batch_mode = PROD_gemini_batch.get_batch_settings()[0] > 1 and not bpy.app.background
+            found_files = []
+
             # iterate imported collections in scene root
             scene = context.scene
             root_coll = scene.collection
@@ -1668,20 +1861,27 @@ class T4A_OT_FindMatchingTextAndAnalyze(bpy.types.Operator):
                             found_type = 'text'
                             break
                 
-                if found:
+                if found and batch_mode:
+                    found_files.append((found, found_type))
+                elif found:
                     # call appropriate analyze operator based on file type
                     try:
+                        # Requêtes envoyées en parallèle, résultats écrits à leur arrivée
                         if found_type == 'image':
                             # Utiliser le prompt d'analyse de texte pour extraire les dimensions des images
-                            bpy.ops.t4a.analyze_image_file_for_dimensions(filepath=found)
+                            bpy.ops.t4a.analyze_image_file_for_dimensions(filepath=found, run_async=True,
+                                                                          force_refresh=self.force_refresh)
                             logger.info('[T4A] Image analysis (dimensions) launched for: %s', found)
                         else:  # text/pdf
-                            bpy.ops.t4a.analyze_text_file(filepath=found)
+                            bpy.ops.t4a.analyze_text_file(filepath=found, run_async=True, force_refresh=self.force_refresh)
                             logger.info('[T4A] Text analysis launched for: %s', found)
                         processed += 1
                     except Exception as e:
                         logger.error('[T4A] Analysis failed for %s: %s', found, e)
 
+            if found_files:
+                processed += _submit_batch_analysis(context, found_files, self.force_refresh)
+
             if processed > 0:
                 self.report({'INFO'}, f'Processed {processed} matching files')
             else:
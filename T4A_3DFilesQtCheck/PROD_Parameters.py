@@ -153,6 +153,108 @@ Provide detailed analysis focusing on 3D modeling requirements.""",
         max=300
     )
 
+    api_max_in_flight: bpy.props.IntProperty(
+        name="Requêtes simultanées",
+        description="Nombre maximum de requêtes Gemini envoyées en parallèle en mode asynchrone",
+        default=4,
+        min=1,
+        max=16
+    )
+
+    api_max_retries: bpy.props.IntProperty(
+        name="Tentatives API",
+        description="Nouvelles tentatives (backoff exponentiel) sur erreurs 429/5xx ou réseau",
+        default=3,
+        min=0,
+        max=10
+    )
+
+    ai_cache_enabled: bpy.props.BoolProperty(
+        name="Cache IA",
+        description="Réutilise les réponses IA pour un même modèle, prompt et fichier "
+                    "(cache stocké dans le dossier .t4a_ai_cache du Scan Path)",
+        default=True
+    )
+
+    ai_cache_ttl_hours: bpy.props.IntProperty(
+        name="Validité Cache IA (h)",
+        description="Durée de validité d'une réponse en cache, en heures (0 = illimitée)",
+        default=168,
+        min=0,
+        max=8760
+    )
+
+    ai_cache_max_mb: bpy.props.IntProperty(
+        name="Taille Cache IA (Mo)",
+        description="Taille maximale du cache IA : réponses, images réduites et textes extraits (les fichiers les moins récemment utilisés sont supprimés)",
+        default=50,
+        min=1,
+        max=10000
+    )
+
+    ocr_max_edge: bpy.props.IntProperty(
+        name="Taille Max Image IA (px)",
+        description="Plus grand côté des images envoyées à l'analyse IA ; les images plus grandes "
+                    "sont réduites et réencodées en JPEG (0 = envoi de l'original)",
+        default=2048,
+        min=0,
+        max=16384
+    )
+
+    ocr_jpeg_quality: bpy.props.IntProperty(
+        name="Qualité JPEG IA",
+        description="Qualité JPEG des images réencodées pour l'analyse IA",
+        default=85,
+        min=1,
+        max=100
+    )
+
+    pdf_max_pages: bpy.props.IntProperty(
+        name="Pages PDF Max",
+        description="Nombre maximum de pages lues dans un PDF avant l'analyse IA (0 = toutes)",
+        default=50,
+        min=0,
+        max=10000
+    )
+
+    pdf_max_chars: bpy.props.IntProperty(
+        name="Caractères Max",
+        description="Nombre maximum de caractères de texte envoyés à l'analyse IA (0 = illimité)",
+        default=20000,
+        min=0,
+        max=1000000
+    )
+
+    pdf_prefilter: bpy.props.BoolProperty(
+        name="Préfiltre Dimensions",
+        description="N'envoie que les pages PDF qui contiennent des dimensions (L x H x P, mesures en mm/cm/m)",
+        default=True
+    )
+
+    ai_batch_size: bpy.props.IntProperty(
+        name="Documents par Requête",
+        description="Nombre maximum de documents regroupés dans une requête IA lors de l'analyse "
+                    "des fichiers correspondants (1 = une requête par document)",
+        default=8,
+        min=1,
+        max=50
+    )
+
+    ai_batch_max_kb: bpy.props.IntProperty(
+        name="Taille Max Requête (Ko)",
+        description="Taille maximale d'une requête groupée (textes + images encodées) ; "
+                    "les documents plus gros sont envoyés seuls",
+        default=2048,
+        min=16,
+        max=20480
+    )
+
+    gemini_endpoint: bpy.props.StringProperty(
+        name="Endpoint Gemini",
+        description="URL de base de l'API (modifiable pour tester contre un serveur local)",
+        default="https://generativelanguage.googleapis.com/v1beta"
+    )
+
     model_cache_ttl: bpy.props.IntProperty(
         name="TTL Cache Modèles",
         description="Durée de vie du cache de la liste des modèles en secondes",
@@ -182,7 +284,17 @@ Provide detailed analysis focusing on 3D modeling requirements.""",
         description="Résolution de la grille pour l'analyse d'overlap (plus élevé = plus précis mais plus lent)",
         default=256,
         min=64,
-        max=1024
+        max=4096
+    )
+    
+    uv_overlap_mode: bpy.props.EnumProperty(
+        name="Mode Overlap UV",
+        description="Méthode de détection des overlaps UV",
+        items=[
+            ('GRID', "Grille", "Rasterisation sur grille (rapide, approchée)"),
+            ('EXACT', "Exact", "Intersection exacte des triangles UV (aire en UV²)")
+        ],
+        default='GRID'
     )
     
     uv_square_tolerance: bpy.props.FloatProperty(
@@ -237,6 +349,79 @@ Provide detailed analysis focusing on 3D modeling requirements.""",
         max=100.0,
         precision=1
     )
+    
+    texel_histogram_mode: bpy.props.BoolProperty(
+        name="Mode Histogramme",
+        description="Ne conserve pas la liste des densités par face : résumé par histogramme log "
+                    "et percentiles (P5/P50/P95), mémoire constante sur les gros mesh",
+        default=False
+    )
+    
+    texel_write_attribute: bpy.props.BoolProperty(
+        name="Attribut Heatmap",
+        description="Écrit la densité de chaque face dans l'attribut 'T4A_texel_density' "
+                    "du mesh pour visualiser les hotspots",
+        default=False
+    )
+    
+    # --- PARAMÈTRES PERFORMANCE QC ---
+    qc_worker_processes: bpy.props.IntProperty(
+        name="Processus QC",
+        description="Nombre de processus Python pour analyser les objets d'une collection en parallèle "
+                    "(0 = analyse séquentielle dans Blender, -1 = tous les cœurs)",
+        default=0,
+        min=-1,
+        max=64
+    )
+    
+    qc_cache_enabled: bpy.props.BoolProperty(
+        name="Cache QC",
+        description="Réutilise les résultats d'analyse des objets non modifiés "
+                    "(cache stocké dans le dossier .t4a_qc_cache du Scan Path)",
+        default=True
+    )
+    
+    qc_cache_max_entries: bpy.props.IntProperty(
+        name="Entrées Cache QC",
+        description="Nombre maximum de résultats conservés (les moins récemment utilisés sont supprimés)",
+        default=2000,
+        min=100,
+        max=100000
+    )
+
+    scan_only_changes: bpy.props.BoolProperty(
+        name="Nouveaux fichiers uniquement",
+        description="Le scan ne propose que les fichiers nouveaux ou modifiés (taille/date) depuis "
+                    "le dernier import (index stocké dans le dossier .t4a_scan_index du Scan Path)",
+        default=False
+    )
+
+    batch_import_workers: bpy.props.IntProperty(
+        name="Processus Import Batch",
+        description="Nombre d'instances Blender en arrière-plan (blender -b) pour importer et analyser "
+                    "les fichiers scannés (0 = import séquentiel dans la scène courante)",
+        default=0,
+        min=0,
+        max=32
+    )
+
+    batch_save_blend: bpy.props.BoolProperty(
+        name="Sauver .blend par fichier",
+        description="En mode batch, chaque worker enregistre le fichier importé dans un .blend "
+                    "séparé (dossier .t4a_batch du Scan Path)",
+        default=True
+    )
+
+    texture_link_mode: bpy.props.EnumProperty(
+        name="Consolidation Textures",
+        description="Méthode utilisée pour placer les textures dans le dossier textures_<modèle>",
+        items=[
+            ('AUTO', "Auto", "Reflink, puis lien physique, puis copie selon le système de fichiers"),
+            ('REFLINK', "Reflink", "Clone copy-on-write si possible, sinon copie (jamais de lien physique)"),
+            ('COPY', "Copie", "Toujours copier les fichiers")
+        ],
+        default='AUTO'
+    )
 
     # Note: Vertex/Service Account mode removed in favor of google-generativeai (API key)
 
@@ -268,6 +453,25 @@ Provide detailed analysis focusing on 3D modeling requirements.""",
         row = var_box.row()
         row.prop(self, "dimension_tolerance")
         row.prop(self, "api_timeout")
+
+        row = var_box.row()
+        row.prop(self, "api_max_in_flight")
+        row.prop(self, "api_max_retries")
+        var_box.prop(self, "gemini_endpoint")
+        row = var_box.row()
+        row.prop(self, "ai_cache_enabled")
+        row.prop(self, "ai_cache_ttl_hours")
+        row.prop(self, "ai_cache_max_mb")
+        row = var_box.row()
+        row.prop(self, "ocr_max_edge")
+        row.prop(self, "ocr_jpeg_quality")
+        row = var_box.row()
+        row.prop(self, "pdf_max_pages")
+        row.prop(self, "pdf_max_chars")
+        row.prop(self, "pdf_prefilter")
+        row = var_box.row()
+        row.prop(self, "ai_batch_size")
+        row.prop(self, "ai_batch_max_kb")
         
         row = var_box.row()
         row.prop(self, "model_cache_ttl")
@@ -325,7 +529,9 @@ Provide detailed analysis focusing on 3D modeling requirements.""",
         row.prop(self, "uv_overlap_threshold")
         row.prop(self, "uv_grid_resolution")
         
-        uv_box.prop(self, "uv_square_tolerance")
+        row = uv_box.row()
+        row.prop(self, "uv_overlap_mode")
+        row.prop(self, "uv_square_tolerance")
 
         layout.separator()
 
@@ -336,6 +542,25 @@ Provide detailed analysis focusing on 3D modeling requirements.""",
         row = texel_box.row()
         row.prop(self, "texel_density_target")
         row.prop(self, "texel_variance_threshold")
+        
+        row = texel_box.row()
+        row.prop(self, "texel_histogram_mode")
+        row.prop(self, "texel_write_attribute")
+
+        layout.separator()
+
+        # --- PERFORMANCE QC ---
+        perf_box = layout.box()
+        perf_box.label(text="Performance QC", icon='MODIFIER')
+        perf_box.prop(self, "qc_worker_processes")
+        row = perf_box.row()
+        row.prop(self, "qc_cache_enabled")
+        row.prop(self, "qc_cache_max_entries")
+        perf_box.prop(self, "scan_only_changes")
+        row = perf_box.row()
+        row.prop(self, "batch_import_workers")
+        row.prop(self, "batch_save_blend")
+        perf_box.prop(self, "texture_link_mode")
 
         layout.separator()
 
@@ -489,6 +714,9 @@ class T4A_UVResult(bpy.types.PropertyGroup):
         ],
         default='GOOD'
     )
+    texel_density_p5: bpy.props.FloatProperty(name="Densité P5", default=0.0)
+    texel_density_p50: bpy.props.FloatProperty(name="Densité Médiane (P50)", default=0.0)
+    texel_density_p95: bpy.props.FloatProperty(name="Densité P95", default=0.0)
 
 
 class T4A_TopologyResult(bpy.types.PropertyGroup):
@@ -504,6 +732,10 @@ class T4A_TopologyResult(bpy.types.PropertyGroup):
     # Manifold issues
     has_manifold_issues: bpy.props.BoolProperty(name="Problèmes Manifold", default=False)
     manifold_error_count: bpy.props.IntProperty(name="Erreurs Manifold", default=0)
+    boundary_edges_count: bpy.props.IntProperty(name="Edges de Bord", default=0)
+    non_manifold_edges_count: bpy.props.IntProperty(name="Edges > 2 Faces", default=0)
+    wire_edges_count: bpy.props.IntProperty(name="Edges Wire", default=0)
+    bowtie_vertices_count: bpy.props.IntProperty(name="Vertices Bow-Tie", default=0)
     
     # Normales
     normal_consistency: bpy.props.FloatProperty(name="Cohérence Normales (%)", default=100.0)
@@ -514,6 +746,7 @@ class T4A_TopologyResult(bpy.types.PropertyGroup):
     isolated_vertices_count: bpy.props.IntProperty(name="Vertices Isolés", default=0)
     has_isolated_vertices: bpy.props.BoolProperty(name="A Vertices Isolés", default=False)
     duplicate_vertices_count: bpy.props.IntProperty(name="Vertices Dupliqués", default=0)
+    duplicate_clusters_count: bpy.props.IntProperty(name="Groupes de Doublons", default=0)
     has_duplicate_vertices: bpy.props.BoolProperty(name="A Vertices Dupliqués", default=False)
     
     # Vertex colors
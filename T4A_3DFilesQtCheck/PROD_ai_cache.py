@@ -0,0 +1,184 @@
+"""Cache disque des réponses de l'analyse IA (Gemini).
+
+Chaque réponse est indexée par le contenu de la requête : modèle, prompt
+rendu par ``PROD_prompt_tags`` (qui inclut le texte extrait du document) et
+octets de l'image envoyée. Une fiche technique inchangée est donc relue
+sans appel réseau.
+
+Les entrées sont des fichiers JSON dans ``<scan_path>/.t4a_ai_cache`` avec
+une durée de validité et une éviction LRU bornée en taille totale. La
+taille et l'éviction comptent aussi les sous-dossiers de travail (images
+réduites, textes extraits).
+``AIResponseCache`` n'accède pas à ``bpy`` et peut être utilisé depuis les
+threads du client asynchrone.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import bpy
+
+
+class _SimpleLogger:
+    def debug(self, msg, *args):
+        try:
+            from . import PROD_Parameters
+            if PROD_Parameters.is_debug_mode():
+                print(f"[T4A] [DEBUG] [AI_CACHE] " + (msg % args if args else msg))
+        except Exception:
+            pass
+
+    def info(self, msg, *args):
+        print(f"[T4A] [INFO] [AI_CACHE] " + (msg % args if args else msg))
+
+    def error(self, msg, *args):
+        print(f"[T4A] [ERROR] [AI_CACHE] " + (msg % args if args else msg))
+
+
+logger = _SimpleLogger()
+
+CACHE_DIR_NAME = '.t4a_ai_cache'
+
+# À incrémenter quand le format des entrées change
+CACHE_VERSION = 1
+
+
+def request_key(model, prompt, image_data=None, image_mime_type=None):
+    """Clé d'une requête : empreinte BLAKE2b du modèle, du prompt et de l'image."""
+    digest = hashlib.blake2b(digest_size=20)
+    header = {'version': CACHE_VERSION, 'model': model, 'prompt': prompt, 'mime': image_mime_type or ''}
+    digest.update(json.dumps(header, sort_keys=True).encode('utf-8'))
+    if image_data:
+        digest.update(image_data.encode('ascii') if isinstance(image_data, str) else image_data)
+    return digest.hexdigest()
+
+
+class AIResponseCache:
+    """Réponses IA sur disque avec TTL et éviction LRU par taille."""
+
+    def __init__(self, directory, ttl_seconds=0, max_bytes=50 * 1024 * 1024):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def get(self, key):
+        """Réponse en cache pour ``key`` ou None (absente ou expirée)."""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as handle:
+                entry = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if self.ttl_seconds and time.time() - entry.get('created', 0) > self.ttl_seconds:
+            logger.debug("Entrée expirée: %s", key)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        # Date de modification = dernier accès, utilisée pour l'éviction
+        touch(path)
+        return entry.get('response')
+
+    def put(self, key, response, model=''):
+        """Enregistre ``response`` (écriture atomique) puis applique l'éviction."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                    json.dump({'created': time.time(), 'model': model, 'response': response}, handle)
+                os.replace(tmp_path, self._path(key))
+            except Exception:
+                os.remove(tmp_path)
+                raise
+            self.evict()
+        except Exception as e:
+            logger.debug("Écriture cache impossible %s: %s", key, str(e))
+
+    def evict(self):
+        """Supprime les fichiers les moins récemment utilisés au-delà de ``max_bytes``.
+
+        Les sous-dossiers (``images``, ``text``) sont inclus ; les fichiers
+        ``.tmp`` en cours d'écriture sont ignorés.
+        """
+        entries = []
+        for directory, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+        logger.debug("Cache IA: %d entrée(s) évincée(s)", removed)
+
+
+def get_ai_cache():
+    """Cache IA configuré dans les préférences, ou None si désactivé."""
+    try:
+        from . import PROD_Parameters
+        prefs = PROD_Parameters.get_addon_preferences()
+        if prefs is None or not getattr(prefs, 'ai_cache_enabled', True):
+            return None
+        scan_path = bpy.path.abspath(getattr(prefs, 'scan_path', '') or '')
+        if not scan_path or not os.path.isdir(scan_path):
+            return None
+        return AIResponseCache(os.path.join(scan_path, CACHE_DIR_NAME),
+                               getattr(prefs, 'ai_cache_ttl_hours', 168) * 3600,
+                               getattr(prefs, 'ai_cache_max_mb', 50) * 1024 * 1024)
+    except Exception:
+        return None
+
+
+def touch(path):
+    """Marque un fichier du cache comme utilisé (ordre LRU de l'éviction)."""
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+
+def evict_ai_cache():
+    """Applique l'éviction du cache IA après l'ajout d'un fichier de travail."""
+    cache = get_ai_cache()
+    if cache is None:
+        return
+    try:
+        cache.evict()
+    except OSError as e:
+        logger.debug("Éviction du cache impossible: %s", str(e))
+
+
+def get_cache_subdirectory(name):
+    """Dossier de travail ``name`` du cache IA (images réduites, textes extraits).
+
+    Placé dans ``<scan_path>/.t4a_ai_cache`` si le cache est actif, sinon dans
+    le dossier temporaire du système.
+    """
+    cache = get_ai_cache()
+    if cache is not None:
+        return os.path.join(cache.directory, name)
+    return os.path.join(tempfile.gettempdir(), 't4a_' + name)
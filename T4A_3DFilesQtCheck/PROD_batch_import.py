@@ -0,0 +1,390 @@
+"""Import et contrôle qualité en batch dans des instances Blender d'arrière-plan.
+
+Chaque fichier scanné est confié à un processus ``blender -b`` qui prépare la
+scène, importe le fichier (normalisation, textures, UV, texel density,
+topologie, analyse IA), compare les dimensions puis écrit un résultat JSON
+compact. La scène principale ne fait qu'agréger ces résultats dans
+``scene.t4a_dimensions`` : elle reste réactive et ne contient aucun des
+modèles importés (un ``.blend`` par fichier peut être conservé à part).
+"""
+
+import json
+import os
+import subprocess
+import time
+from collections import deque
+
+import bpy
+
+from .PROD_Files_manager import SUPPORTED_EXTENSIONS, _gather_files, _get_scan_index, _log_removed_files
+
+
+class _SimpleLogger:
+    def debug(self, msg, *args):
+        try:
+            from . import PROD_Parameters
+            if PROD_Parameters.is_debug_mode():
+                print(f"[T4A] [DEBUG] [BATCH] " + (msg % args if args else msg))
+        except Exception:
+            pass
+
+    def info(self, msg, *args):
+        print(f"[T4A] [INFO] [BATCH] " + (msg % args if args else msg))
+
+    def error(self, msg, *args):
+        print(f"[T4A] [ERROR] [BATCH] " + (msg % args if args else msg))
+
+
+logger = _SimpleLogger()
+
+BATCH_DIR_NAME = '.t4a_batch'
+
+# À incrémenter quand le format du JSON de résultat change
+RESULT_VERSION = 1
+
+# Scan déjà fait par ``t4a.scan_directory`` : (chemin, fichiers, index)
+_handed_scan = None
+
+
+def hand_over_scan(scan_path, files, scan_index):
+    """Confie un scan au prochain ``t4a.batch_import_directory``, qui ne rescanne pas le dossier."""
+    global _handed_scan
+    _handed_scan = (bpy.path.abspath(scan_path or ''), files, scan_index)
+
+
+def _take_handed_scan(scan_path):
+    """Récupère le scan confié pour ``scan_path`` (None sinon) ; il ne sert qu'une fois."""
+    global _handed_scan
+    handed, _handed_scan = _handed_scan, None
+    if handed is None or handed[0] != scan_path:
+        return None
+    return handed[1], handed[2]
+
+
+def serialize_property_group(group):
+    """Convertit un PropertyGroup (et ses sous-groupes) en dict JSON."""
+    data = {}
+    for prop in group.bl_rna.properties:
+        key = prop.identifier
+        if key == 'rna_type':
+            continue
+        value = getattr(group, key, None)
+        if prop.type == 'POINTER':
+            if isinstance(value, bpy.types.PropertyGroup):
+                data[key] = serialize_property_group(value)
+        elif prop.type == 'COLLECTION':
+            data[key] = [serialize_property_group(item) for item in value
+                         if isinstance(item, bpy.types.PropertyGroup)]
+        elif prop.type == 'ENUM' and prop.is_enum_flag:
+            data[key] = sorted(value)
+        elif getattr(prop, 'is_array', False):
+            data[key] = list(value)
+        else:
+            data[key] = value
+    return data
+
+
+def apply_property_group(group, data):
+    """Applique un dict produit par ``serialize_property_group`` (best effort)."""
+    for prop in group.bl_rna.properties:
+        key = prop.identifier
+        if key == 'rna_type' or key not in data:
+            continue
+        value = data[key]
+        try:
+            if prop.type == 'POINTER':
+                target = getattr(group, key, None)
+                if isinstance(target, bpy.types.PropertyGroup) and isinstance(value, dict):
+                    apply_property_group(target, value)
+            elif prop.type == 'COLLECTION':
+                items = getattr(group, key)
+                items.clear()
+                for item_data in value:
+                    apply_property_group(items.add(), item_data)
+            elif prop.is_readonly:
+                continue
+            elif prop.type == 'ENUM' and prop.is_enum_flag:
+                setattr(group, key, set(value))
+            else:
+                setattr(group, key, value)
+        except Exception as e:
+            logger.debug("Propriété %s non appliquée: %s", key, str(e))
+
+
+def get_batch_directory(scan_path):
+    """Dossier des résultats batch (JSON, logs et .blend des workers)."""
+    return os.path.join(scan_path, BATCH_DIR_NAME)
+
+
+def _write_json_atomic(path, payload):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as handle:
+        json.dump(payload, handle, separators=(',', ':'), ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _find_dim_item(dims, name):
+    for item in dims:
+        if item.name == name:
+            return item
+    return None
+
+
+class T4A_OT_BatchImportWorker(bpy.types.Operator):
+    """Opérateur exécuté dans un worker ``blender -b`` pour un seul fichier."""
+    bl_idname = "t4a.batch_import_worker"
+    bl_label = "Batch Import Worker"
+    bl_description = "Importe et analyse un fichier puis écrit le résultat en JSON (mode arrière-plan)"
+    bl_options = {'INTERNAL'}
+
+    filepath: bpy.props.StringProperty(name="Filepath", subtype='FILE_PATH')
+    result_path: bpy.props.StringProperty(name="Result Path", subtype='FILE_PATH')
+    blend_path: bpy.props.StringProperty(name="Blend Path", subtype='FILE_PATH', default="")
+
+    def execute(self, context):
+        start = time.time()
+        base = os.path.basename(self.filepath)
+        ext = os.path.splitext(base)[1].lstrip('.').upper() or 'FILE'
+        coll_name = f"{ext}_{base}"
+        result = {
+            'version': RESULT_VERSION,
+            'filepath': self.filepath,
+            'collection': coll_name,
+            'success': False,
+            'error': "",
+            'blend_path': "",
+            'dimensions': []
+        }
+
+        try:
+            bpy.ops.t4a.setup_scene(targetVolumCube=1.0)
+            res = bpy.ops.t4a.import_file_to_collection(filepath=self.filepath)
+            if res != {'FINISHED'}:
+                result['error'] = "Import échoué"
+            else:
+                # Le timer de verify_dimensions_on_import ne s'exécute pas en
+                # mode arrière-plan : la comparaison est faite directement.
+                try:
+                    bpy.ops.t4a.compare_dimensions(collection_name=coll_name)
+                except Exception as e:
+                    logger.error("Comparaison des dimensions impossible pour %s: %s", base, str(e))
+
+                dims = getattr(context.scene, 't4a_dimensions', None)
+                if dims is not None:
+                    result['dimensions'] = [serialize_property_group(item) for item in dims]
+                result['success'] = True
+
+                if self.blend_path:
+                    try:
+                        bpy.ops.wm.save_as_mainfile(filepath=self.blend_path, copy=True)
+                        result['blend_path'] = self.blend_path
+                    except Exception as e:
+                        logger.error("Sauvegarde .blend impossible pour %s: %s", base, str(e))
+        except Exception as e:
+            result['error'] = str(e)
+            logger.error("Worker en échec pour %s: %s", base, str(e))
+
+        result['duration'] = time.time() - start
+        try:
+            _write_json_atomic(self.result_path, result)
+        except Exception as e:
+            self.report({'ERROR'}, f"Écriture du résultat impossible: {e}")
+            return {'CANCELLED'}
+        return {'FINISHED'} if result['success'] else {'CANCELLED'}
+
+
+class T4A_OT_BatchImportDirectory(bpy.types.Operator):
+    bl_idname = "t4a.batch_import_directory"
+    bl_label = "Import batch"
+    bl_description = ("Importe et analyse les fichiers du répertoire scanné dans des instances Blender "
+                      "d'arrière-plan puis agrège les résultats dans la scène")
+
+    _timer = None
+
+    def invoke(self, context, event):
+        from . import PROD_Parameters
+        prefs = PROD_Parameters.get_addon_preferences()
+        scan_path = bpy.path.abspath(getattr(prefs, 'scan_path', '') or '') if prefs else ''
+        only_changes = getattr(prefs, 'scan_only_changes', False) if prefs else False
+        handed = _take_handed_scan(scan_path)
+        if handed is not None:
+            files, self._scan_index = handed
+        else:
+            self._scan_index = _get_scan_index(scan_path)
+            files = _gather_files(scan_path, SUPPORTED_EXTENSIONS, self._scan_index, only_changes)
+            _log_removed_files(self._scan_index)
+        if not files:
+            self.report({'INFO'}, "Aucun fichier trouvé dans le chemin configuré.")
+            return {'CANCELLED'}
+
+        self._batch_dir = get_batch_directory(scan_path)
+        try:
+            os.makedirs(self._batch_dir, exist_ok=True)
+        except OSError as e:
+            self.report({'ERROR'}, f"Dossier batch inaccessible: {e}")
+            return {'CANCELLED'}
+
+        self._max_workers = max(1, min(getattr(prefs, 'batch_import_workers', 1), len(files)))
+        self._save_blend = getattr(prefs, 'batch_save_blend', True)
+        self._pending = deque(enumerate(files))
+        self._running = []
+        self._total = len(files)
+        self._imported = 0
+        self._failed = 0
+        self._start = time.time()
+
+        logger.info("Import batch de %d fichiers sur %d instances Blender", self._total, self._max_workers)
+        context.window_manager.progress_begin(0, self._total)
+        context.window_manager.modal_handler_add(self)
+        self._timer = context.window_manager.event_timer_add(0.5, window=context.window)
+        return {'RUNNING_MODAL'}
+
+    def _spawn(self, index, filepath):
+        stem = "%05d_%s" % (index, os.path.basename(filepath))
+        result_path = os.path.join(self._batch_dir, stem + '.json')
+        log_path = os.path.join(self._batch_dir, stem + '.log')
+        blend_path = os.path.join(self._batch_dir, stem + '.blend') if self._save_blend else ""
+        if os.path.exists(result_path):
+            os.remove(result_path)
+
+        expression = (
+            "import bpy;bpy.ops.t4a.batch_import_worker(filepath=%r, result_path=%r, blend_path=%r)"
+            % (filepath, result_path, blend_path)
+        )
+        log_file = open(log_path, 'w', encoding='utf-8')
+        try:
+            process = subprocess.Popen(
+                [
+                    bpy.app.binary_path,
+                    "-b",
+                    "--addons",
+                    __package__,
+                    "--python-exit-code",
+                    "1",
+                    "--python-expr",
+                    expression,
+                ],
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL,
+            )
+        except Exception:
+            log_file.close()
+            raise
+        self._running.append((process, filepath, result_path, log_file))
+
+    def _collect(self, context, filepath, result_path, returncode):
+        try:
+            with open(result_path, 'r', encoding='utf-8') as handle:
+                result = json.load(handle)
+        except Exception as e:
+            logger.error("Résultat absent pour %s (code %s): %s", filepath, returncode, str(e))
+            self._fail(filepath)
+            return
+
+        dims = getattr(context.scene, 't4a_dimensions', None)
+        if dims is not None:
+            for item_data in result.get('dimensions', []):
+                name = item_data.get('name', '')
+                item = _find_dim_item(dims, name)
+                if item is None:
+                    item = dims.add()
+                apply_property_group(item, item_data)
+
+        if result.get('success'):
+            self._imported += 1
+            logger.info("Fichier traité en %.1fs: %s", result.get('duration', 0.0), filepath)
+        else:
+            self._fail(filepath)
+            logger.error("Fichier en échec: %s (%s)", filepath, result.get('error', ''))
+
+    def _fail(self, filepath):
+        """Compte un échec ; le fichier reste à importer au prochain scan."""
+        self._failed += 1
+        if self._scan_index is not None:
+            self._scan_index.discard(filepath)
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.cancel(context)
+            self.report({'WARNING'}, f"Import batch interrompu: {self._imported} importés, {self._failed} échecs")
+            return {'CANCELLED'}
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        for entry in list(self._running):
+            process, filepath, result_path, log_file = entry
+            returncode = process.poll()
+            if returncode is None:
+                continue
+            self._running.remove(entry)
+            log_file.close()
+            self._collect(context, filepath, result_path, returncode)
+
+        while len(self._running) < self._max_workers and self._pending:
+            index, filepath = self._pending.popleft()
+            try:
+                self._spawn(index, filepath)
+            except Exception as e:
+                logger.error("Lancement du worker impossible pour %s: %s", filepath, str(e))
+                self._fail(filepath)
+
+        done = self._imported + self._failed
+        context.window_manager.progress_update(done)
+        try:
+            scene = context.scene
+            scene.t4a_last_imported_count = self._imported
+            scene.t4a_last_import_failed = self._failed
+        except Exception:
+            pass
+        try:
+            for area in context.screen.areas:
+                if area.type == 'VIEW_3D':
+                    area.tag_redraw()
+        except Exception:
+            pass
+
+        if self._running or self._pending:
+            return {'PASS_THROUGH'}
+
+        self._finish(context)
+        if self._scan_index is not None:
+            self._scan_index.save()
+        logger.info("Import batch terminé en %.1fs", time.time() - self._start)
+        self.report({'INFO'}, f"Importés: {self._imported}, Échecs: {self._failed}")
+        return {'FINISHED'}
+
+    def _finish(self, context):
+        if self._timer is not None:
+            context.window_manager.event_timer_remove(self._timer)
+            self._timer = None
+        context.window_manager.progress_end()
+
+    def cancel(self, context):
+        for process, _, _, log_file in self._running:
+            try:
+                process.terminate()
+                process.wait(timeout=5)
+            except Exception:
+                pass
+            log_file.close()
+        self._running = []
+        self._pending.clear()
+        self._finish(context)
+
+
+classes = (
+    T4A_OT_BatchImportWorker,
+    T4A_OT_BatchImportDirectory,
+)
+
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
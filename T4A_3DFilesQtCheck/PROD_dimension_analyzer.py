@@ -202,6 +202,22 @@ def format_dimensions(width: float, height: float, depth: float, unit: str = "cm
         return f"L:{width} H:{height} P:{depth} {unit}"
 
 
+# Patterns de recherche pour différents formats (aussi utilisés par
+# PROD_text_extract pour repérer les pages contenant des dimensions)
+DIMENSION_PATTERNS = [
+    # Format: "L:10.5 H:20.0 P:5.2"
+    r'L\s*:\s*([\d.]+).*?H\s*:\s*([\d.]+).*?P\s*:\s*([\d.]+)',
+    # Format: "10.5 x 20.0 x 5.2"
+    r'([\d.]+)\s*x\s*([\d.]+)\s*x\s*([\d.]+)',
+    # Format: "largeur: 10.5, hauteur: 20.0, profondeur: 5.2"
+    r'largeur\s*:\s*([\d.]+).*?hauteur\s*:\s*([\d.]+).*?profondeur\s*:\s*([\d.]+)',
+    # Format: "Width: 10.5, Height: 20.0, Depth: 5.2"
+    r'width\s*:\s*([\d.]+).*?height\s*:\s*([\d.]+).*?depth\s*:\s*([\d.]+)',
+    # Format: "10.5cm x 20.0cm x 5.2cm"
+    r'([\d.]+)\s*cm\s*x\s*([\d.]+)\s*cm\s*x\s*([\d.]+)\s*cm',
+]
+
+
 def parse_ai_dimensions(ai_text: str) -> Optional[Tuple[float, float, float]]:
     """
     Parse le texte des dimensions IA pour extraire des valeurs numériques.
@@ -216,23 +232,9 @@ def parse_ai_dimensions(ai_text: str) -> Optional[Tuple[float, float, float]]:
         return None
     
     try:
-        # Patterns de recherche pour différents formats
-        patterns = [
-            # Format: "L:10.5 H:20.0 P:5.2"
-            r'L\s*:\s*([\d.]+).*?H\s*:\s*([\d.]+).*?P\s*:\s*([\d.]+)',
-            # Format: "10.5 x 20.0 x 5.2"
-            r'([\d.]+)\s*x\s*([\d.]+)\s*x\s*([\d.]+)',
-            # Format: "largeur: 10.5, hauteur: 20.0, profondeur: 5.2"
-            r'largeur\s*:\s*([\d.]+).*?hauteur\s*:\s*([\d.]+).*?profondeur\s*:\s*([\d.]+)',
-            # Format: "Width: 10.5, Height: 20.0, Depth: 5.2"
-            r'width\s*:\s*([\d.]+).*?height\s*:\s*([\d.]+).*?depth\s*:\s*([\d.]+)',
-            # Format: "10.5cm x 20.0cm x 5.2cm"
-            r'([\d.]+)\s*cm\s*x\s*([\d.]+)\s*cm\s*x\s*([\d.]+)\s*cm',
-        ]
-        
         ai_text_clean = ai_text.lower().strip()
         
-        for pattern in patterns:
+        for pattern in DIMENSION_PATTERNS:
             match = re.search(pattern, ai_text_clean, re.IGNORECASE)
             if match:
                 try:
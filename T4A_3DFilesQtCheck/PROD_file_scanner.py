@@ -0,0 +1,204 @@
+"""Scanner de répertoires partagé (fichiers 3D et textures).
+
+Le parcours utilise ``os.scandir`` (pas d'appel ``stat`` supplémentaire sur la
+plupart des systèmes) et produit les fichiers au fur et à mesure qu'ils sont
+trouvés. L'extension est testée par une seule recherche dans un ``set``.
+
+Un index persistant (chemin, taille, mtime) optionnel, stocké dans
+``<racine>/.t4a_scan_index``, permet de ne rapporter que les fichiers
+nouveaux ou modifiés depuis le dernier scan enregistré.
+"""
+
+import json
+import os
+from collections import namedtuple
+
+
+class _SimpleLogger:
+    def debug(self, msg, *args):
+        try:
+            from . import PROD_Parameters
+            if PROD_Parameters.is_debug_mode():
+                print(f"[T4A] [DEBUG] [SCANNER] " + (msg % args if args else msg))
+        except Exception:
+            pass
+
+    def info(self, msg, *args):
+        print(f"[T4A] [INFO] [SCANNER] " + (msg % args if args else msg))
+
+    def error(self, msg, *args):
+        print(f"[T4A] [ERROR] [SCANNER] " + (msg % args if args else msg))
+
+
+logger = _SimpleLogger()
+
+INDEX_DIR_NAME = '.t4a_scan_index'
+
+# À incrémenter quand le format de l'index change
+INDEX_VERSION = 1
+
+STATUS_NEW = 'new'
+STATUS_CHANGED = 'changed'
+STATUS_UNCHANGED = 'unchanged'
+
+ScanEntry = namedtuple('ScanEntry', ('path', 'size', 'mtime', 'status'))
+
+
+def is_work_directory(name):
+    """Dossiers de travail de l'addon (.t4a_batch, .t4a_qc_cache...) à ignorer."""
+    return name.startswith('.t4a')
+
+
+def iter_files(root, extensions, directories=None):
+    """Parcourt ``root`` récursivement et produit ``(chemin, taille, mtime_ns)``.
+
+    Args:
+        root: dossier racine
+        extensions: extensions acceptées (minuscules, avec le point)
+        directories: dict optionnel rempli avec ``dossier -> mtime_ns`` des
+            dossiers parcourus (voir ``directories_unchanged``)
+    """
+    extensions = frozenset(e.lower() for e in extensions)
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            if directories is not None:
+                # Relevé avant la lecture : un ajout pendant le parcours sera vu au prochain contrôle
+                directories[directory] = os.stat(directory).st_mtime_ns
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError as e:
+            logger.debug("Dossier illisible %s: %s", directory, str(e))
+            continue
+
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not is_work_directory(entry.name):
+                        subdirs.append(entry.path)
+                    continue
+                if os.path.splitext(entry.name)[1].lower() not in extensions:
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            yield entry.path, stat.st_size, stat.st_mtime_ns
+
+        # Ordre de parcours identique à os.walk (sous-dossiers dans l'ordre)
+        stack.extend(reversed(subdirs))
+
+
+def directories_unchanged(directories):
+    """Indique si aucun dossier relevé par ``iter_files`` n'a changé.
+
+    Un ajout, une suppression ou un renommage modifie le mtime du dossier
+    parent : un ``stat`` par dossier suffit, sans relire les fichiers.
+    """
+    for directory, mtime in directories.items():
+        try:
+            if os.stat(directory).st_mtime_ns != mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+class ScanIndex:
+    """Index persistant (chemin relatif -> taille, mtime) d'un dossier scanné."""
+
+    def __init__(self, root, name, extensions):
+        self.root = root
+        self.path = os.path.join(root, INDEX_DIR_NAME, name + '.json')
+        self.extensions = sorted(e.lower() for e in extensions)
+        self.files = {}
+        self._scanned = {}
+        self._complete = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != INDEX_VERSION or data.get('extensions') != self.extensions:
+            return
+        self.files = {rel: tuple(value) for rel, value in data.get('files', {}).items()}
+
+    def begin_scan(self):
+        """Réinitialise l'état avant un nouveau parcours."""
+        self._scanned = {}
+        self._complete = False
+
+    def classify(self, path, size, mtime):
+        """Retourne le statut du fichier et l'enregistre pour le prochain ``save``."""
+        rel = os.path.relpath(path, self.root)
+        self._scanned[rel] = (size, mtime)
+        previous = self.files.get(rel)
+        if previous is None:
+            return STATUS_NEW
+        if previous != (size, mtime):
+            return STATUS_CHANGED
+        return STATUS_UNCHANGED
+
+    def mark_complete(self):
+        self._complete = True
+
+    def discard(self, path):
+        """Oublie un fichier (import en échec) : il sera de nouveau proposé au prochain scan."""
+        rel = os.path.relpath(path, self.root)
+        self._scanned.pop(rel, None)
+        self.files.pop(rel, None)
+
+    @property
+    def removed(self):
+        """Fichiers indexés absents du dernier scan complet."""
+        if not self._complete:
+            return []
+        return [os.path.join(self.root, rel) for rel in self.files if rel not in self._scanned]
+
+    def save(self):
+        """Enregistre l'état du dernier scan (écriture atomique)."""
+        files = dict(self.files)
+        if self._complete:
+            files = {}
+        files.update(self._scanned)
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as handle:
+                json.dump({
+                    'version': INDEX_VERSION,
+                    'extensions': self.extensions,
+                    'files': {rel: list(value) for rel, value in files.items()}
+                }, handle, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+            self.files = files
+        except OSError as e:
+            logger.debug("Écriture de l'index impossible %s: %s", self.path, str(e))
+
+
+def scan_directory(root, extensions, index=None, only_changes=False, directories=None):
+    """Produit les fichiers de ``root`` sous forme de ``ScanEntry``.
+
+    Args:
+        root: dossier racine
+        extensions: extensions acceptées
+        index: ``ScanIndex`` optionnel pour détecter les changements ; il
+            n'est pas enregistré automatiquement (voir ``ScanIndex.save``)
+        only_changes: ne produire que les fichiers nouveaux ou modifiés
+        directories: voir ``iter_files``
+    """
+    if not root or not os.path.isdir(root):
+        return
+    if index is not None:
+        index.begin_scan()
+    for path, size, mtime in iter_files(root, extensions, directories):
+        status = index.classify(path, size, mtime) if index is not None else STATUS_NEW
+        if only_changes and status == STATUS_UNCHANGED:
+            continue
+        yield ScanEntry(path, size, mtime, status)
+    if index is not None:
+        index.mark_complete()
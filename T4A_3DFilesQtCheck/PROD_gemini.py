@@ -10,14 +10,21 @@ Il expose trois fonctions principales attendues par le reste de l'addon :
 - `test_connection(api_key=None, model=None)` : envoie un ping simple.
 - `analyze_text_dimensions(api_key=None, text, model=None)` : envoie le prompt d'analyse.
 
-Le code se base sur le style REST simple de votre exemple (urllib.request).
+Les requêtes passent par des connexions HTTP/1.1 keep-alive réutilisées (une
+par thread et par hôte) avec nouvelle tentative et backoff sur 429/5xx.
+L'endpoint est configurable (`prefs.gemini_endpoint`) pour tester contre un
+serveur local. La construction des requêtes (préférences, prompts) se fait sur
+le thread principal ; `generate_content` n'accède pas à `bpy` et peut être
+appelé depuis un thread (voir `PROD_gemini_async`).
 """
 
 import time
 import json
+import random
+import threading
 import traceback
-import urllib.request
-import urllib.error
+import http.client
+import urllib.parse
 
 import bpy
 
@@ -150,12 +157,196 @@ def _ensure_api_key_and_model(api_key: str = None, model: str = None):
     return key, (m or '')
 
 
+DEFAULT_ENDPOINT = 'https://generativelanguage.googleapis.com/v1beta'
+
+# Codes HTTP pour lesquels la requête est relancée
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+
+def get_api_settings() -> dict:
+    """Endpoint, timeout et nombre de tentatives depuis les préférences (thread principal)."""
+    settings = {'endpoint': DEFAULT_ENDPOINT, 'timeout': 30, 'max_retries': 3}
+    prefs = _get_prefs()
+    if prefs is not None:
+        try:
+            settings['endpoint'] = (getattr(prefs, 'gemini_endpoint', '') or DEFAULT_ENDPOINT).strip()
+            settings['timeout'] = getattr(prefs, 'api_timeout', 30)
+            settings['max_retries'] = getattr(prefs, 'api_max_retries', 3)
+        except Exception:
+            pass
+    return settings
+
+
+def _get_response_cache():
+    """Cache des réponses IA (None si désactivé), résolu sur le thread principal."""
+    try:
+        from . import PROD_ai_cache
+        return PROD_ai_cache.get_ai_cache()
+    except Exception:
+        return None
+
+
+class _HTTPError(Exception):
+    def __init__(self, status, body):
+        super().__init__(f'HTTP {status}')
+        self.status = status
+        self.body = body
+
+
+_connections = threading.local()
+
+
+def _get_connection(scheme, netloc, timeout):
+    """Connexion keep-alive du thread courant pour ``scheme://netloc``."""
+    pool = getattr(_connections, 'pool', None)
+    if pool is None:
+        pool = _connections.pool = {}
+    conn = pool.get((scheme, netloc))
+    if conn is None:
+        conn_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        conn = conn_class(netloc, timeout=timeout)
+        pool[(scheme, netloc)] = conn
+    conn.timeout = timeout
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout)
+    return conn
+
+
+def _drop_connection(scheme, netloc):
+    pool = getattr(_connections, 'pool', {})
+    conn = pool.pop((scheme, netloc), None)
+    if conn is not None:
+        conn.close()
+
+
+def _http_request(method, url, body=None, timeout=30):
+    """Requête HTTP sur une connexion réutilisée ; retourne ``(status, headers, texte)``."""
+    parts = urllib.parse.urlsplit(url)
+    path = parts.path + ('?' + parts.query if parts.query else '')
+    headers = {'Content-Type': 'application/json', 'Connection': 'keep-alive'}
+    # Une connexion gardée ouverte peut avoir été fermée par le serveur :
+    # dans ce cas la requête est rejouée une fois sur une nouvelle connexion.
+    for attempt in range(2):
+        conn = _get_connection(parts.scheme, parts.netloc, timeout)
+        reused = conn.sock is not None
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+            text = resp.read().decode('utf-8', errors='replace')
+            if resp.will_close:
+                _drop_connection(parts.scheme, parts.netloc)
+            return resp.status, resp.headers, text
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError,
+                http.client.CannotSendRequest, http.client.ResponseNotReady):
+            _drop_connection(parts.scheme, parts.netloc)
+            if not reused or attempt:
+                raise
+        except Exception:
+            _drop_connection(parts.scheme, parts.netloc)
+            raise
+
+
+def _retry_delay(attempt, headers=None):
+    """Délai avant la tentative suivante (Retry-After sinon backoff exponentiel)."""
+    try:
+        retry_after = headers.get('Retry-After') if headers is not None else None
+        if retry_after:
+            return min(float(retry_after), RETRY_MAX_DELAY)
+    except (TypeError, ValueError):
+        pass
+    delay = min(RETRY_BASE_DELAY * (2 ** attempt), RETRY_MAX_DELAY)
+    return delay * (0.5 + random.random() / 2)
+
+
+def _request_json(method, url, payload=None, timeout=30, max_retries=3):
+    """Requête JSON avec nouvelles tentatives sur 429/5xx et erreurs réseau."""
+    body = json.dumps(payload).encode('utf-8') if payload is not None else None
+    attempt = 0
+    while True:
+        try:
+            status, headers, text = _http_request(method, url, body, timeout)
+        except (OSError, http.client.HTTPException) as e:
+            if attempt >= max_retries:
+                raise
+            delay = _retry_delay(attempt)
+            logger.debug('Erreur réseau Gemini (%s), nouvelle tentative dans %.1fs', e, delay)
+        else:
+            if status < 400:
+                return json.loads(text)
+            if status not in RETRY_STATUS_CODES or attempt >= max_retries:
+                raise _HTTPError(status, text)
+            delay = _retry_delay(attempt, headers)
+            logger.debug('Gemini HTTP %s, nouvelle tentative dans %.1fs', status, delay)
+        time.sleep(delay)
+        attempt += 1
+
+
 
 
 
 # Public API
 
 
+def fetch_models(api_key: str, endpoint: str = DEFAULT_ENDPOINT, max_retries: int = 3) -> list:
+    """Interroge l'endpoint models (sans accès à ``bpy``).
+
+    Returns:
+        list: ``[{'name': str, 'compatible': bool}, ...]``
+    """
+    url = f"{endpoint.rstrip('/')}/models?key={api_key}"
+    obj = _request_json('GET', url, timeout=15, max_retries=max_retries)
+
+    # extract all models with compatibility info
+    models_data = []
+    seen_names = set()
+    for m in obj.get('models', []) if isinstance(obj, dict) else []:
+        try:
+            raw = m.get('name') if isinstance(m, dict) else str(m)
+            short = raw.split('/')[-1].strip()
+            if short and short not in seen_names:
+                seen_names.add(short)
+                # Check if model supports generateContent
+                supported_methods = m.get('supportedGenerationMethods', []) if isinstance(m, dict) else []
+                is_compatible = 'generateContent' in supported_methods
+                models_data.append({
+                    'name': short,
+                    'compatible': is_compatible
+                })
+        except Exception:
+            continue
+    return models_data
+
+
+def store_models(models_data: list):
+    """Enregistre la liste des modèles dans prefs.model_list_json (thread principal)."""
+    try:
+        prefs = _get_prefs()
+        if prefs is not None:
+            prefs.model_list_json = json.dumps(models_data)
+            prefs.model_list_ts = time.time()
+    except Exception:
+        logger.debug('Failed to save models into prefs: %s', traceback.format_exc())
+
+
+def pick_default_model(models_data: list) -> str:
+    """Premier modèle compatible generateContent (à défaut le premier de la liste)."""
+    first_model = None
+    for model_info in models_data or []:
+        if not isinstance(model_info, dict):
+            continue
+        name = model_info.get('name', '')
+        if not name:
+            continue
+        if model_info.get('compatible', False):
+            return name
+        if first_model is None:
+            first_model = name
+    return first_model or 'models/gemini-2.5-flash-lite'
+
+
 def list_models(api_key: str = None) -> dict:
     """Récupère la liste des modèles via l'endpoint v1beta et met à jour prefs.model_list_json.
 
@@ -165,58 +356,22 @@ def list_models(api_key: str = None) -> dict:
     if not key:
         return {'success': False, 'status_code': None, 'detail': 'No API key provided'}
 
-    url = f"https://generativelanguage.googleapis.com/v1beta/models?key={key}"
-    headers = {'Content-Type': 'application/json'}
+    settings = get_api_settings()
     try:
-        req = urllib.request.Request(url, headers=headers)
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            txt = resp.read().decode('utf-8')
-            try:
-                obj = json.loads(txt)
-            except Exception:
-                return {'success': False, 'status_code': None, 'detail': 'Non-JSON response from models endpoint'}
-
-            # extract all models with compatibility info
-            models_data = []
-            seen_names = set()
-            for m in obj.get('models', []) if isinstance(obj, dict) else []:
-                try:
-                    raw = m.get('name') if isinstance(m, dict) else str(m)
-                    short = raw.split('/')[-1].strip()
-                    if short and short not in seen_names:
-                        seen_names.add(short)
-                        # Check if model supports generateContent
-                        supported_methods = m.get('supportedGenerationMethods', []) if isinstance(m, dict) else []
-                        is_compatible = 'generateContent' in supported_methods
-                        models_data.append({
-                            'name': short,
-                            'compatible': is_compatible
-                        })
-                except Exception:
-                    continue
-
-            # store into prefs
-            try:
-                prefs = _get_prefs()
-                if prefs is not None:
-                    prefs.model_list_json = json.dumps(models_data)
-                    prefs.model_list_ts = time.time()
-            except Exception:
-                logger.debug('Failed to save models into prefs: %s', traceback.format_exc())
-
-            return {'success': True, 'status_code': 200, 'detail': models_data}
-    except urllib.error.HTTPError as he:
-        try:
-            body = he.read().decode('utf-8')
-        except Exception:
-            body = ''
-        logger.error('HTTPError listing models: %s %s', getattr(he, 'code', '?'), body)
-        return {'success': False, 'status_code': getattr(he, 'code', None), 'detail': body}
+        models_data = fetch_models(key, settings['endpoint'], settings['max_retries'])
+    except ValueError:
+        return {'success': False, 'status_code': None, 'detail': 'Non-JSON response from models endpoint'}
+    except _HTTPError as he:
+        logger.error('HTTPError listing models: %s %s', he.status, he.body)
+        return {'success': False, 'status_code': he.status, 'detail': he.body}
     except Exception:
         tb = traceback.format_exc()
         logger.error('Exception listing models: %s', tb)
         return {'success': False, 'status_code': None, 'detail': tb}
 
+    store_models(models_data)
+    return {'success': True, 'status_code': 200, 'detail': models_data}
+
 
 def test_connection(api_key: str = None, model: str = None, context=None) -> dict:
     key, m = _ensure_api_key_and_model(api_key=api_key, model=model)
@@ -247,30 +402,21 @@ def test_connection(api_key: str = None, model: str = None, context=None) -> dic
     return {'success': False, 'status_code': None, 'detail': 'No response from REST endpoint'}
 
 
-def analyze_text_dimensions(api_key: str = None, text: str = '', model: str = None, context=None, file_path: str = '') -> dict:
-    key, m = _ensure_api_key_and_model(api_key=api_key, model=model)
-    if not key:
-        return {'success': False, 'status_code': None, 'detail': 'No API key provided'}
+def build_text_request(api_key: str = None, text: str = '', model: str = None, context=None, file_path: str = '',
+                       force_refresh: bool = False):
+    """Prépare une requête d'analyse de texte (thread principal).
 
-    # ensure model list fresh: try to refresh synchronously if empty
-    try:
-        prefs = _get_prefs()
-        if prefs is not None:
-            try:
-                current = json.loads(prefs.model_list_json or '[]')
-            except Exception:
-                current = []
-            if not current:
-                list_models(key)
-    except Exception:
-        pass
+    ``force_refresh`` ignore la réponse en cache (voir ``PROD_ai_cache``).
 
+    Returns:
+        tuple: ``(requête, None)`` utilisable par ``generate_content(**requête)``,
+        ou ``(None, résultat d'erreur)``
+    """
+    key, m = _ensure_api_key_and_model(api_key=api_key, model=model)
+    if not key:
+        return None, {'success': False, 'status_code': None, 'detail': 'No API key provided'}
     if not m:
-        try:
-            if prefs is not None:
-                m = getattr(prefs, 'model_name', '')
-        except Exception:
-            m = m or ''
+        m = 'gemini-2.5-flash'  # fallback
 
     # Utiliser le système de prompts configurables
     try:
@@ -285,58 +431,98 @@ def analyze_text_dimensions(api_key: str = None, text: str = '', model: str = No
             "If no dimensions are present, reply: NOT_FOUND. \nText:\n" + text
         )
 
-    # Get timeout from preferences
-    timeout = 30
+    settings = get_api_settings()
+    return {
+        'prompt': prompt_text,
+        'api_key': key,
+        'model': m,
+        'timeout': settings['timeout'],
+        'endpoint': settings['endpoint'],
+        'max_retries': settings['max_retries'],
+        'cache': _get_response_cache(),
+        'force_refresh': force_refresh
+    }, None
+
+
+def analyze_text_dimensions(api_key: str = None, text: str = '', model: str = None, context=None, file_path: str = '',
+                            force_refresh: bool = False) -> dict:
+    key, m = _ensure_api_key_and_model(api_key=api_key, model=model)
+    if not key:
+        return {'success': False, 'status_code': None, 'detail': 'No API key provided'}
+
+    request, error = build_text_request(key, text, model=m or None, context=context, file_path=file_path,
+                                        force_refresh=force_refresh)
+    if error:
+        return error
+
+    # Réponse en cache : aucun appel réseau, pas même la liste des modèles
+    from .PROD_gemini_batch import lookup_cached
+    cached = lookup_cached(request)
+    if cached is not None:
+        return cached
+
+    # ensure model list fresh: try to refresh synchronously if empty
     try:
         prefs = _get_prefs()
-        if prefs:
-            timeout = getattr(prefs, 'api_timeout', 30)
+        if prefs is not None:
+            try:
+                current = json.loads(prefs.model_list_json or '[]')
+            except Exception:
+                current = []
+            if not current:
+                list_models(key)
     except Exception:
         pass
 
-    out = call_gemini_api(prompt_text, api_key=key, model=m, timeout=timeout)
-    if out:
-        return {'success': True, 'status_code': None, 'detail': out}
-    else:
-        return {'success': False, 'status_code': None, 'detail': 'REST generate failed: no response'}
+    res = generate_content(**request)
+    if res['success']:
+        return res
+    return {'success': False, 'status_code': res['status_code'], 'detail': 'REST generate failed: no response'}
 
 
-def analyze_image_with_ocr(api_key=None, image_path=None, model=None, context=None, timeout=None, use_text_prompt=False):
-    """Analyze an image file with Gemini Vision, focusing on OCR and technical content extraction.
-    
-    Args:
-        api_key: Google API key for Gemini
-        image_path: Path to the image file (JPG/PNG)
-        model: Model name to use (defaults to prefs)
-        context: Blender context (optional)
-        timeout: Request timeout in seconds (defaults to prefs)
-        use_text_prompt: If True, use text analysis prompt instead of image prompt
-        
+def build_image_request(api_key=None, image_path=None, model=None, context=None, timeout=None, use_text_prompt=False,
+                        force_refresh=False):
+    """Prépare une requête d'analyse d'image (thread principal).
+
     Returns:
-        Dict with 'success', 'status_code', 'detail' keys
+        tuple: ``(requête, None)`` ou ``(None, résultat d'erreur)``
     """
     import base64
     import os
     
     if not image_path or not os.path.exists(image_path):
-        return {'success': False, 'status_code': None, 'detail': 'Image file not found'}
+        return None, {'success': False, 'status_code': None, 'detail': 'Image file not found'}
+    
+    # Determine MIME type
+    ext = os.path.splitext(image_path)[1].lower()
+    if ext not in ('.jpg', '.jpeg', '.png'):
+        return None, {'success': False, 'status_code': None, 'detail': f'Unsupported image format: {ext}'}
+    
+    # Réduction / réencodage avant envoi (version en cache si disponible)
+    upload_path = image_path
+    try:
+        from . import PROD_image_preprocess
+        upload_path = PROD_image_preprocess.prepare_image_for_upload(image_path)
+    except Exception as e:
+        logger.debug("Prétraitement de l'image impossible pour %s: %s", image_path, str(e))
+    mime_type = 'image/png' if os.path.splitext(upload_path)[1].lower() == '.png' else 'image/jpeg'
     
     # Read and encode image
     try:
-        with open(image_path, 'rb') as f:
+        with open(upload_path, 'rb') as f:
             image_data = f.read()
         image_b64 = base64.b64encode(image_data).decode('utf-8')
     except Exception as e:
-        return {'success': False, 'status_code': None, 'detail': f'Failed to read image: {e}'}
+        return None, {'success': False, 'status_code': None, 'detail': f'Failed to read image: {e}'}
     
-    # Determine MIME type
-    ext = os.path.splitext(image_path)[1].lower()
-    if ext in ('.jpg', '.jpeg'):
-        mime_type = 'image/jpeg'
-    elif ext == '.png':
-        mime_type = 'image/png'
-    else:
-        return {'success': False, 'status_code': None, 'detail': f'Unsupported image format: {ext}'}
+    if upload_path != image_path:
+        try:
+            original_size = os.path.getsize(image_path)
+            logger.info("Image %s: %.1f Ko envoyés au lieu de %.1f Ko (%.1f Ko économisés)",
+                        os.path.basename(image_path), len(image_data) / 1024.0, original_size / 1024.0,
+                        (original_size - len(image_data)) / 1024.0)
+        except OSError:
+            pass
     
     # Get API key and model
     key = api_key
@@ -362,19 +548,15 @@ def analyze_image_with_ocr(api_key=None, image_path=None, model=None, context=No
             pass
     
     if not key:
-        return {'success': False, 'status_code': None, 'detail': 'No API key provided'}
+        return None, {'success': False, 'status_code': None, 'detail': 'No API key provided'}
     
     if not m:
         m = 'gemini-2.5-flash'  # default model with vision support
     
+    settings = get_api_settings()
     # Get timeout from preferences if not provided
     if timeout is None:
-        timeout = 30
-        try:
-            if prefs:
-                timeout = getattr(prefs, 'api_timeout', 30)
-        except Exception:
-            pass
+        timeout = settings['timeout']
     
     # Utiliser le système de prompts configurables
     try:
@@ -402,12 +584,125 @@ Analyze the image for dimensional information."""
 Image: {os.path.basename(image_path)}
 Extract dimensions, text, and technical information."""
 
+    return {
+        'prompt': prompt_text,
+        'api_key': key,
+        'model': m,
+        'timeout': timeout,
+        'image_data': image_b64,
+        'image_mime_type': mime_type,
+        'endpoint': settings['endpoint'],
+        'max_retries': settings['max_retries'],
+        'cache': _get_response_cache(),
+        'force_refresh': force_refresh
+    }, None
+
+
+def analyze_image_with_ocr(api_key=None, image_path=None, model=None, context=None, timeout=None, use_text_prompt=False,
+                           force_refresh=False):
+    """Analyze an image file with Gemini Vision, focusing on OCR and technical content extraction.
+    
+    Args:
+        api_key: Google API key for Gemini
+        image_path: Path to the image file (JPG/PNG)
+        model: Model name to use (defaults to prefs)
+        context: Blender context (optional)
+        timeout: Request timeout in seconds (defaults to prefs)
+        use_text_prompt: If True, use text analysis prompt instead of image prompt
+        force_refresh: If True, ignore the cached response
+        
+    Returns:
+        Dict with 'success', 'status_code', 'detail' keys
+    """
+    request, error = build_image_request(api_key, image_path, model, context, timeout, use_text_prompt, force_refresh)
+    if error:
+        return error
+
     # Call Gemini API with image
-    out = call_gemini_api(prompt_text, api_key=key, model=m, timeout=timeout, image_data=image_b64, image_mime_type=mime_type)
-    if out:
-        return {'success': True, 'status_code': None, 'detail': out}
+    res = generate_content(**request)
+    if res['success']:
+        return res
+    return {'success': False, 'status_code': res['status_code'], 'detail': 'REST generate with image failed: no response'}
+
+
+def generate_content(prompt, api_key, model, timeout=30, image_data=None, image_mime_type=None,
+                     endpoint=DEFAULT_ENDPOINT, max_retries=3, cache=None, force_refresh=False,
+                     parts=None, json_response=False):
+    """Appel ``generateContent`` sans accès à ``bpy`` (utilisable depuis un thread).
+
+    Si ``cache`` (``PROD_ai_cache.AIResponseCache``) est fourni, une réponse
+    réussie pour la même requête est relue sans appel réseau, sauf avec
+    ``force_refresh``. ``parts`` ajoute des parties (texte ou ``inline_data``)
+    après le prompt ; ``json_response`` demande une réponse JSON.
+
+    Returns:
+        dict: {'success': bool, 'status_code': int|None, 'detail': texte ou message d'erreur}
+    """
+    cache_key = None
+    if cache is not None:
+        from .PROD_ai_cache import request_key
+        key_prompt = prompt + json.dumps(parts, sort_keys=True) if parts else prompt
+        cache_key = request_key(model, key_prompt, image_data, image_mime_type)
+        if not force_refresh:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.debug('Réponse Gemini relue du cache: %s', cache_key)
+                return cached
+
+    url = f"{endpoint.rstrip('/')}/models/{model}:generateContent?key={api_key}"
+    
+    # Build request payload
+    if image_data and image_mime_type:
+        # Multi-modal request with image
+        payload = {
+            "contents": [{
+                "parts": [
+                    {"text": prompt},
+                    {
+                        "inline_data": {
+                            "mime_type": image_mime_type,
+                            "data": image_data
+                        }
+                    }
+                ]
+            }]
+        }
     else:
-        return {'success': False, 'status_code': None, 'detail': 'REST generate with image failed: no response'}
+        # Text-only request
+        payload = {
+            "contents": [{"parts": [{"text": prompt}]}]
+        }
+    if parts:
+        payload["contents"][0]["parts"].extend(parts)
+    if json_response:
+        payload["generationConfig"] = {"responseMimeType": "application/json"}
+    
+    try:
+        logger.debug('Calling Gemini API: %s/models/%s', endpoint, model)
+        response_json = _request_json('POST', url, payload, timeout=timeout, max_retries=max_retries)
+    except _HTTPError as he:
+        logger.error('Gemini API HTTP error %s: %s', he.status, he.body)
+        return {'success': False, 'status_code': he.status, 'detail': he.body}
+    except Exception as e:
+        logger.error('Gemini API call failed: %s', e)
+        return {'success': False, 'status_code': None, 'detail': str(e)}
+    
+    # Extract text from response
+    try:
+        candidates = response_json.get('candidates', [])
+        if candidates and len(candidates) > 0:
+            content = candidates[0].get('content', {})
+            parts = content.get('parts', [])
+            if parts and len(parts) > 0 and parts[0].get('text'):
+                result = {'success': True, 'status_code': 200, 'detail': parts[0]['text']}
+                if cache_key is not None:
+                    cache.put(cache_key, result, model)
+                return result
+    except Exception as e:
+        logger.error('Error parsing Gemini response: %s', e)
+        logger.debug('Raw response: %s', response_json)
+    
+    return {'success': False, 'status_code': 200, 'detail': 'Empty response'}
 
 
 def call_gemini_api(prompt, api_key=None, model=None, timeout=30, image_data=None, image_mime_type=None):
@@ -431,68 +726,12 @@ def call_gemini_api(prompt, api_key=None, model=None, timeout=30, image_data=Non
     if not m:
         m = 'gemini-2.5-flash'  # fallback
 
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{m}:generateContent?key={key}"
-    
-    # Build request payload
-    try:
-        if image_data and image_mime_type:
-            # Multi-modal request with image
-            payload = {
-                "contents": [{
-                    "parts": [
-                        {"text": prompt},
-                        {
-                            "inline_data": {
-                                "mime_type": image_mime_type,
-                                "data": image_data
-                            }
-                        }
-                    ]
-                }]
-            }
-        else:
-            # Text-only request
-            payload = {
-                "contents": [{"parts": [{"text": prompt}]}]
-            }
-        
-        req_data = json.dumps(payload).encode('utf-8')
-        req = urllib.request.Request(
-            url, 
-            data=req_data, 
-            headers={'Content-Type': 'application/json'}
-        )
-        
-        logger.debug('Calling Gemini API: %s', url)
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            response_data = resp.read().decode('utf-8')
-            
-        response_json = json.loads(response_data)
-        
-        # Extract text from response
-        try:
-            candidates = response_json.get('candidates', [])
-            if candidates and len(candidates) > 0:
-                content = candidates[0].get('content', {})
-                parts = content.get('parts', [])
-                if parts and len(parts) > 0:
-                    return parts[0].get('text', '')
-        except Exception as e:
-            logger.error('Error parsing Gemini response: %s', e)
-            logger.debug('Raw response: %s', response_data)
-            
-        return None
-        
-    except urllib.error.HTTPError as he:
-        try:
-            error_body = he.read().decode('utf-8')
-            logger.error('Gemini API HTTP error %s: %s', he.code, error_body)
-        except Exception:
-            logger.error('Gemini API HTTP error: %s', he.code)
-        return None
-    except Exception as e:
-        logger.error('Gemini API call failed: %s', e)
-        return None
+    settings = get_api_settings()
+    res = generate_content(prompt, key, m, timeout=timeout, image_data=image_data, image_mime_type=image_mime_type,
+                           endpoint=settings['endpoint'], max_retries=settings['max_retries'])
+    return res['detail'] if res['success'] else None
 
 
-__all__ = ('list_models', 'test_connection', 'analyze_text_dimensions', 'analyze_image_with_ocr', 'call_gemini_api')
+__all__ = ('list_models', 'fetch_models', 'store_models', 'pick_default_model', 'test_connection', 'analyze_text_dimensions',
+           'analyze_image_with_ocr', 'build_text_request', 'build_image_request', 'generate_content',
+           'call_gemini_api', 'get_api_settings')
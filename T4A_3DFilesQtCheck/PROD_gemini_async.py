@@ -0,0 +1,189 @@
+"""Client Gemini asynchrone : pool de threads et poller ``bpy.app.timers``.
+
+Les requêtes sont préparées sur le thread principal (``PROD_gemini.build_*``),
+exécutées dans un ``ThreadPoolExecutor`` dont la taille limite le nombre de
+requêtes simultanées (``prefs.api_max_in_flight``), puis leurs résultats sont
+remis au thread principal par un timer qui appelle les callbacks (écriture
+dans ``T4A_DimResult`` notamment) au fur et à mesure des réponses.
+
+Le même pool rafraîchit la liste des modèles au démarrage de l'addon, sans
+bloquer l'enregistrement (``refresh_models_if_stale``).
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bpy
+
+from . import PROD_gemini
+
+
+class _SimpleLogger:
+    def debug(self, msg, *args):
+        try:
+            from . import PROD_Parameters
+            if PROD_Parameters.is_debug_mode():
+                print(f"[T4A] [DEBUG] [GEMINI_ASYNC] " + (msg % args if args else msg))
+        except Exception:
+            pass
+
+    def info(self, msg, *args):
+        print(f"[T4A] [INFO] [GEMINI_ASYNC] " + (msg % args if args else msg))
+
+    def error(self, msg, *args):
+        print(f"[T4A] [ERROR] [GEMINI_ASYNC] " + (msg % args if args else msg))
+
+
+logger = _SimpleLogger()
+
+POLL_INTERVAL = 0.2
+
+
+def get_max_in_flight():
+    """Nombre maximum de requêtes simultanées (préférences)."""
+    try:
+        from . import PROD_Parameters
+        prefs = PROD_Parameters.get_addon_preferences()
+        return max(1, getattr(prefs, 'api_max_in_flight', 4))
+    except Exception:
+        return 4
+
+
+class AsyncGeminiClient:
+    """File de requêtes Gemini exécutées hors du thread principal."""
+
+    def __init__(self):
+        self._executor = None
+        self._max_workers = 0
+        self._pending = []
+
+    @property
+    def pending_count(self):
+        return len(self._pending)
+
+    def _get_executor(self):
+        max_workers = get_max_in_flight()
+        if self._executor is not None and max_workers != self._max_workers and not self._pending:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='t4a_gemini')
+            self._max_workers = max_workers
+        return self._executor
+
+    def submit(self, request, on_done, label=''):
+        """Soumet ``generate_content(**request)`` ; ``on_done(résultat)`` est
+        appelé sur le thread principal à l'arrivée de la réponse."""
+        return self.submit_call(PROD_gemini.generate_content, on_done, label, **request)
+
+    def submit_call(self, func, on_done, label='', *args, on_error=None, **kwargs):
+        """Exécute ``func(*args, **kwargs)`` dans le pool ; ``on_done`` reçoit
+        son résultat sur le thread principal.
+
+        Si ``func`` lève une exception, ``on_error(message)`` est appelé à la
+        place ; sans ``on_error``, ``on_done`` reçoit un dict d'erreur
+        (``success`` False, ``detail``) comme une réponse HTTP en échec."""
+        future = self._get_executor().submit(func, *args, **kwargs)
+        self._pending.append((future, on_done, on_error, label))
+        if not bpy.app.timers.is_registered(self._poll):
+            bpy.app.timers.register(self._poll, first_interval=POLL_INTERVAL)
+        logger.debug("Requête soumise: %s (%d en cours)", label, len(self._pending))
+        return future
+
+    def _poll(self):
+        still_pending = []
+        for future, on_done, on_error, label in self._pending:
+            if not future.done():
+                still_pending.append((future, on_done, on_error, label))
+                continue
+            try:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if on_error is not None:
+                        on_error(str(e))
+                        continue
+                    result = {'success': False, 'status_code': None, 'detail': str(e)}
+                on_done(result)
+            except Exception as e:
+                logger.error("Traitement de la réponse impossible pour %s: %s", label, str(e))
+        self._pending = still_pending
+        return POLL_INTERVAL if self._pending else None
+
+    def shutdown(self):
+        """Abandonne les requêtes en attente (désenregistrement de l'addon)."""
+        if bpy.app.timers.is_registered(self._poll):
+            bpy.app.timers.unregister(self._poll)
+        for future, *_ in self._pending:
+            future.cancel()
+        self._pending = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+client = AsyncGeminiClient()
+
+
+def submit_request(request, on_done, label=''):
+    """Soumet une requête préparée au client partagé."""
+    return client.submit(request, on_done, label)
+
+
+def _on_models_fetched(result):
+    if not isinstance(result, list):
+        logger.debug("Liste des modèles non rafraîchie: %s", result.get('detail') if isinstance(result, dict) else result)
+        return
+    if not result:
+        return
+    PROD_gemini.store_models(result)
+    try:
+        from . import PROD_Parameters
+        prefs = PROD_Parameters.get_addon_preferences()
+        if prefs is not None and not getattr(prefs, 'model_name', None):
+            prefs.model_name = PROD_gemini.pick_default_model(result)
+    except Exception:
+        pass
+    logger.info("Liste des modèles mise à jour (%d modèles)", len(result))
+
+
+def refresh_models_if_stale(force=False):
+    """Rafraîchit ``prefs.model_list_json`` en arrière-plan si le cache a expiré.
+
+    La liste en cache reste utilisée en attendant la réponse. Ignoré en mode
+    ``--background`` (workers d'import par lots) et sans clé API.
+
+    Returns:
+        bool: True si une requête a été soumise
+    """
+    if bpy.app.background:
+        return False
+    try:
+        from . import PROD_Parameters
+        prefs = PROD_Parameters.get_addon_preferences()
+        if prefs is None:
+            return False
+        api_key = getattr(prefs, 'google_api_key', '') or os.environ.get('GOOGLE_API_KEY', '')
+        if not api_key:
+            return False
+        ttl = getattr(prefs, 'model_cache_ttl', 3600)
+        age = time.time() - float(getattr(prefs, 'model_list_ts', 0) or 0)
+        if not force and prefs.model_list_json and prefs.model_list_json != '[]' and age < ttl:
+            logger.debug("Liste des modèles en cache (%.0f s)", age)
+            return False
+        settings = PROD_gemini.get_api_settings()
+        client.submit_call(PROD_gemini.fetch_models, _on_models_fetched, 'models', api_key,
+                           settings['endpoint'], settings['max_retries'])
+        return True
+    except Exception as e:
+        logger.debug("Rafraîchissement des modèles impossible: %s", str(e))
+        return False
+
+
+def register():
+    pass
+
+
+def unregister():
+    client.shutdown()
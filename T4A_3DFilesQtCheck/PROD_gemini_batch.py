@@ -0,0 +1,192 @@
+"""Analyse groupée : plusieurs documents par requête Gemini.
+
+Les requêtes individuelles (``PROD_gemini.build_text_request`` /
+``build_image_request``) sont regroupées en une requête multi-parties : un
+prompt d'en-tête (``PROD_prompt_tags.get_batch_analysis_prompt``) puis, pour
+chaque document, une ligne ``### DOCUMENT <id>``, son prompt et son image.
+La réponse JSON ``{id: réponse}`` est redistribuée par document ; chaque
+réponse est enregistrée dans le cache IA sous la clé de la requête
+individuelle. Les documents absents ou illisibles dans la réponse sont
+renvoyés en appels individuels.
+
+``plan_batches`` et ``prepare_batch`` s'exécutent sur le thread principal ;
+``generate_batch`` n'accède pas à ``bpy``.
+"""
+
+import json
+import re
+
+from . import PROD_gemini
+from .PROD_ai_cache import request_key
+
+
+class _SimpleLogger:
+    def debug(self, msg, *args):
+        try:
+            from . import PROD_Parameters
+            if PROD_Parameters.is_debug_mode():
+                print(f"[T4A] [DEBUG] [GEMINI_BATCH] " + (msg % args if args else msg))
+        except Exception:
+            pass
+
+    def info(self, msg, *args):
+        print(f"[T4A] [INFO] [GEMINI_BATCH] " + (msg % args if args else msg))
+
+    def error(self, msg, *args):
+        print(f"[T4A] [ERROR] [GEMINI_BATCH] " + (msg % args if args else msg))
+
+
+logger = _SimpleLogger()
+
+_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$', re.IGNORECASE)
+
+
+def get_batch_settings():
+    """``(max_items, max_kb)`` depuis les préférences ; max_items <= 1 désactive."""
+    try:
+        from . import PROD_Parameters
+        prefs = PROD_Parameters.get_addon_preferences()
+        return getattr(prefs, 'ai_batch_size', 8), getattr(prefs, 'ai_batch_max_kb', 2048)
+    except Exception:
+        return 8, 2048
+
+
+def _request_size(request):
+    return len(request['prompt']) + len(request.get('image_data') or '')
+
+
+def _cache_key(request):
+    return request_key(request['model'], request['prompt'], request.get('image_data'),
+                       request.get('image_mime_type'))
+
+
+def lookup_cached(request):
+    """Réponse en cache de la requête individuelle, ou None."""
+    cache = request.get('cache')
+    if cache is None or request.get('force_refresh'):
+        return None
+    return cache.get(_cache_key(request))
+
+
+def plan_batches(requests, max_items=None, max_kb=None):
+    """Répartit des requêtes individuelles en lots.
+
+    Args:
+        requests: liste ``[(étiquette, requête), ...]``
+        max_items: nombre maximum de documents par lot
+        max_kb: taille maximale d'un lot (prompts + images encodées), en Ko
+
+    Returns:
+        list: lots ``[[(étiquette, requête), ...], ...]`` ; un document trop
+        gros ou seul de son modèle forme un lot d'un élément
+    """
+    default_items, default_kb = get_batch_settings()
+    max_items = default_items if max_items is None else max_items
+    max_bytes = (default_kb if max_kb is None else max_kb) * 1024
+
+    # Même modèle et même clé API par lot
+    groups = {}
+    for label, request in requests:
+        groups.setdefault((request['model'], request['api_key']), []).append((label, request))
+
+    batches = []
+    for items in groups.values():
+        current = []
+        current_size = 0
+        for label, request in items:
+            size = _request_size(request)
+            if max_items <= 1 or size > max_bytes:
+                batches.append([(label, request)])
+                continue
+            if current and (len(current) >= max_items or current_size + size > max_bytes):
+                batches.append(current)
+                current, current_size = [], 0
+            current.append((label, request))
+            current_size += size
+        if current:
+            batches.append(current)
+    return batches
+
+
+def prepare_batch(items, context=None):
+    """Construit les arguments de ``generate_batch`` pour un lot (thread principal).
+
+    Returns:
+        tuple: ``(prompt d'en-tête, [(id, étiquette, requête, en-tête du document), ...])``
+    """
+    from . import PROD_prompt_tags
+    item_ids = [f"D{index + 1}" for index in range(len(items))]
+    header = PROD_prompt_tags.get_batch_analysis_prompt(item_ids, context)
+    return header, [(item_id, label, request, PROD_prompt_tags.get_batch_item_header(item_id))
+                    for item_id, (label, request) in zip(item_ids, items)]
+
+
+def parse_batch_response(text, item_ids):
+    """Extrait ``{id: réponse}`` d'une réponse groupée (JSON, éventuellement entre ```).
+
+    Returns:
+        dict: réponses non vides des ids attendus ; vide si la réponse est illisible
+    """
+    if not text:
+        return {}
+    cleaned = _FENCE_RE.sub('', text.strip())
+    start, end = cleaned.find('{'), cleaned.rfind('}')
+    if start < 0 or end <= start:
+        return {}
+    try:
+        data = json.loads(cleaned[start:end + 1])
+    except ValueError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    answers = {}
+    for item_id in item_ids:
+        value = data.get(item_id)
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value, ensure_ascii=False)
+        if value is not None and str(value).strip():
+            answers[item_id] = str(value).strip()
+    return answers
+
+
+def generate_batch(header, entries):
+    """Envoie un lot et retourne ``{étiquette: résultat}`` (utilisable depuis un thread).
+
+    Un lot d'un seul document est envoyé tel quel ; les documents sans réponse
+    exploitable dans la réponse groupée sont renvoyés individuellement.
+    """
+    if len(entries) == 1:
+        _, label, request, _ = entries[0]
+        return {label: PROD_gemini.generate_content(**request)}
+
+    first = entries[0][2]
+    parts = []
+    for item_id, _, request, item_header in entries:
+        parts.append({'text': f"{item_header}\n{request['prompt']}"})
+        if request.get('image_data') and request.get('image_mime_type'):
+            parts.append({'inline_data': {'mime_type': request['image_mime_type'], 'data': request['image_data']}})
+
+    # Réponse plus longue à générer : délai proportionnel, borné
+    timeout = first['timeout'] * min(len(entries), 4)
+    res = PROD_gemini.generate_content(header, first['api_key'], first['model'], timeout=timeout,
+                                       endpoint=first['endpoint'], max_retries=first['max_retries'],
+                                       parts=parts, json_response=True)
+    answers = parse_batch_response(res['detail'], [e[0] for e in entries]) if res['success'] else {}
+
+    results = {}
+    fallbacks = 0
+    for item_id, label, request, _ in entries:
+        answer = answers.get(item_id)
+        if answer is None:
+            fallbacks += 1
+            results[label] = PROD_gemini.generate_content(**request)
+            continue
+        result = {'success': True, 'status_code': 200, 'detail': answer}
+        cache = request.get('cache')
+        if cache is not None:
+            cache.put(_cache_key(request), result, request['model'])
+        results[label] = result
+
+    logger.info("Lot de %d document(s): %d réponse(s) groupée(s), %d appel(s) individuel(s)",
+                len(entries), len(entries) - fallbacks, fallbacks)
+    return results
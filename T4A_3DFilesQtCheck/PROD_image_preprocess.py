@@ -0,0 +1,187 @@
+"""Réduction et réencodage des images avant envoi à l'analyse IA (OCR).
+
+Les photos produit de plusieurs dizaines de Mo sont ramenées à une taille
+maximale (plus grand côté) puis réencodées en JPEG, via OpenImageIO s'il est
+disponible (fourni avec Blender) ou sinon via l'API image de Blender. Les
+images avec canal alpha restent en PNG pour ne pas perdre le texte posé sur
+un fond transparent.
+
+Le résultat est mis en cache (clé : chemin, taille, mtime et paramètres) dans
+``<scan_path>/.t4a_ai_cache/images``. À appeler depuis le thread principal.
+"""
+
+import hashlib
+import os
+
+import bpy
+
+
+class _SimpleLogger:
+    def debug(self, msg, *args):
+        try:
+            from . import PROD_Parameters
+            if PROD_Parameters.is_debug_mode():
+                print(f"[T4A] [DEBUG] [IMAGE_PREP] " + (msg % args if args else msg))
+        except Exception:
+            pass
+
+    def info(self, msg, *args):
+        print(f"[T4A] [INFO] [IMAGE_PREP] " + (msg % args if args else msg))
+
+    def error(self, msg, *args):
+        print(f"[T4A] [ERROR] [IMAGE_PREP] " + (msg % args if args else msg))
+
+
+logger = _SimpleLogger()
+
+# En dessous de cette taille, une image assez petite est envoyée telle quelle
+REENCODE_MIN_BYTES = 1024 * 1024
+
+
+def get_preprocess_settings():
+    """``(max_edge, quality)`` depuis les préférences ; max_edge = 0 désactive."""
+    try:
+        from . import PROD_Parameters
+        prefs = PROD_Parameters.get_addon_preferences()
+        return getattr(prefs, 'ocr_max_edge', 2048), getattr(prefs, 'ocr_jpeg_quality', 85)
+    except Exception:
+        return 2048, 85
+
+
+def _cache_directory():
+    from . import PROD_ai_cache
+    return PROD_ai_cache.get_cache_subdirectory('images')
+
+
+def _cache_stem(image_path, max_edge, quality):
+    stat = os.stat(image_path)
+    key = f"{os.path.realpath(image_path)}|{stat.st_size}|{stat.st_mtime_ns}|{max_edge}|{quality}"
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _target_size(width, height, max_edge):
+    scale = min(1.0, max_edge / float(max(width, height, 1)))
+    return max(1, int(round(width * scale))), max(1, int(round(height * scale)))
+
+
+def _convert_oiio(source, stem, directory, max_edge, quality):
+    import OpenImageIO as oiio
+
+    buf = oiio.ImageBuf(source)
+    spec = buf.spec()
+    if buf.has_error or spec.width <= 0:
+        raise RuntimeError(buf.geterror() or "lecture impossible")
+    width, height = _target_size(spec.width, spec.height, max_edge)
+    if (width, height) != (spec.width, spec.height):
+        buf = oiio.ImageBufAlgo.resize(buf, roi=oiio.ROI(0, width, 0, height, 0, 1, 0, spec.nchannels))
+
+    has_alpha = spec.alpha_channel >= 0
+    target = os.path.join(directory, stem + ('.png' if has_alpha else '.jpg'))
+    if not has_alpha:
+        buf.specmod().attribute('Compression', f'jpeg:{quality}')
+        buf.specmod().attribute('CompressionQuality', quality)
+    buf.set_write_format(oiio.UINT8)
+    if not buf.write(target):
+        raise RuntimeError(buf.geterror() or "écriture impossible")
+    return target
+
+
+def _convert_bpy(source, stem, directory, max_edge, quality):
+    image = bpy.data.images.load(source, check_existing=False)
+    try:
+        width, height = image.size[0], image.size[1]
+        if width <= 0 or height <= 0:
+            raise RuntimeError("lecture impossible")
+        new_width, new_height = _target_size(width, height, max_edge)
+        if (new_width, new_height) != (width, height):
+            image.scale(new_width, new_height)
+
+        has_alpha = image.depth in (32, 64, 128)
+        target = os.path.join(directory, stem + ('.png' if has_alpha else '.jpg'))
+        image.filepath_raw = target
+        image.file_format = 'PNG' if has_alpha else 'JPEG'
+        try:
+            image.save(quality=quality)
+        except TypeError:
+            image.save()
+        return target
+    finally:
+        bpy.data.images.remove(image)
+
+
+def _exceeds_max_edge(image_path, max_edge):
+    """Indique si l'image dépasse ``max_edge`` (lecture de l'en-tête seulement si possible)."""
+    try:
+        import OpenImageIO as oiio
+        inp = oiio.ImageInput.open(image_path)
+        if inp:
+            spec = inp.spec()
+            inp.close()
+            return max(spec.width, spec.height) > max_edge
+    except ImportError:
+        pass
+    except Exception:
+        return False
+    image = bpy.data.images.load(image_path, check_existing=False)
+    try:
+        return max(image.size[0], image.size[1]) > max_edge
+    finally:
+        bpy.data.images.remove(image)
+
+
+def prepare_image_for_upload(image_path, max_edge=None, quality=None):
+    """Retourne le chemin de l'image à envoyer (originale ou version réduite).
+
+    Args:
+        image_path: image JPG/PNG source
+        max_edge: plus grand côté en pixels (préférences par défaut, 0 = pas de réduction)
+        quality: qualité JPEG (1-100)
+
+    Returns:
+        str: chemin du fichier à envoyer
+    """
+    default_edge, default_quality = get_preprocess_settings()
+    max_edge = default_edge if max_edge is None else max_edge
+    quality = default_quality if quality is None else quality
+    if not max_edge:
+        return image_path
+
+    from . import PROD_ai_cache
+
+    original_size = os.path.getsize(image_path)
+    directory = _cache_directory()
+    stem = _cache_stem(image_path, max_edge, quality)
+    for ext in ('.jpg', '.png'):
+        cached = os.path.join(directory, stem + ext)
+        if os.path.isfile(cached):
+            logger.debug("Image réduite relue du cache: %s", cached)
+            PROD_ai_cache.touch(cached)
+            return cached
+
+    if original_size < REENCODE_MIN_BYTES and not _exceeds_max_edge(image_path, max_edge):
+        return image_path
+
+    os.makedirs(directory, exist_ok=True)
+    target = None
+    for convert in (_convert_oiio, _convert_bpy):
+        try:
+            target = convert(image_path, stem, directory, max_edge, quality)
+            break
+        except ImportError:
+            continue
+        except Exception as e:
+            logger.debug("Conversion %s impossible pour %s: %s", convert.__name__, image_path, str(e))
+    if target is None:
+        return image_path
+
+    new_size = os.path.getsize(target)
+    if new_size >= original_size:
+        # Réencodage inutile : l'original est déjà plus léger
+        os.remove(target)
+        logger.debug("Image conservée telle quelle: %s", image_path)
+        return image_path
+
+    logger.debug("Image réduite: %s -> %s", image_path, target)
+    PROD_ai_cache.evict_ai_cache()
+    return target
+
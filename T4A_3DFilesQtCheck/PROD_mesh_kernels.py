@@ -0,0 +1,1339 @@
+"""Noyaux de calcul NumPy des analyses QC (UV, topologie, texel density).
+
+Ce module ne dépend ni de ``bpy`` ni du reste de l'addon : il travaille
+uniquement sur des snapshots de tableaux extraits via ``foreach_get``. Il
+peut donc être importé par les workers Python d'un ``ProcessPoolExecutor``
+(voir ``PROD_qc_workers``) aussi bien que par les modules d'analyse.
+"""
+
+import json
+import math
+
+import numpy as np
+
+
+# ---------------------------------------------------------------------------
+# UV
+# ---------------------------------------------------------------------------
+
+# Nombre maximum de faces détaillées (dict par face) dans les rapports ;
+# les index complets restent disponibles sous forme de tableau NumPy.
+MAX_REPORTED_FACES = 1000
+
+
+def _face_reduce(ufunc, values, layer_data):
+    """Applique une réduction ``ufunc`` par face sur un tableau indexé par loop."""
+    if len(layer_data['loop_start']) == 0:
+        return np.empty(0, dtype=values.dtype)
+    return ufunc.reduceat(values, layer_data['loop_start'])
+
+
+# Résolution maximale du buffer de rasterisation (4096² int32 = 64 Mo)
+MAX_GRID_RESOLUTION = 4096
+
+
+def _triangle_spans(uv_layer_data, resolution):
+    """Découpe les triangles UV en spans horizontaux de cellules (scanline).
+
+    Une cellule ``(row, col)`` est couverte si son centre est dans le triangle,
+    avec une règle de remplissage semi-ouverte pour que deux triangles
+    partageant une arête (diagonale d'un quad, couture UV) ne comptent pas
+    deux fois la même cellule.
+
+    Retourne ``(tri_index, row, col_start, col_end)`` avec ``col_end`` exclusif.
+    """
+    empty = np.empty(0, dtype=np.int64)
+    tri_loops = uv_layer_data['tri_loops']
+    if len(tri_loops) == 0:
+        return empty, empty, empty, empty
+    
+    pts = uv_layer_data['uvs'][tri_loops] * resolution - 0.5  # (T, 3, 2), centres de cellules entiers
+    
+    # Trier les sommets de chaque triangle par v croissant : a (bas), b, c (haut)
+    order = np.argsort(pts[:, :, 1], axis=1, kind='stable')
+    pts = np.take_along_axis(pts, order[:, :, None], axis=1)
+    ax, ay = pts[:, 0, 0], pts[:, 0, 1]
+    bx, by = pts[:, 1, 0], pts[:, 1, 1]
+    cx, cy = pts[:, 2, 0], pts[:, 2, 1]
+    
+    row_start = np.clip(np.ceil(ay), 0, resolution).astype(np.int64)
+    row_end = np.clip(np.ceil(cy), 0, resolution).astype(np.int64)
+    row_count = np.maximum(row_end - row_start, 0)
+    
+    tri_index = np.repeat(np.arange(len(pts)), row_count)
+    if len(tri_index) == 0:
+        return empty, empty, empty, empty
+    first_span = np.cumsum(row_count) - row_count
+    row = row_start[tri_index] + (np.arange(len(tri_index)) - np.repeat(first_span, row_count))
+    y = row.astype(np.float64)
+    
+    def _edge_x(x0, y0, x1, y1):
+        x0, y0, x1, y1 = x0[tri_index], y0[tri_index], x1[tri_index], y1[tri_index]
+        dy = y1 - y0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.where(dy != 0, (y - y0) / dy, 0.0)
+        return x0 + t * (x1 - x0)
+    
+    # Arête longue a-c, arête courte a-b sous b puis b-c au-dessus
+    x_long = _edge_x(ax, ay, cx, cy)
+    x_short = np.where(y < by[tri_index],
+                       _edge_x(ax, ay, bx, by),
+                       _edge_x(bx, by, cx, cy))
+    
+    col_start = np.clip(np.ceil(np.minimum(x_long, x_short)), 0, resolution).astype(np.int64)
+    col_end = np.clip(np.ceil(np.maximum(x_long, x_short)), 0, resolution).astype(np.int64)
+    keep = col_end > col_start
+    return tri_index[keep], row[keep], col_start[keep], col_end[keep]
+
+
+def rasterize_uv_coverage(uv_layer_data, resolution=256, with_owner=False):
+    """Rasterise les triangles UV dans un buffer de comptage NumPy int32.
+
+    Chaque span scanline est écrit dans un tableau de différences puis
+    intégré par somme cumulée : le coût est proportionnel au nombre de
+    spans et non au nombre de cellules couvertes.
+
+    Retourne un dict avec ``count`` (faces couvrant chaque cellule), les spans
+    (``span_tri``, ``span_row``, ``span_start``, ``span_end``) et, si
+    ``with_owner`` est vrai, ``owner`` : index de la face propriétaire pour les
+    cellules couvertes une seule fois, -1 si vide, -2 si en overlap.
+    """
+    resolution = int(max(1, min(MAX_GRID_RESOLUTION, resolution)))
+    span_tri, span_row, span_start, span_end = _triangle_spans(uv_layer_data, resolution)
+    
+    count = np.zeros((resolution, resolution + 1), dtype=np.int32)
+    np.add.at(count, (span_row, span_start), 1)
+    np.add.at(count, (span_row, span_end), -1)
+    np.cumsum(count, axis=1, out=count)
+    
+    result = {
+        'resolution': resolution,
+        'count': count[:, :resolution],
+        'span_tri': span_tri,
+        'span_row': span_row,
+        'span_start': span_start,
+        'span_end': span_end
+    }
+    
+    if with_owner:
+        # Somme des index de face (+1) par cellule : exacte là où count == 1
+        face_id = (uv_layer_data['tri_face'][span_tri] + 1).astype(np.int32)
+        owner = np.zeros((resolution, resolution + 1), dtype=np.int32)
+        np.add.at(owner, (span_row, span_start), face_id)
+        np.add.at(owner, (span_row, span_end), -face_id)
+        np.cumsum(owner, axis=1, out=owner)
+        owner = owner[:, :resolution] - 1
+        owner[result['count'] > 1] = -2
+        result['owner'] = owner
+    
+    return result
+
+
+def detect_uv_overlaps(uv_layer_data, grid_resolution=256, threshold=0.01):
+    """Détecte les overlaps UV en utilisant une grille de rasterisation."""
+    coverage = rasterize_uv_coverage(uv_layer_data, grid_resolution)
+    count = coverage['count']
+    
+    overlap_cells = count > 1
+    overlap_count = int(np.count_nonzero(overlap_cells))
+    total_cells = int(count.sum(dtype=np.int64))
+    
+    # Attribution par face : cellules en overlap couvertes par chaque span
+    overlap_prefix = np.zeros((count.shape[0], count.shape[1] + 1), dtype=np.int32)
+    np.cumsum(overlap_cells, axis=1, out=overlap_prefix[:, 1:])
+    span_rows = coverage['span_row']
+    span_overlap = (overlap_prefix[span_rows, coverage['span_end']]
+                    - overlap_prefix[span_rows, coverage['span_start']])
+    face_overlap_cells = np.bincount(
+        uv_layer_data['tri_face'][coverage['span_tri']],
+        weights=span_overlap,
+        minlength=uv_layer_data['total_faces']
+    ).astype(np.int64)
+    overlapping_faces = np.flatnonzero(face_overlap_cells)
+    
+    # Calculer le pourcentage d'overlap
+    overlap_percentage = (overlap_count / max(1, total_cells)) * 100
+    
+    return {
+        'has_overlaps': overlap_percentage > (threshold * 100),
+        'overlap_percentage': overlap_percentage,
+        'overlap_count': overlap_count,
+        'overlapping_faces': overlapping_faces.tolist(),
+        'total_overlapping_faces': len(overlapping_faces),
+        'face_overlap_cells': face_overlap_cells,
+        'grid_resolution': coverage['resolution']
+    }
+
+
+def _triangle_points(uv_layer_data):
+    """Retourne les triangles UV ``(T, 3, 2)`` orientés dans le sens trigonométrique."""
+    pts = uv_layer_data['uvs'][uv_layer_data['tri_loops']]
+    signed = _cross_2d(pts[:, 1] - pts[:, 0], pts[:, 2] - pts[:, 0])
+    flipped = signed < 0
+    pts[flipped] = pts[flipped][:, ::-1]
+    return pts, np.abs(signed) / 2
+
+
+def _cross_2d(a, b):
+    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+
+def _spatial_hash_pairs(bb_min, bb_max, tri_face, max_pairs=2_000_000):
+    """Broadphase par hash spatial : génère les paires de triangles candidates.
+
+    Les boîtes englobantes sont insérées dans une grille uniforme (taille de
+    cellule = étendue médiane des triangles) puis triées par cellule, soit
+    O(n log n). Chaque paire n'est émise que dans la cellule contenant le coin
+    bas-gauche de l'intersection de leurs boîtes, ce qui évite toute
+    déduplication. Les paires sont produites par lots d'au plus ``max_pairs``.
+    """
+    extent = np.max(bb_max - bb_min, axis=1)
+    # Borne le nombre de cellules couvertes par les plus grands triangles
+    cell = max(float(np.median(extent)), float(extent.max()) / 256)
+    if cell <= 0.0:
+        cell = 1.0 / MAX_GRID_RESOLUTION
+    
+    cmin = np.floor(bb_min / cell).astype(np.int64)
+    cmax = np.floor(bb_max / cell).astype(np.int64)
+    span = cmax - cmin + 1
+    cells_per_tri = span[:, 0] * span[:, 1]
+    
+    # Une entrée (cellule, triangle) par cellule couverte
+    entry_tri = np.repeat(np.arange(len(bb_min)), cells_per_tri)
+    local = np.arange(len(entry_tri)) - np.repeat(np.cumsum(cells_per_tri) - cells_per_tri, cells_per_tri)
+    entry_cx = cmin[entry_tri, 0] + local % span[entry_tri, 0]
+    entry_cy = cmin[entry_tri, 1] + local // span[entry_tri, 0]
+    origin = cmin.min(axis=0)
+    stride = int(cmax[:, 1].max() - origin[1]) + 1
+    keys = (entry_cx - origin[0]) * stride + (entry_cy - origin[1])
+    
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    entry_tri = entry_tri[order]
+    entry_cx = entry_cx[order]
+    entry_cy = entry_cy[order]
+    
+    # Groupes de même cellule : chaque entrée est appariée aux suivantes du groupe
+    bounds = np.flatnonzero(np.diff(keys)) + 1
+    group_start = np.concatenate(([0], bounds))
+    group_end = np.concatenate((bounds, [len(keys)]))
+    group_size = group_end - group_start
+    entry_group_end = np.repeat(group_end, group_size)
+    partners = entry_group_end - np.arange(len(keys)) - 1
+    partner_cum = np.cumsum(partners)
+    
+    first = 0
+    while first < len(keys):
+        last = int(np.searchsorted(partner_cum, partner_cum[first] - partners[first] + max_pairs, side='right'))
+        last = max(last, first + 1)
+        counts = partners[first:last]
+        left = np.repeat(np.arange(first, last), counts)
+        offset = np.arange(len(left)) - np.repeat(np.cumsum(counts) - counts, counts)
+        right = left + 1 + offset
+        first = last
+        
+        tri_a = entry_tri[left]
+        tri_b = entry_tri[right]
+        
+        keep = tri_face[tri_a] != tri_face[tri_b]
+        lo = np.maximum(bb_min[tri_a], bb_min[tri_b])
+        hi = np.minimum(bb_max[tri_a], bb_max[tri_b])
+        keep &= (lo < hi).all(axis=1)
+        ref = np.floor(lo / cell).astype(np.int64)
+        keep &= (ref[:, 0] == entry_cx[left]) & (ref[:, 1] == entry_cy[left])
+        
+        if keep.any():
+            yield tri_a[keep], tri_b[keep]
+
+
+def _triangle_intersection_area(tri_a, tri_b):
+    """Aire d'intersection de paires de triangles CCW (clipping Sutherland-Hodgman vectorisé)."""
+    n_pairs = len(tri_a)
+    rows = np.arange(n_pairs)
+    capacity = 9
+    poly = np.zeros((n_pairs, capacity, 2), dtype=np.float64)
+    poly[:, :3] = tri_a
+    size = np.full(n_pairs, 3, dtype=np.int64)
+    
+    for edge in range(3):
+        e0 = tri_b[:, edge]
+        e1 = tri_b[:, (edge + 1) % 3]
+        direction = e1 - e0
+        out = np.zeros_like(poly)
+        out_size = np.zeros(n_pairs, dtype=np.int64)
+        safe_size = np.maximum(size, 1)
+        
+        for k in range(capacity - 1):
+            active = k < size
+            if not active.any():
+                break
+            cur = poly[:, k]
+            nxt = poly[rows, (k + 1) % safe_size]
+            d_cur = _cross_2d(direction, cur - e0)
+            d_nxt = _cross_2d(direction, nxt - e0)
+            cur_in = d_cur >= 0
+            nxt_in = d_nxt >= 0
+            
+            emit = active & cur_in
+            out[rows[emit], out_size[emit]] = cur[emit]
+            out_size += emit
+            
+            crossing = active & (cur_in != nxt_in)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                t = d_cur / (d_cur - d_nxt)
+                point = cur + t[:, None] * (nxt - cur)
+            out[rows[crossing], out_size[crossing]] = point[crossing]
+            out_size += crossing
+        
+        poly, size = out, out_size
+    
+    area = np.zeros(n_pairs, dtype=np.float64)
+    safe_size = np.maximum(size, 1)
+    for k in range(capacity - 1):
+        active = k < size
+        nxt = poly[rows, (k + 1) % safe_size]
+        area += np.where(active, _cross_2d(poly[:, k], nxt), 0.0)
+    return np.where(size >= 3, np.abs(area) / 2, 0.0)
+
+
+def detect_uv_overlaps_exact(uv_layer_data, threshold=0.01, min_area=1e-12):
+    """Détecte les overlaps UV exacts par intersection géométrique des triangles.
+
+    Broadphase par hash spatial sur les boîtes englobantes, puis aire
+    d'intersection exacte (UV²) pour chaque paire de triangles de faces
+    différentes. Les coutures partagées ont une aire nulle et ne sont donc
+    pas signalées. Le pourcentage est l'aire en overlap rapportée à l'aire
+    UV totale.
+    """
+    tri_face = uv_layer_data['tri_face']
+    face_pairs = np.empty((0, 2), dtype=np.int64)
+    pair_areas = np.empty(0, dtype=np.float64)
+    total_uv_area = 0.0
+    
+    if len(tri_face):
+        pts, tri_area = _triangle_points(uv_layer_data)
+        total_uv_area = float(tri_area.sum())
+        # Les triangles dégénérés n'ont pas d'aire et faussent le clipping
+        valid = np.flatnonzero(tri_area > 0)
+        pts = pts[valid]
+        tri_face = tri_face[valid]
+        bb_min = pts.min(axis=1)
+        bb_max = pts.max(axis=1)
+        
+        found_a, found_b, found_area = [], [], []
+        for tri_a, tri_b in _spatial_hash_pairs(bb_min, bb_max, tri_face):
+            area = _triangle_intersection_area(pts[tri_a], pts[tri_b])
+            hit = area > min_area
+            found_a.append(tri_face[tri_a[hit]])
+            found_b.append(tri_face[tri_b[hit]])
+            found_area.append(area[hit])
+        
+        if found_area:
+            face_a = np.concatenate(found_a)
+            face_b = np.concatenate(found_b)
+            areas = np.concatenate(found_area)
+            low = np.minimum(face_a, face_b)
+            high = np.maximum(face_a, face_b)
+            
+            # Agréger les triangles par paire de faces
+            pair_keys, inverse = np.unique(low * uv_layer_data['total_faces'] + high, return_inverse=True)
+            pair_areas = np.bincount(inverse, weights=areas)
+            face_pairs = np.stack(np.divmod(pair_keys, uv_layer_data['total_faces']), axis=1)
+            order = np.argsort(-pair_areas, kind='stable')
+            face_pairs = face_pairs[order]
+            pair_areas = pair_areas[order]
+    
+    overlap_area = float(pair_areas.sum())
+    overlapping_faces = np.unique(face_pairs)
+    overlap_percentage = (overlap_area / total_uv_area) * 100 if total_uv_area > 0 else 0.0
+    
+    return {
+        'has_overlaps': overlap_percentage > (threshold * 100),
+        'overlap_percentage': overlap_percentage,
+        'overlap_count': len(pair_areas),
+        'overlapping_faces': overlapping_faces.tolist(),
+        'total_overlapping_faces': len(overlapping_faces),
+        'overlap_area': overlap_area,
+        'face_pairs': [(int(a), int(b), float(area)) for (a, b), area
+                       in zip(face_pairs[:MAX_REPORTED_FACES], pair_areas[:MAX_REPORTED_FACES])]
+    }
+
+
+def detect_uvs_outside_bounds(uv_layer_data):
+    """Détecte les UVs en dehors de l'espace 0-1."""
+    uvs = uv_layer_data['uvs']
+    total_faces = uv_layer_data['total_faces']
+    
+    loop_outside = ((uvs < 0.0) | (uvs > 1.0)).any(axis=1)
+    face_outside = _face_reduce(np.logical_or, loop_outside, uv_layer_data)
+    outside_indices = np.flatnonzero(face_outside)
+    outside_count = len(outside_indices)
+    
+    # Détail par face limité aux premières faces pour garder le rapport léger
+    outside_faces = []
+    if outside_count:
+        reported = outside_indices[:MAX_REPORTED_FACES]
+        min_uv = np.stack([_face_reduce(np.minimum, uvs[:, axis], uv_layer_data)[reported]
+                           for axis in (0, 1)], axis=1)
+        max_uv = np.stack([_face_reduce(np.maximum, uvs[:, axis], uv_layer_data)[reported]
+                           for axis in (0, 1)], axis=1)
+        loop_start = uv_layer_data['loop_start']
+        loop_total = uv_layer_data['loop_total']
+        for i, face_index in enumerate(reported.tolist()):
+            start = loop_start[face_index]
+            outside_faces.append({
+                'index': face_index,
+                'uvs': [tuple(uv) for uv in uvs[start:start + loop_total[face_index]].tolist()],
+                'extent': {
+                    'min_u': float(min_uv[i, 0]),
+                    'max_u': float(max_uv[i, 0]),
+                    'min_v': float(min_uv[i, 1]),
+                    'max_v': float(max_uv[i, 1])
+                }
+            })
+    
+    outside_percentage = (outside_count / max(1, total_faces)) * 100
+    
+    return {
+        'has_outside_uvs': outside_count > 0,
+        'outside_percentage': outside_percentage,
+        'outside_count': outside_count,
+        'outside_faces': outside_faces,
+        'outside_face_indices': outside_indices
+    }
+
+
+def analyze_uv_proportions(uv_layer_data, square_tolerance=0.1):
+    """Analyse les proportions et distorsions UV."""
+    bounds = uv_layer_data['bounds']
+    
+    # Calculer le ratio d'aspect du layout UV global
+    width = bounds['max_u'] - bounds['min_u']
+    height = bounds['max_v'] - bounds['min_v']
+    
+    if height > 0:
+        aspect_ratio = width / height
+        is_square = abs(aspect_ratio - 1.0) <= square_tolerance
+    else:
+        aspect_ratio = float('inf')
+        is_square = False
+    
+    # Calculer la distorsion (aire UV vs aire 3D) par face
+    face_uv_area = _calculate_faces_area_2d(uv_layer_data)
+    area_3d = uv_layer_data['area_3d']
+    valid = uv_layer_data['loop_total'] >= 3
+    
+    total_uv_area = float(face_uv_area[valid].sum())
+    total_3d_area = float(area_3d[valid].sum())
+    
+    has_area = valid & (area_3d > 0)
+    distortions = face_uv_area[has_area] / area_3d[has_area]
+    
+    if len(distortions):
+        average_distortion = float(distortions.mean())
+        distortion_range = (float(distortions.min()), float(distortions.max()))
+    else:
+        average_distortion = 0
+        distortion_range = (0, 0)
+    
+    return {
+        'is_square': is_square,
+        'aspect_ratio': aspect_ratio,
+        'layout_width': width,
+        'layout_height': height,
+        'total_uv_area': total_uv_area,
+        'total_3d_area': total_3d_area,
+        'average_distortion': average_distortion,
+        'distortion_range': distortion_range
+    }
+
+
+def _calculate_faces_area_2d(uv_layer_data):
+    """Calcule l'aire UV de chaque face (formule shoelace vectorisée sur les loops)."""
+    uvs = uv_layer_data['uvs']
+    loop_start = uv_layer_data['loop_start']
+    if len(loop_start) == 0:
+        return np.zeros(0, dtype=np.float64)
+    
+    # Loop suivante dans la même face (la dernière reboucle sur la première)
+    next_loop = np.arange(1, len(uvs) + 1)
+    next_loop[loop_start + uv_layer_data['loop_total'] - 1] = loop_start
+    
+    u, v = uvs[:, 0], uvs[:, 1]
+    cross = u * v[next_loop] - u[next_loop] * v
+    return np.abs(np.add.reduceat(cross, loop_start)) / 2
+
+
+def detect_udim_usage(uv_layer_data):
+    """Détecte l'usage de UDIM en analysant les coordonnées UV."""
+    # Index de tile UDIM par loop (troncature vers zéro comme int())
+    # Format UDIM standard : 1001 + tile_u + (tile_v * 10)
+    tiles = np.trunc(uv_layer_data['uvs']).astype(np.int64)
+    udim_tiles = np.unique(1001 + tiles[:, 0] + tiles[:, 1] * 10)
+    
+    # Filtrer les tiles valides (généralement 1001-1100)
+    valid_tiles = udim_tiles[(udim_tiles >= 1001) & (udim_tiles <= 1100)].tolist()
+    
+    return {
+        'uses_udim': len(valid_tiles) > 1,  # Plus d'une tile = UDIM
+        'udim_tiles': ','.join(map(str, valid_tiles)),
+        'udim_count': len(valid_tiles),
+        'tile_list': valid_tiles
+    }
+
+
+def analyze_uv_data(uv_data, preferences):
+    """Analyse toutes les couches d'un snapshot UV (voir ``get_mesh_uv_data``)."""
+    result = {
+        'object_name': uv_data['object_name'],
+        'total_faces': uv_data['total_faces'],
+        'total_vertices': uv_data['total_vertices'],
+        'uv_layers_count': len(uv_data['uv_layers']),
+        'analysis_success': True,
+        'analysis_error': '',
+        'layers': {}
+    }
+    
+    for layer_index, layer_data in uv_data['uv_layers'].items():
+        layer_result = {
+            'name': layer_data['name'],
+            'is_active': layer_data['is_active'],
+            'total_faces': layer_data['total_faces'],
+            'bounds': layer_data['bounds']
+        }
+        
+        # Analyse des overlaps
+        if preferences.get('overlap_mode') == 'EXACT':
+            layer_result['overlaps'] = detect_uv_overlaps_exact(
+                layer_data,
+                preferences['overlap_threshold']
+            )
+        else:
+            layer_result['overlaps'] = detect_uv_overlaps(
+                layer_data, 
+                preferences['grid_resolution'], 
+                preferences['overlap_threshold']
+            )
+        
+        # Analyse des UVs hors limites
+        layer_result['outside'] = detect_uvs_outside_bounds(layer_data)
+        
+        # Analyse des proportions
+        layer_result['proportions'] = analyze_uv_proportions(
+            layer_data, 
+            preferences['square_tolerance']
+        )
+        
+        # Détection UDIM
+        layer_result['udim'] = detect_udim_usage(layer_data)
+        
+        result['layers'][layer_index] = layer_result
+    
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Topologie
+# ---------------------------------------------------------------------------
+
+def compute_edge_face_incidence(arrays):
+    """Calcule l'incidence edge/faces à partir des loops.
+
+    Retourne ``(edge_face_count, edge_order, edge_group_start)`` : nombre de
+    faces par edge, loops triées par edge et début de chaque groupe d'edge
+    dans cet ordre.
+    """
+    if 'edge_face_count' not in arrays:
+        loop_edge = arrays['loop_edge']
+        edge_face_count = np.bincount(loop_edge, minlength=arrays['edge_count'])
+        arrays['edge_face_count'] = edge_face_count
+        arrays['edge_order'] = np.argsort(loop_edge, kind='stable')
+        arrays['edge_group_start'] = np.cumsum(edge_face_count) - edge_face_count
+    return arrays['edge_face_count'], arrays['edge_order'], arrays['edge_group_start']
+
+
+def _adjacent_face_pairs(arrays):
+    """Paires ordonnées (face, face adjacente) partageant un edge, multiplicité incluse."""
+    edge_face_count, edge_order, edge_group_start = compute_edge_face_incidence(arrays)
+    loop_face = arrays['loop_face']
+    
+    # Chaque loop est appariée à toutes les autres loops du même edge
+    sorted_edges = arrays['loop_edge'][edge_order]
+    group_size = edge_face_count[sorted_edges]
+    partners = group_size - 1
+    source = np.repeat(np.arange(len(edge_order)), partners)
+    offset = np.arange(len(source)) - np.repeat(np.cumsum(partners) - partners, partners)
+    local = source - edge_group_start[sorted_edges[source]]
+    target_local = offset + (offset >= local)
+    target = edge_group_start[sorted_edges[source]] + target_local
+    
+    face_a = loop_face[edge_order[source]]
+    face_b = loop_face[edge_order[target]]
+    keep = face_a != face_b
+    return face_a[keep], face_b[keep]
+
+
+# Nombre maximum d'edges / vertices détaillés dans les rapports manifold
+MAX_REPORTED_ELEMENTS = 100
+
+
+def classify_manifold_elements(arrays):
+    """Classe edges et vertices selon leur incidence, sans construire de bmesh.
+
+    Reproduit les règles ``BMEdge.is_manifold`` / ``BMVert.is_manifold`` :
+    un edge est manifold s'il a exactement deux faces ; un vertex ne l'est
+    pas s'il est libre, touche un edge wire ou à plus de deux faces, touche
+    trois edges de bord ou plus, ou si ses coins de faces forment plusieurs
+    éventails (bow-tie).
+    """
+    edge_face_count, edge_order, edge_group_start = compute_edge_face_incidence(arrays)
+    edge_vertices = arrays['edge_vertices']
+    vertex_count = arrays['vertex_count']
+    loop_vertex = arrays['loop_vertex']
+    
+    boundary_edges = edge_face_count == 1
+    wire_edges = edge_face_count == 0
+    multi_face_edges = edge_face_count > 2
+    
+    def _per_vertex(edge_mask):
+        return np.bincount(edge_vertices[edge_mask].ravel(), minlength=vertex_count)
+    
+    vertex_edge_count = _per_vertex(slice(None))
+    bad_edge_vertices = _per_vertex(wire_edges | multi_face_edges) > 0
+    boundary_per_vertex = _per_vertex(boundary_edges)
+    
+    # Éventails : les coins d'un même vertex sont reliés à travers chaque
+    # edge à deux faces ; plusieurs composantes = vertex bow-tie
+    loop_next = np.arange(1, len(loop_vertex) + 1)
+    loop_next[arrays['loop_start'] + arrays['loop_total'] - 1] = arrays['loop_start']
+    
+    two_face = np.flatnonzero(edge_face_count == 2)
+    first = edge_order[edge_group_start[two_face]]
+    second = edge_order[edge_group_start[two_face] + 1]
+    # Coin de la seconde face sur le vertex de départ du premier loop
+    second_same = loop_vertex[second] == loop_vertex[first]
+    corner_a = np.concatenate((first, loop_next[first]))
+    corner_b = np.concatenate((np.where(second_same, second, loop_next[second]),
+                               np.where(second_same, loop_next[second], second)))
+    corner_labels = _connected_labels(len(loop_vertex), corner_a, corner_b)
+    
+    fan_keys = np.unique(loop_vertex * len(loop_vertex) + corner_labels)
+    fan_count = np.bincount(fan_keys // max(1, len(loop_vertex)), minlength=vertex_count)
+    bowtie_vertices = fan_count > 1
+    
+    loose_vertices = vertex_edge_count == 0
+    non_manifold_vertices = (loose_vertices | bad_edge_vertices
+                             | (boundary_per_vertex >= 3) | bowtie_vertices)
+    
+    return {
+        'edge_face_count': edge_face_count,
+        'boundary_edges': boundary_edges,
+        'wire_edges': wire_edges,
+        'multi_face_edges': multi_face_edges,
+        'non_manifold_edges': edge_face_count != 2,
+        'vertex_edge_count': vertex_edge_count,
+        'vertex_face_count': np.bincount(loop_vertex, minlength=vertex_count),
+        'loose_vertices': loose_vertices,
+        'bowtie_vertices': bowtie_vertices,
+        'non_manifold_vertices': non_manifold_vertices
+    }
+
+
+def manifold_report(arrays):
+    """Rapport manifold (comptes et détails limités) à partir des tableaux."""
+    classes = classify_manifold_elements(arrays)
+    
+    edge_indices = np.flatnonzero(classes['non_manifold_edges'])
+    vertex_indices = np.flatnonzero(classes['non_manifold_vertices'])
+    edge_vertices = arrays['edge_vertices']
+    coords = arrays['coords']
+    
+    non_manifold_edges = [{
+        'index': index,
+        'face_count': int(classes['edge_face_count'][index]),
+        'vertices': edge_vertices[index].tolist()
+    } for index in edge_indices[:MAX_REPORTED_ELEMENTS].tolist()]
+    
+    non_manifold_verts = [{
+        'index': index,
+        'edge_count': int(classes['vertex_edge_count'][index]),
+        'face_count': int(classes['vertex_face_count'][index]),
+        'coordinate': tuple(coords[index].tolist())
+    } for index in vertex_indices[:MAX_REPORTED_ELEMENTS].tolist()]
+    
+    edge_issues = len(edge_indices)
+    vertex_issues = len(vertex_indices)
+    
+    return {
+        'has_manifold_issues': edge_issues > 0 or vertex_issues > 0,
+        'manifold_error_count': edge_issues + vertex_issues,
+        'non_manifold_edges': non_manifold_edges,
+        'non_manifold_vertices': non_manifold_verts,
+        'edge_issues_count': edge_issues,
+        'vertex_issues_count': vertex_issues,
+        'boundary_edges_count': int(np.count_nonzero(classes['boundary_edges'])),
+        'wire_edges_count': int(np.count_nonzero(classes['wire_edges'])),
+        'multi_face_edges_count': int(np.count_nonzero(classes['multi_face_edges'])),
+        'bowtie_vertices_count': int(np.count_nonzero(classes['bowtie_vertices'])),
+        'loose_vertices_count': int(np.count_nonzero(classes['loose_vertices']))
+    }
+
+
+def face_normals_report(arrays, threshold=0.5):
+    """Cohérence des normales de faces à partir des tableaux."""
+    total_faces = arrays['face_count']
+    
+    if total_faces == 0:
+        return {
+            'normal_consistency': 100.0,
+            'inverted_faces_count': 0,
+            'has_normal_issues': False,
+            'inconsistent_faces': []
+        }
+    
+    # Cohérence moyenne avec les faces adjacentes (produit scalaire borné à 0)
+    face_a, face_b = _adjacent_face_pairs(arrays)
+    normals = arrays['face_normal']
+    scores = np.maximum(0.0, np.einsum('ij,ij->i', normals[face_a], normals[face_b]))
+    score_sum = np.bincount(face_a, weights=scores, minlength=total_faces)
+    neighbour_count = np.bincount(face_a, minlength=total_faces)
+    
+    has_neighbours = neighbour_count > 0
+    avg_consistency = np.divide(score_sum, neighbour_count,
+                                out=np.ones(total_faces), where=has_neighbours)
+    inconsistent = np.flatnonzero(has_neighbours & (avg_consistency < threshold))
+    
+    inverted_count = len(inconsistent)
+    consistency = ((total_faces - inverted_count) / total_faces) * 100
+    
+    # Détail limité à 10 faces pour éviter surcharge
+    inconsistent_faces = []
+    for index in inconsistent[:10].tolist():
+        start = arrays['loop_start'][index]
+        face_vertices = arrays['loop_vertex'][start:start + arrays['loop_total'][index]]
+        inconsistent_faces.append({
+            'index': index,
+            'normal': tuple(normals[index].tolist()),
+            'consistency': float(avg_consistency[index]),
+            'center': tuple(arrays['coords'][face_vertices].mean(axis=0).tolist())
+        })
+    
+    return {
+        'normal_consistency': consistency,
+        'inverted_faces_count': inverted_count,
+        'has_normal_issues': inverted_count > 0,
+        'inconsistent_faces': inconsistent_faces
+    }
+
+
+def isolated_vertices_report(arrays):
+    """Vertices non utilisés par une face, à partir des tableaux."""
+    connected = np.zeros(arrays['vertex_count'], dtype=bool)
+    connected[arrays['loop_vertex']] = True
+    isolated = np.flatnonzero(~connected)
+    
+    isolated_vertices = [{
+        'index': index,
+        'coordinate': tuple(co)
+    } for index, co in zip(isolated.tolist(), arrays['coords'][isolated].tolist())]
+    
+    return {
+        'isolated_vertices_count': len(isolated_vertices),
+        'has_isolated_vertices': len(isolated_vertices) > 0,
+        'isolated_vertices': isolated_vertices
+    }
+
+
+# Offsets de la demi-fenêtre 3x3x3 (la cellule elle-même est traitée à part) :
+# chaque paire de cellules voisines n'est visitée qu'une fois.
+_FORWARD_CELL_OFFSETS = tuple(
+    (dx, dy, dz)
+    for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+    if (dx, dy, dz) > (0, 0, 0)
+)
+
+
+def _cell_hash(cells):
+    """Hash int64 d'une cellule de grille ; les collisions n'ajoutent que des candidats."""
+    return (cells[:, 0] * np.int64(73856093)) ^ (cells[:, 1] * np.int64(19349663)) ^ (cells[:, 2] * np.int64(83492791))
+
+
+def _close_point_pairs(points, tolerance, block_size=1_000_000):
+    """Paires de points à distance <= ``tolerance`` via une grille triée.
+
+    Avec un pas de grille de deux fois la tolérance, un point n'interroge que
+    les cellules voisines dont la boîte est à moins de ``tolerance`` de lui,
+    soit en moyenne ~3.5 cellules au lieu de 13.
+    """
+    cell_size = tolerance * 2.0
+    cells = np.floor(points / cell_size).astype(np.int64)
+    keys = _cell_hash(cells)
+    order = np.argsort(keys, kind='stable')
+    points = points[order]
+    cells = cells[order]
+    keys = keys[order]
+    tol_sq = tolerance * tolerance
+    
+    # Début/fin de chaque groupe de clé : une seule recherche par requête
+    group_start = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    group_keys = keys[group_start]
+    group_end = np.append(group_start[1:], len(keys))
+    
+    found_a, found_b = [], []
+    for block in range(0, len(points), block_size):
+        block_rows = np.arange(block, min(block + block_size, len(points)))
+        local = points[block_rows] - cells[block_rows] * cell_size  # position dans la cellule
+        for offset in ((0, 0, 0),) + _FORWARD_CELL_OFFSETS:
+            rows = block_rows
+            if offset != (0, 0, 0):
+                # Distance du point à la boîte de la cellule voisine
+                gap = np.zeros(len(rows))
+                for axis, step in enumerate(offset):
+                    if step > 0:
+                        gap += (cell_size - local[:, axis]) ** 2
+                    elif step < 0:
+                        gap += local[:, axis] ** 2
+                rows = rows[gap <= tol_sq]
+                if len(rows) == 0:
+                    continue
+            target = _cell_hash(cells[rows] + np.array(offset, dtype=np.int64))
+            group = np.minimum(np.searchsorted(group_keys, target), len(group_keys) - 1)
+            hit = group_keys[group] == target
+            hi = np.where(hit, group_end[group], 0)
+            if offset == (0, 0, 0):
+                lo = rows + 1
+            else:
+                lo = group_start[group]
+            counts = np.maximum(hi - lo, 0)
+            if not counts.any():
+                continue
+            left = np.repeat(rows, counts)
+            right = np.repeat(lo, counts) + (np.arange(len(left)) - np.repeat(np.cumsum(counts) - counts, counts))
+            delta = points[left] - points[right]
+            close = np.einsum('ij,ij->i', delta, delta) <= tol_sq
+            found_a.append(order[left[close]])
+            found_b.append(order[right[close]])
+    
+    if not found_a:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(found_a), np.concatenate(found_b)
+
+
+def _connected_labels(count, pair_a, pair_b):
+    """Composantes connexes (union-find vectorisé par accrochage + saut de pointeurs)."""
+    labels = np.arange(count)
+    while len(pair_a):
+        root_a = labels[pair_a]
+        root_b = labels[pair_b]
+        pending = root_a != root_b
+        if not pending.any():
+            break
+        root_a, root_b = root_a[pending], root_b[pending]
+        lowest = np.minimum(root_a, root_b)
+        np.minimum.at(labels, root_a, lowest)
+        np.minimum.at(labels, root_b, lowest)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+    return labels
+
+
+def find_duplicate_vertex_clusters(coords, tolerance=0.0001):
+    """Regroupe les vertices à moins de ``tolerance`` les uns des autres.
+
+    Les doublons exacts sont d'abord fusionnés, puis les points restants sont
+    appariés dans une grille triée et regroupés par liaison simple.
+    Retourne un label de cluster par vertex.
+    """
+    coords = np.ascontiguousarray(coords, dtype=np.float32)
+    if len(coords) == 0:
+        return np.empty(0, dtype=np.int64)
+    
+    # Fusion des positions strictement identiques : hash des bits float32,
+    # vérifié coordonnée par coordonnée (une collision ne fusionne rien)
+    count = len(coords)
+    bits = coords.view(np.int32).astype(np.int64)
+    _, first, inverse = np.unique(_cell_hash(bits), return_index=True, return_inverse=True)
+    representative = first[inverse.ravel()]
+    identical = (coords[representative] == coords).all(axis=1)
+    representative = np.where(identical, representative, np.arange(count))
+    
+    unique_index = np.flatnonzero(representative == np.arange(count))
+    compact = np.empty(count, dtype=np.int64)
+    compact[unique_index] = np.arange(len(unique_index))
+    
+    pair_a, pair_b = _close_point_pairs(coords[unique_index].astype(np.float64), tolerance)
+    unique_labels = _connected_labels(len(unique_index), pair_a, pair_b)
+    return unique_labels[compact[representative]]
+
+
+def duplicate_vertices_report(arrays, tolerance=0.0001):
+    """Clusters de vertices superposés à partir des tableaux.
+
+    ``duplicate_vertices_count`` compte les vertices redondants (taille de
+    chaque cluster moins un), ce qui correspond au nombre de vertices
+    supprimés par un *Merge by Distance*.
+    """
+    coords = arrays['coords']
+    
+    labels = find_duplicate_vertex_clusters(coords, tolerance)
+    cluster_sizes = np.bincount(labels, minlength=len(labels))
+    cluster_ids = np.flatnonzero(cluster_sizes > 1)
+    redundant = int((cluster_sizes[cluster_ids] - 1).sum())
+    
+    # Clusters les plus peuplés en premier
+    worst = cluster_ids[np.argsort(-cluster_sizes[cluster_ids], kind='stable')][:20]
+    worst_clusters = []
+    for cluster_id in worst.tolist():
+        members = np.flatnonzero(labels == cluster_id)
+        spread = coords[members] - coords[members[0]]
+        worst_clusters.append({
+            'vertices': members[:20].tolist(),
+            'size': len(members),
+            'max_distance': float(np.sqrt(np.einsum('ij,ij->i', spread, spread).max())),
+            'coordinate': tuple(coords[members[0]].tolist())
+        })
+    
+    duplicate_pairs = [{
+        'vertex1': cluster['vertices'][0],
+        'vertex2': cluster['vertices'][1],
+        'distance': float(np.linalg.norm(coords[cluster['vertices'][0]] - coords[cluster['vertices'][1]])),
+        'coordinate': cluster['coordinate']
+    } for cluster in worst_clusters]
+    
+    return {
+        'duplicate_vertices_count': redundant,
+        'has_duplicate_vertices': redundant > 0,
+        'duplicate_clusters_count': len(cluster_ids),
+        'worst_clusters': worst_clusters,
+        'duplicate_pairs': duplicate_pairs,
+        'tolerance_used': tolerance
+    }
+
+
+def polygon_distribution_report(arrays):
+    """Histogramme triangles / quads / n-gons à partir des tableaux."""
+    if arrays['face_count'] == 0:
+        return {
+            'total_polygons': 0,
+            'triangles_count': 0,
+            'quads_count': 0,
+            'ngons_count': 0,
+            'triangles_percentage': 0.0,
+            'quads_percentage': 0.0,
+            'ngons_percentage': 0.0,
+            'max_polygon_sides': 0
+        }
+    
+    # Histogramme du nombre de côtés par polygone
+    sides_histogram = np.bincount(arrays['loop_total'])
+    total = arrays['face_count']
+    triangles = int(sides_histogram[3]) if len(sides_histogram) > 3 else 0
+    quads = int(sides_histogram[4]) if len(sides_histogram) > 4 else 0
+    ngons = total - triangles - quads
+    max_sides = len(sides_histogram) - 1
+    
+    return {
+        'total_polygons': total,
+        'triangles_count': triangles,
+        'quads_count': quads,
+        'ngons_count': ngons,
+        'triangles_percentage': (triangles / total) * 100 if total > 0 else 0,
+        'quads_percentage': (quads / total) * 100 if total > 0 else 0,
+        'ngons_percentage': (ngons / total) * 100 if total > 0 else 0,
+        'max_polygon_sides': max_sides
+    }
+
+
+def analyze_topology_arrays(arrays, topology_data, preferences):
+    """Analyse topologique complète d'un snapshot (voir ``get_mesh_topology_arrays``).
+
+    ``topology_data`` apporte les comptes et les infos vertex colors lus
+    côté Blender (``get_mesh_topology_data``).
+    """
+    result = {
+        'object_name': topology_data['object_name'],
+        'total_vertices': topology_data['total_vertices'],
+        'total_edges': topology_data['total_edges'],
+        'total_polygons': topology_data['total_polygons'],
+        'analysis_success': True,
+        'analysis_error': ''
+    }
+    
+    # Analyse manifold
+    manifold_result = manifold_report(arrays)
+    result.update({
+        'has_manifold_issues': manifold_result['has_manifold_issues'],
+        'manifold_error_count': manifold_result['manifold_error_count'],
+        'boundary_edges_count': manifold_result['boundary_edges_count'],
+        'non_manifold_edges_count': manifold_result['multi_face_edges_count'],
+        'wire_edges_count': manifold_result['wire_edges_count'],
+        'bowtie_vertices_count': manifold_result['bowtie_vertices_count']
+    })
+    
+    # Analyse des normales
+    normals_result = face_normals_report(arrays, preferences['normal_threshold'])
+    result.update({
+        'normal_consistency': normals_result['normal_consistency'],
+        'inverted_faces_count': normals_result['inverted_faces_count'],
+        'has_normal_issues': normals_result['has_normal_issues']
+    })
+    
+    # Vertices isolés
+    isolated_result = isolated_vertices_report(arrays)
+    result.update({
+        'isolated_vertices_count': isolated_result['isolated_vertices_count'],
+        'has_isolated_vertices': isolated_result['has_isolated_vertices']
+    })
+    
+    # Vertices dupliqués
+    duplicates_result = duplicate_vertices_report(arrays, preferences['duplicate_tolerance'])
+    result.update({
+        'duplicate_vertices_count': duplicates_result['duplicate_vertices_count'],
+        'duplicate_clusters_count': duplicates_result['duplicate_clusters_count'],
+        'has_duplicate_vertices': duplicates_result['has_duplicate_vertices']
+    })
+    
+    # Vertex colors
+    if preferences['analyze_vertex_colors']:
+        result.update({
+            'has_vertex_colors': topology_data['has_vertex_colors'],
+            'vertex_color_layers_count': topology_data['vertex_color_layers']
+        })
+    else:
+        result.update({
+            'has_vertex_colors': False,
+            'vertex_color_layers_count': 0
+        })
+    
+    # Distribution des polygones
+    poly_result = polygon_distribution_report(arrays)
+    result.update({
+        'triangles_percentage': poly_result['triangles_percentage'],
+        'quads_percentage': poly_result['quads_percentage'],
+        'ngons_percentage': poly_result['ngons_percentage'],
+        'triangles_count': poly_result['triangles_count'],
+        'quads_count': poly_result['quads_count'],
+        'ngons_count': poly_result['ngons_count']
+    })
+    
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Texel density
+# ---------------------------------------------------------------------------
+
+def texel_face_areas(arrays):
+    """Aires UV et monde par face à partir des ``loop_triangles``.
+
+    Aire absolue de chaque triangle (UV et monde) sommée par polygone avec
+    ``np.bincount`` ; ``arrays['world_coords']`` contient les positions des
+    vertices en espace monde.
+    """
+    face_count = len(arrays['material_index'])
+    tri_loops = arrays['tri_loops']
+    tri_face = arrays['tri_face']
+    
+    uv = arrays['uvs'][tri_loops]  # (T, 3, 2)
+    uv_cross = _cross_2d(uv[:, 1] - uv[:, 0], uv[:, 2] - uv[:, 0])
+    uv_area = np.bincount(tri_face, weights=0.5 * np.abs(uv_cross), minlength=face_count)
+    
+    co = arrays['world_coords'][arrays['loop_vertex'][tri_loops]]  # (T, 3, 3)
+    world_cross = np.cross(co[:, 1] - co[:, 0], co[:, 2] - co[:, 0])
+    world_area = np.bincount(tri_face, weights=0.5 * np.linalg.norm(world_cross, axis=1),
+                             minlength=face_count)
+    
+    return uv_area, world_area
+
+
+# Bins fixes espacés logarithmiquement : 0.01 à 10 000 px/cm, 10 bins par
+# décade, plus un bin de débordement de chaque côté.
+TEXEL_HISTOGRAM_EDGES = np.logspace(-2, 4, 61)
+
+
+def histogram_percentiles(counts, minimum, maximum, percentiles=(5, 50, 95)):
+    """Percentiles estimés depuis un histogramme de densités.
+
+    Interpolation log-linéaire dans le bin concerné, bornée par les densités
+    min / max réelles (qui délimitent aussi les bins de débordement).
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    total = counts.sum()
+    if total <= 0 or minimum <= 0:
+        return {'p%d' % p: 0.0 for p in percentiles}
+    
+    low, high = math.log10(minimum), math.log10(maximum)
+    log_edges = np.log10(TEXEL_HISTOGRAM_EDGES)
+    bin_low = np.maximum(np.concatenate([[low], log_edges]), low)
+    bin_high = np.minimum(np.concatenate([log_edges, [high]]), high)
+    cumulative = np.cumsum(counts)
+    
+    result = {}
+    for p in percentiles:
+        target = p / 100.0 * total
+        index = min(int(np.searchsorted(cumulative, target, side='left')), len(counts) - 1)
+        before = cumulative[index] - counts[index]
+        fraction = (target - before) / counts[index] if counts[index] else 0.0
+        value = bin_low[index] + fraction * max(bin_high[index] - bin_low[index], 0.0)
+        result['p%d' % p] = float(10.0 ** min(max(value, low), high))
+    return result
+
+
+def merge_density_stats(stats, other):
+    """Fusionne deux agrégats de densités (comptes, moyenne, M2, min/max, histogramme).
+
+    Combinaison de Chan et al. pour la variance : aucune liste de densités
+    n'est nécessaire.
+    """
+    count = stats['density_count'] + other['density_count']
+    if other['density_count'] == 0:
+        return dict(stats)
+    if stats['density_count'] == 0:
+        return dict(other)
+    
+    delta = other['average_density'] - stats['average_density']
+    return {
+        'density_count': count,
+        'average_density': stats['average_density'] + delta * other['density_count'] / count,
+        'density_m2': (stats['density_m2'] + other['density_m2']
+                       + delta * delta * stats['density_count'] * other['density_count'] / count),
+        'min_density': min(stats['min_density'], other['min_density']),
+        'max_density': max(stats['max_density'], other['max_density']),
+        'histogram': (np.asarray(stats['histogram']) + np.asarray(other['histogram'])).tolist()
+    }
+
+
+def empty_density_stats():
+    """Agrégat de densités vide, point de départ de ``merge_density_stats``."""
+    return {
+        'density_count': 0,
+        'average_density': 0.0,
+        'density_m2': 0.0,
+        'min_density': 0.0,
+        'max_density': 0.0,
+        'histogram': [0] * (len(TEXEL_HISTOGRAM_EDGES) + 1)
+    }
+
+
+def texel_face_densities(arrays, materials, cm2_per_unit):
+    """Densité de texel par face (NaN pour les faces sans aire UV ou monde).
+
+    Returns:
+        dict: ``density``, ``uv_area``, ``world_area_cm2``, ``uv_valid``,
+        ``valid`` et ``slot_index`` (slot de matériau, ``len(materials)``
+        pour "No Material"), tous indexés par face
+    """
+    uv_area, world_area = texel_face_areas(arrays)
+    world_area_cm2 = world_area * cm2_per_unit
+    
+    slot_resolutions = [tuple(slot['resolution']) for slot in materials] + [(512, 512)]
+    slot_index = np.minimum(arrays['material_index'], len(materials))
+    
+    uv_valid = uv_area > 0
+    valid = uv_valid & (world_area > 0)
+    resolution = np.array(slot_resolutions, dtype=np.float64)[slot_index[valid]]
+    density = np.full(len(uv_area), np.nan)
+    density[valid] = (np.sqrt(resolution[:, 0] * resolution[:, 1] * uv_area[valid])
+                      / np.sqrt(world_area_cm2[valid]))
+    
+    return {
+        'density': density,
+        'uv_area': uv_area,
+        'world_area_cm2': world_area_cm2,
+        'uv_valid': uv_valid,
+        'valid': valid,
+        'slot_index': slot_index
+    }
+
+
+def texel_density_report(arrays, materials, cm2_per_unit, histogram_only=False):
+    """Densité de texel par matériau à partir d'un snapshot de mesh.
+
+    ``materials`` décrit les slots de l'objet (``name`` et ``resolution``) ;
+    un ``material_index`` hors des slots est rattaché à "No Material".
+    Retourne le même dictionnaire par matériau que
+    ``analyze_object_texel_density``, avec l'histogramme log des densités et
+    les percentiles p5 / p50 / p95. En mode ``histogram_only`` la liste
+    ``densities`` par face n'est pas conservée.
+    """
+    faces = texel_face_densities(arrays, materials, cm2_per_unit)
+    slot_index = faces['slot_index']
+    uv_valid = faces['uv_valid']
+    valid = faces['valid']
+    
+    slot_names = [slot['name'] for slot in materials] + ["No Material"]
+    slot_resolutions = [tuple(slot['resolution']) for slot in materials] + [(512, 512)]
+    
+    # Regroupement par nom de matériau, dans l'ordre d'apparition des faces
+    slot_group_names, slot_group = np.unique(np.array(slot_names, dtype=str), return_inverse=True)
+    face_group = slot_group[slot_index]
+    group_count = len(slot_group_names)
+    first_face = np.full(group_count, len(face_group))
+    np.minimum.at(first_face, face_group, np.arange(len(face_group)))
+    
+    densities = faces['density'][valid]
+    valid_faces = np.flatnonzero(valid)
+    valid_group = face_group[valid]
+    
+    # Statistiques par matériau
+    face_counts = np.bincount(face_group, minlength=group_count)
+    counts = np.bincount(valid_group, minlength=group_count)
+    safe_counts = np.maximum(counts, 1)
+    averages = np.bincount(valid_group, weights=densities, minlength=group_count) / safe_counts
+    deviations = densities - averages[valid_group]
+    m2 = np.bincount(valid_group, weights=deviations * deviations, minlength=group_count)
+    total_uv = np.bincount(valid_group, weights=faces['uv_area'][valid], minlength=group_count)
+    total_world = np.bincount(valid_group, weights=faces['world_area_cm2'][valid], minlength=group_count)
+    
+    # Histogramme par matériau (groupe x bin)
+    bin_count = len(TEXEL_HISTOGRAM_EDGES) + 1
+    bins = np.searchsorted(TEXEL_HISTOGRAM_EDGES, densities, side='right')
+    histograms = np.bincount(valid_group * bin_count + bins,
+                             minlength=group_count * bin_count).reshape(group_count, bin_count)
+    
+    # Densités triées par matériau (ordre des faces conservé) pour min/max/listes
+    order = np.argsort(valid_group, kind='stable')
+    sorted_densities = densities[order]
+    bounds = np.concatenate([[0], np.cumsum(counts)])
+    
+    invalid = np.flatnonzero(~valid)
+    invalid_group = face_group[invalid]
+    
+    results = {}
+    for group in np.argsort(first_face, kind='stable').tolist():
+        if face_counts[group] == 0:
+            continue
+        
+        group_errors = invalid[invalid_group == group]
+        errors = ['UV area is zero or negative' if not uv_valid[index]
+                  else 'World area is zero or negative'
+                  for index in group_errors.tolist()]
+        
+        material_result = {
+            'face_count': int(face_counts[group]),
+            'densities': [],
+            'average_density': 0.0,
+            'min_density': 0.0,
+            'max_density': 0.0,
+            'variance_percentage': 0.0,
+            'texture_resolution': (512, 512),
+            'total_uv_area': 0.0,
+            'total_world_area_cm2': 0.0,
+            'errors': errors,
+            'density_count': int(counts[group]),
+            'density_m2': float(m2[group]),
+            'histogram': histograms[group].tolist(),
+            'p5': 0.0,
+            'p50': 0.0,
+            'p95': 0.0
+        }
+        
+        if counts[group]:
+            group_densities = sorted_densities[bounds[group]:bounds[group + 1]]
+            last_face = valid_faces[order[bounds[group + 1] - 1]]
+            average = float(averages[group])
+            minimum = float(group_densities.min())
+            maximum = float(group_densities.max())
+            material_result.update({
+                'densities': [] if histogram_only else group_densities.tolist(),
+                'average_density': average,
+                'min_density': minimum,
+                'max_density': maximum,
+                'texture_resolution': slot_resolutions[slot_index[last_face]],
+                'total_uv_area': float(total_uv[group]),
+                'total_world_area_cm2': float(total_world[group])
+            })
+            material_result.update(histogram_percentiles(histograms[group], minimum, maximum))
+            if counts[group] > 1 and average > 0:
+                material_result['variance_percentage'] = math.sqrt(m2[group] / counts[group]) / average * 100.0
+        
+        results[str(slot_group_names[group])] = material_result
+    
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Snapshots (.npz) pour les workers
+# ---------------------------------------------------------------------------
+
+def _encode_snapshot(value, arrays, seen):
+    """Remplace les tableaux par des références et les dict par des paires clé/valeur."""
+    if isinstance(value, np.ndarray):
+        key = seen.get(id(value))
+        if key is None:
+            key = 'array_%d' % len(arrays)
+            seen[id(value)] = key
+            arrays[key] = value
+        return {'__array__': key}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {'__items__': [[key, _encode_snapshot(item, arrays, seen)]
+                              for key, item in value.items()]}
+    if isinstance(value, tuple):
+        return {'__tuple__': [_encode_snapshot(item, arrays, seen) for item in value]}
+    if isinstance(value, list):
+        return [_encode_snapshot(item, arrays, seen) for item in value]
+    return value
+
+
+def _decode_snapshot(value, arrays):
+    if isinstance(value, dict):
+        if '__array__' in value:
+            return arrays[value['__array__']]
+        if '__tuple__' in value:
+            return tuple(_decode_snapshot(item, arrays) for item in value['__tuple__'])
+        return {key: _decode_snapshot(item, arrays) for key, item in value['__items__']}
+    if isinstance(value, list):
+        return [_decode_snapshot(item, arrays) for item in value]
+    return value
+
+
+def save_snapshot(path, payload):
+    """Écrit un snapshot (dict imbriqué de tableaux NumPy et de scalaires) en ``.npz``.
+
+    Les tableaux partagés entre plusieurs entrées (offsets des couches UV par
+    exemple) ne sont écrits qu'une fois ; le reste est sérialisé en JSON.
+    ``path`` peut aussi être un fichier ouvert en écriture binaire.
+    """
+    arrays = {}
+    metadata = _encode_snapshot(payload, arrays, {})
+    arrays['__metadata__'] = np.array(json.dumps(metadata))
+    np.savez(path, **arrays)
+
+
+def load_snapshot(path):
+    """Relit un snapshot écrit par ``save_snapshot``."""
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {key: data[key] for key in data.files}
+    metadata = json.loads(str(arrays.pop('__metadata__')))
+    return _decode_snapshot(metadata, arrays)
+
+
+def _analyze_topology_snapshot(payload, options):
+    return analyze_topology_arrays(payload['arrays'], payload['topology_data'], options)
+
+
+def _analyze_uv_snapshot(payload, options):
+    return analyze_uv_data(payload['uv_data'], options)
+
+
+def _analyze_texel_snapshot(payload, options):
+    return texel_density_report(payload['arrays'], payload['materials'], payload['cm2_per_unit'],
+                                options.get('histogram_only', False))
+
+
+SNAPSHOT_ANALYZERS = {
+    'topology': _analyze_topology_snapshot,
+    'uv': _analyze_uv_snapshot,
+    'texel': _analyze_texel_snapshot,
+}
+
+
+def analyze_snapshot_file(path, analysis, options=None):
+    """Point d'entrée des workers : charge un snapshot et lance l'analyse demandée."""
+    return SNAPSHOT_ANALYZERS[analysis](load_snapshot(path), options or {})
@@ -521,8 +521,11 @@ class T4A_PT_PROD_FilesReviews(bpy.types.Panel):
                                 # Row 4: Bouton re-analyser
                                 btn_row = uv_box.row()
                                 uv_btn_op = btn_row.operator("t4a.analyze_uvs", text="Re-analyser UVs")
+                                exact_uv_op = btn_row.operator("t4a.analyze_uvs", text="Overlap Exact")
+                                exact_uv_op.overlap_mode = 'EXACT'
                                 if collection_name:
                                     uv_btn_op.collection_name = collection_name
+                                    exact_uv_op.collection_name = collection_name
                             else:
                                 # Erreur d'analyse UV
                                 uv_box.alert = True
@@ -575,6 +578,13 @@ class T4A_PT_PROD_FilesReviews(bpy.types.Panel):
                                     else:
                                         row2.label(text=f"Normales: {topo_res.normal_consistency:.0f}%", icon='CHECKMARK')
                                     
+                                    # Détail manifold
+                                    if topo_res.has_manifold_issues:
+                                        detail_row = topology_box.row()
+                                        detail_row.scale_y = 0.8
+                                        detail_row.label(text=f"Bords: {topo_res.boundary_edges_count}  >2 faces: {topo_res.non_manifold_edges_count}  "
+                                                              f"Wire: {topo_res.wire_edges_count}  Bow-tie: {topo_res.bowtie_vertices_count}")
+                                    
                                     # Row 3: Vertices problématiques
                                     row3 = topology_box.row()
                                     if topo_res.has_isolated_vertices:
@@ -583,7 +593,7 @@ class T4A_PT_PROD_FilesReviews(bpy.types.Panel):
                                         row3.label(text="Isolés: OK", icon='CHECKMARK')
                                     
                                     if topo_res.has_duplicate_vertices:
-                                        row3.label(text=f"Doublons: {topo_res.duplicate_vertices_count}", icon='ERROR')
+                                        row3.label(text=f"Doublons: {topo_res.duplicate_vertices_count} ({topo_res.duplicate_clusters_count} groupes)", icon='ERROR')
                                     else:
                                         row3.label(text="Doublons: OK", icon='CHECKMARK')
                                     
@@ -665,7 +675,14 @@ class T4A_PT_PROD_FilesReviews(bpy.types.Panel):
                                 row2.label(text=f"Min: {uv_res.min_texel_density:.1f} px/{unit_display}")
                                 row2.label(text=f"Max: {uv_res.max_texel_density:.1f} px/{unit_display}")
                                 
-                                # Row 3: Bouton re-analyser
+                                # Row 3: Percentiles de l'histogramme
+                                if uv_res.texel_density_p50 > 0:
+                                    row_pct = texel_box.row()
+                                    row_pct.label(text=f"P5: {uv_res.texel_density_p5:.1f}")
+                                    row_pct.label(text=f"P50: {uv_res.texel_density_p50:.1f}")
+                                    row_pct.label(text=f"P95: {uv_res.texel_density_p95:.1f}")
+                                
+                                # Row 4: Bouton re-analyser
                                 btn_row = texel_box.row()
                                 texel_btn_op = btn_row.operator("t4a.analyze_texel_density", text="Re-analyser Texel Density")
                                 if collection_name:
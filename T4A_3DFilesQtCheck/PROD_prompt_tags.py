@@ -223,10 +223,41 @@ def get_connection_test_prompt(context=None) -> str:
     return replace_prompt_tags(template, context)
 
 
+BATCH_ANALYSIS_PROMPT = """You will receive {DOCUMENT_COUNT} independent documents. Each one starts with a line "### DOCUMENT <id>" followed by its own instructions and content (and possibly an image).
+Process every document separately, exactly as if it had been sent alone, following its own instructions.
+Reply ONLY with a JSON object mapping each document id to your answer for that document, as a string.
+Expected ids: {DOCUMENT_IDS}
+Example: {"D1": "width: 1.2 m; height: 0.8 m; depth: 0.5 m", "D2": "NOT_FOUND"}"""
+
+
+def get_batch_item_header(item_id: str) -> str:
+    """Ligne d'en-tête d'un document dans une requête groupée."""
+    return f"### DOCUMENT {item_id}"
+
+
+def get_batch_analysis_prompt(item_ids, context=None) -> str:
+    """Construit le prompt d'en-tête d'une requête groupée (plusieurs documents).
+
+    Args:
+        item_ids: identifiants des documents (ex: D1, D2...), repris dans la réponse JSON
+        context: Contexte Blender (optionnel)
+
+    Returns:
+        str: Le prompt final avec tags remplacés
+    """
+    variables = {
+        'DOCUMENT_COUNT': str(len(item_ids)),
+        'DOCUMENT_IDS': ', '.join(item_ids)
+    }
+    return replace_prompt_tags(BATCH_ANALYSIS_PROMPT, context, **variables)
+
+
 __all__ = (
     'get_context_variables',
     'replace_prompt_tags', 
     'get_text_analysis_prompt',
     'get_image_analysis_prompt',
-    'get_connection_test_prompt'
+    'get_connection_test_prompt',
+    'get_batch_item_header',
+    'get_batch_analysis_prompt'
 )
\ No newline at end of file
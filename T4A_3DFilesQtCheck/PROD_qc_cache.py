@@ -0,0 +1,232 @@
+"""Cache persistant des résultats QC (topologie, UV, texel density).
+
+Chaque résultat est indexé par une empreinte du contenu du mesh : comptes
+d'éléments, hash des buffers ``foreach_get`` (coordonnées, sommets des
+polygones, UVs), ``matrix_world`` et paramètres de l'analyse. Un objet non
+modifié depuis la dernière analyse est donc relu sans recalcul.
+
+Les entrées sont stockées dans ``<scan_path>/.t4a_qc_cache`` (un fichier
+``.npz`` par résultat) avec éviction LRU basée sur la date d'accès.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+import bpy
+import numpy as np
+
+from .PROD_mesh_kernels import save_snapshot, load_snapshot
+
+
+class _SimpleLogger:
+    def debug(self, msg, *args):
+        try:
+            from . import PROD_Parameters
+            if PROD_Parameters.is_debug_mode():
+                print(f"[T4A] [DEBUG] [QC_CACHE] " + (msg % args if args else msg))
+        except Exception:
+            pass
+
+    def info(self, msg, *args):
+        print(f"[T4A] [INFO] [QC_CACHE] " + (msg % args if args else msg))
+
+    def error(self, msg, *args):
+        print(f"[T4A] [ERROR] [QC_CACHE] " + (msg % args if args else msg))
+
+
+logger = _SimpleLogger()
+
+CACHE_DIR_NAME = '.t4a_qc_cache'
+
+# À incrémenter quand le contenu des résultats d'analyse change
+CACHE_VERSION = 2
+
+
+class QCResultCache:
+    """Cache disque des résultats QC avec éviction LRU."""
+
+    def __init__(self, directory, max_entries=2000):
+        self.directory = directory
+        self.max_entries = max_entries
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.npz')
+
+    def get(self, key):
+        """Retourne le résultat associé à ``key`` ou None."""
+        path = self._path(key)
+        if not os.path.isfile(path):
+            return None
+        try:
+            result = load_snapshot(path)
+            # Date de modification = dernier accès, utilisée pour l'éviction
+            os.utime(path, None)
+            return result
+        except Exception as e:
+            logger.debug("Entrée de cache illisible %s: %s", key, str(e))
+            return None
+
+    def put(self, key, result):
+        """Enregistre ``result`` (écriture atomique) puis applique l'éviction."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as handle:
+                    save_snapshot(handle, result)
+                os.replace(tmp_path, self._path(key))
+            except Exception:
+                os.remove(tmp_path)
+                raise
+            self.evict()
+        except Exception as e:
+            logger.debug("Écriture cache impossible %s: %s", key, str(e))
+
+    def evict(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de ``max_entries``."""
+        with os.scandir(self.directory) as it:
+            entries = [(entry.stat().st_mtime, entry.path) for entry in it
+                       if entry.is_file() and entry.name.endswith('.npz')]
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return
+        entries.sort()
+        for _, path in entries[:excess]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        logger.debug("Cache QC: %d entrée(s) évincée(s)", excess)
+
+
+def get_qc_cache():
+    """Cache QC configuré dans les préférences, ou None si désactivé."""
+    try:
+        from . import PROD_Parameters
+        prefs = PROD_Parameters.get_addon_preferences()
+        if prefs is None or not getattr(prefs, 'qc_cache_enabled', True):
+            return None
+        scan_path = bpy.path.abspath(getattr(prefs, 'scan_path', '') or '')
+        if not scan_path or not os.path.isdir(scan_path):
+            return None
+        return QCResultCache(os.path.join(scan_path, CACHE_DIR_NAME),
+                             getattr(prefs, 'qc_cache_max_entries', 2000))
+    except Exception:
+        return None
+
+
+def _hash_buffer(digest, collection, attribute, dtype, width):
+    buffer = np.empty(len(collection) * width, dtype=dtype)
+    if len(buffer):
+        collection.foreach_get(attribute, buffer)
+    digest.update(buffer.tobytes())
+
+
+def mesh_fingerprint(mesh_obj, analysis, options=None, extra=None):
+    """Empreinte du contenu d'un mesh pour une analyse donnée.
+
+    Args:
+        mesh_obj: Objet mesh Blender
+        analysis: nom de l'analyse ('topology', 'uv', 'texel')
+        options: préférences de l'analyse (font partie de la clé)
+        extra: données supplémentaires sérialisables en JSON (matériaux...)
+
+    Returns:
+        str: clé hexadécimale
+    """
+    mesh = mesh_obj.data
+    digest = hashlib.blake2b(digest_size=20)
+
+    header = {
+        'version': CACHE_VERSION,
+        'analysis': analysis,
+        'object_name': mesh_obj.name,
+        'counts': [len(mesh.vertices), len(mesh.edges), len(mesh.polygons), len(mesh.loops)],
+        'uv_layers': [layer.name for layer in mesh.uv_layers],
+        'active_uv': mesh.uv_layers.active.name if mesh.uv_layers.active else '',
+        'vertex_colors': len(mesh.vertex_colors),
+        'options': options or {},
+        'extra': extra
+    }
+    digest.update(json.dumps(header, sort_keys=True, default=str).encode('utf-8'))
+
+    digest.update(np.array(mesh_obj.matrix_world, dtype=np.float64).tobytes())
+    _hash_buffer(digest, mesh.vertices, 'co', np.float32, 3)
+    _hash_buffer(digest, mesh.edges, 'vertices', np.int32, 2)
+    _hash_buffer(digest, mesh.polygons, 'loop_total', np.int32, 1)
+    _hash_buffer(digest, mesh.loops, 'vertex_index', np.int32, 1)
+    if analysis == 'texel':
+        _hash_buffer(digest, mesh.polygons, 'material_index', np.int32, 1)
+    for layer in mesh.uv_layers:
+        _hash_buffer(digest, layer.data, 'uv', np.float32, 2)
+
+    return digest.hexdigest()
+
+
+def cached_analysis(mesh_obj, analysis, options, compute, extra=None, is_valid=None):
+    """Retourne le résultat en cache ou appelle ``compute()`` et le mémorise.
+
+    ``is_valid(result)`` filtre les résultats à ne pas mettre en cache
+    (analyse en échec par exemple).
+    """
+    cache = get_qc_cache()
+    if cache is None:
+        return compute()
+
+    try:
+        key = mesh_fingerprint(mesh_obj, analysis, options, extra)
+    except Exception as e:
+        logger.debug("Empreinte impossible pour %s: %s", mesh_obj.name, str(e))
+        return compute()
+
+    result = cache.get(key)
+    if result is not None:
+        logger.debug("Cache QC %s: résultat réutilisé pour %s", analysis, mesh_obj.name)
+        return result
+
+    result = compute()
+    if is_valid is None or is_valid(result):
+        cache.put(key, result)
+    return result
+
+
+def partition_cached(mesh_objects, analysis, options, extra_for=None):
+    """Sépare les objets déjà en cache de ceux à analyser (mode pool).
+
+    Returns:
+        tuple: (résultats en cache par nom, clés par nom des objets à analyser)
+    """
+    cache = get_qc_cache()
+    if cache is None:
+        return {}, {}
+
+    cached, keys = {}, {}
+    for mesh_obj in mesh_objects:
+        try:
+            extra = extra_for(mesh_obj) if extra_for else None
+            key = mesh_fingerprint(mesh_obj, analysis, options, extra)
+        except Exception as e:
+            logger.debug("Empreinte impossible pour %s: %s", mesh_obj.name, str(e))
+            continue
+        result = cache.get(key)
+        if result is not None:
+            cached[mesh_obj.name] = result
+        else:
+            keys[mesh_obj.name] = key
+
+    if cached:
+        logger.info("Cache QC %s: %d/%d objet(s) réutilisé(s)", analysis, len(cached), len(mesh_objects))
+    return cached, keys
+
+
+def store_results(results, keys, is_valid=None):
+    """Mémorise les résultats calculés hors cache (voir ``partition_cached``)."""
+    cache = get_qc_cache()
+    if cache is None:
+        return
+    for name, result in results.items():
+        key = keys.get(name)
+        if key and (is_valid is None or is_valid(result)):
+            cache.put(key, result)
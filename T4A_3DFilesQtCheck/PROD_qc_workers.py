@@ -0,0 +1,150 @@
+"""Analyse QC parallèle des objets d'une collection.
+
+Le thread principal de Blender extrait un snapshot NumPy de chaque mesh
+(``foreach_get``), l'écrit en ``.npz`` dans un dossier temporaire puis le
+soumet à un ``ProcessPoolExecutor`` de workers Python. Les workers n'importent
+que ``PROD_mesh_kernels`` (sans ``bpy``) en tant que module de premier niveau.
+"""
+
+import importlib
+import multiprocessing
+import os
+import sys
+import tempfile
+import types
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+class _SimpleLogger:
+    def debug(self, msg, *args):
+        try:
+            from . import PROD_Parameters
+            if PROD_Parameters.is_debug_mode():
+                print(f"[T4A] [DEBUG] [QC_WORKERS] " + (msg % args if args else msg))
+        except Exception:
+            pass
+
+    def info(self, msg, *args):
+        print(f"[T4A] [INFO] [QC_WORKERS] " + (msg % args if args else msg))
+
+    def error(self, msg, *args):
+        print(f"[T4A] [ERROR] [QC_WORKERS] " + (msg % args if args else msg))
+
+
+logger = _SimpleLogger()
+
+_ADDON_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def get_worker_count():
+    """Nombre de processus configuré (0 ou 1 = analyse séquentielle)."""
+    try:
+        from . import PROD_Parameters
+        prefs = PROD_Parameters.get_addon_preferences()
+        workers = getattr(prefs, 'qc_worker_processes', 0)
+    except Exception:
+        workers = 0
+
+    if workers < 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def use_worker_pool(object_count):
+    """Indique si une collection de ``object_count`` objets doit passer par le pool."""
+    # Les workers Python ne peuvent pas être lancés depuis bpy en module
+    # (pas d'exécutable Python dédié).
+    if not os.path.isfile(sys.executable or ''):
+        return False
+    return get_worker_count() > 1 and object_count > 1
+
+
+def _import_kernels():
+    """Importe ``PROD_mesh_kernels`` comme module de premier niveau.
+
+    Les processus ``spawn`` ne doivent pas importer le package de l'addon (son
+    ``__init__`` importe ``bpy``) : la fonction soumise doit donc provenir du
+    module autonome, trouvé via le dossier de l'addon ajouté à ``sys.path``.
+    """
+    if _ADDON_DIR not in sys.path:
+        sys.path.append(_ADDON_DIR)
+    return importlib.import_module('PROD_mesh_kernels')
+
+
+class _DetachedMain:
+    """Masque le module ``__main__`` pendant le lancement des workers.
+
+    En mode ``spawn``, chaque worker réimporte le script ``__main__`` du parent
+    (``blender --python script.py``) : celui-ci importe ``bpy`` et ne doit
+    pas être rejoué hors de Blender.
+    """
+
+    def __enter__(self):
+        self._main = sys.modules.get('__main__')
+        sys.modules['__main__'] = types.ModuleType('__main__')
+
+    def __exit__(self, *exc_info):
+        sys.modules['__main__'] = self._main
+        return False
+
+
+def run_snapshot_jobs(jobs, analysis, options=None, progress=None, max_workers=None):
+    """Analyse une série de snapshots dans un pool de processus.
+
+    Args:
+        jobs: itérable de ``(nom, payload)`` ; consommé sur le thread principal,
+            il peut donc lire les données Blender pendant que les workers
+            calculent. Un payload ``None`` est ignoré
+        analysis: 'topology', 'uv' ou 'texel' (voir ``SNAPSHOT_ANALYZERS``)
+        options: préférences transmises au noyau d'analyse
+        progress: callback ``progress(terminés, total, nom)``
+        max_workers: nombre de processus (préférences par défaut)
+
+    Returns:
+        dict: résultat par nom ; les jobs en erreur sont absents du dict afin
+        que l'appelant puisse les relancer en séquentiel
+    """
+    kernels = _import_kernels()
+    max_workers = max_workers or get_worker_count()
+    results = {}
+
+    with tempfile.TemporaryDirectory(prefix='t4a_qc_') as snapshot_dir:
+        paths = {}
+        try:
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+                futures = {}
+                for index, (name, payload) in enumerate(jobs):
+                    if payload is None:
+                        continue
+                    path = os.path.join(snapshot_dir, '%05d.npz' % index)
+                    kernels.save_snapshot(path, payload)
+                    paths[name] = path
+                    with _DetachedMain():
+                        future = executor.submit(kernels.analyze_snapshot_file, path, analysis, options)
+                    futures[future] = name
+
+                total = len(futures)
+                logger.info("Analyse %s de %d objets sur %d processus", analysis, total, max_workers)
+                for done, future in enumerate(as_completed(futures), 1):
+                    name = futures[future]
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        logger.error("Worker %s en échec pour %s: %s", analysis, name, str(e))
+                    if progress:
+                        progress(done, total, name)
+
+        except Exception as e:
+            # Pool indisponible (processus refusés, pool cassé...) : on termine
+            # les snapshots déjà écrits dans le processus courant.
+            logger.error("Pool de processus indisponible (%s), analyse séquentielle", str(e))
+            for name, path in paths.items():
+                if name in results:
+                    continue
+                try:
+                    results[name] = kernels.analyze_snapshot_file(path, analysis, options)
+                except Exception as inner:
+                    logger.error("Analyse %s impossible pour %s: %s", analysis, name, str(inner))
+
+    return results
@@ -7,14 +7,20 @@ Fonctionnalités:
 - Analyse de la variance entre faces
 - Détection des incohérences de résolution
 - Support multi-matériaux et UDIM
+- Histogramme log des densités (p5/p50/p95) et attribut de face pour la heatmap
 """
 
 import bpy
-import bmesh
-import mathutils
-from mathutils import Vector
 import math
-from collections import defaultdict
+import numpy as np
+
+from .PROD_mesh_kernels import (
+    texel_face_densities,
+    texel_density_report,
+    histogram_percentiles,
+    merge_density_stats,
+    empty_density_stats,
+)
 
 # Import du logger personnalisé
 try:
@@ -49,89 +55,6 @@ def get_texture_resolution(material):
     return (512, 512)  # Défaut si aucune texture trouvée
 
 
-def calculate_uv_area(face, uv_layer):
-    """
-    Calcule l'aire d'une face dans l'espace UV (0-1).
-    
-    Args:
-        face: Face bmesh
-        uv_layer: Couche UV active
-        
-    Returns:
-        float: Aire en unités UV²
-    """
-    if len(face.loops) < 3:
-        return 0.0
-    
-    # Récupérer les coordonnées UV
-    uv_coords = []
-    for loop in face.loops:
-        uv_coords.append(loop[uv_layer].uv)
-    
-    # Triangulation pour calculer l'aire
-    if len(uv_coords) == 3:
-        # Triangle simple
-        v0, v1, v2 = uv_coords
-        return 0.5 * abs((v1.x - v0.x) * (v2.y - v0.y) - (v2.x - v0.x) * (v1.y - v0.y))
-    
-    elif len(uv_coords) == 4:
-        # Quadrilatère - diviser en deux triangles
-        v0, v1, v2, v3 = uv_coords
-        area1 = 0.5 * abs((v1.x - v0.x) * (v2.y - v0.y) - (v2.x - v0.x) * (v1.y - v0.y))
-        area2 = 0.5 * abs((v2.x - v0.x) * (v3.y - v0.y) - (v3.x - v0.x) * (v2.y - v0.y))
-        return area1 + area2
-    
-    else:
-        # N-gon - fan triangulation depuis le premier vertex
-        total_area = 0.0
-        v0 = uv_coords[0]
-        for i in range(1, len(uv_coords) - 1):
-            v1, v2 = uv_coords[i], uv_coords[i + 1]
-            area = 0.5 * abs((v1.x - v0.x) * (v2.y - v0.y) - (v2.x - v0.x) * (v1.y - v0.y))
-            total_area += area
-        
-        return total_area
-
-
-def calculate_world_area(face, world_matrix):
-    """
-    Calcule l'aire d'une face dans l'espace monde.
-    
-    Args:
-        face: Face bmesh
-        world_matrix: Matrice de transformation monde
-        
-    Returns:
-        float: Aire en unités Blender²
-    """
-    if len(face.verts) < 3:
-        return 0.0
-    
-    # Transformer les vertices dans l'espace monde
-    world_coords = []
-    for vert in face.verts:
-        world_coord = world_matrix @ vert.co
-        world_coords.append(world_coord)
-    
-    # Calculer l'aire using cross product
-    if len(world_coords) == 3:
-        # Triangle
-        v0, v1, v2 = world_coords
-        return 0.5 * (v1 - v0).cross(v2 - v0).length
-    
-    else:
-        # Polygone - utiliser la normale de la face
-        center = sum(world_coords, Vector()) / len(world_coords)
-        total_area = 0.0
-        
-        for i in range(len(world_coords)):
-            v1 = world_coords[i] - center
-            v2 = world_coords[(i + 1) % len(world_coords)] - center
-            total_area += 0.5 * v1.cross(v2).length
-        
-        return total_area
-
-
 def convert_to_cm2(area_blender_units, unit_settings):
     """
     Convertit une aire en unités Blender vers cm².
@@ -170,80 +93,92 @@ def convert_to_cm2(area_blender_units, unit_settings):
         return area_blender_units * 10000.0  # 1m² = 10000cm²
 
 
-def calculate_face_texel_density(face, uv_layer, material, world_matrix, scene):
+# Attribut de face écrit sur les mesh analysés (visualisation des hotspots)
+TEXEL_DENSITY_ATTRIBUTE = "T4A_texel_density"
+
+
+def get_texel_preferences():
+    """Récupère les préférences texel density ou les valeurs par défaut."""
+    try:
+        from . import PROD_Parameters
+        prefs = PROD_Parameters.get_addon_preferences()
+        return {
+            'target_density': getattr(prefs, 'texel_density_target', 10.24),
+            'variance_threshold': getattr(prefs, 'texel_variance_threshold', 20.0),
+            'histogram_only': getattr(prefs, 'texel_histogram_mode', False),
+            'write_attribute': getattr(prefs, 'texel_write_attribute', False)
+        }
+    except Exception:
+        return {
+            'target_density': 10.24,
+            'variance_threshold': 20.0,
+            'histogram_only': False,
+            'write_attribute': False
+        }
+
+
+def write_texel_density_attribute(obj, context, snapshot=None):
     """
-    Calcule la densité de texel pour une face donnée.
+    Écrit la densité de texel de chaque face dans l'attribut ``T4A_texel_density``.
+    
+    Les faces sans aire UV ou monde reçoivent 0. L'attribut (FLOAT, domaine
+    FACE) peut être affiché en viewport ou dans un matériau via un node
+    Attribute pour repérer les zones trop ou pas assez denses.
     
     Args:
-        face: Face bmesh
-        uv_layer: Couche UV active
-        material: Matériau de la face
-        world_matrix: Matrice transformation monde
-        scene: Scène Blender pour les unités
-        
+        obj: Objet mesh Blender
+        context: Context Blender
+        snapshot: snapshot déjà lu pour l'analyse (``get_texel_density_snapshot``),
+            relu depuis le mesh par défaut
+    
     Returns:
-        dict: {
-            'texel_density': float,  # px/cm
-            'uv_area': float,        # aire UV
-            'world_area_cm2': float, # aire monde en cm²
-            'texture_resolution': tuple # (w, h)
-        }
+        bool: True si l'attribut a été écrit
     """
-    result = {
-        'texel_density': 0.0,
-        'uv_area': 0.0,
-        'world_area_cm2': 0.0,
-        'texture_resolution': (512, 512),
-        'error': None
-    }
+    if snapshot is None:
+        snapshot = get_texel_density_snapshot(obj, context)
+    if snapshot is None:
+        return False
     
-    try:
-        # 1. Calcul surface UV
-        uv_area = calculate_uv_area(face, uv_layer)
-        if uv_area <= 0:
-            result['error'] = 'UV area is zero or negative'
-            return result
-        
-        # 2. Calcul surface monde
-        world_area = calculate_world_area(face, world_matrix)
-        if world_area <= 0:
-            result['error'] = 'World area is zero or negative'
-            return result
-        
-        # 3. Conversion en cm²
-        world_area_cm2 = convert_to_cm2(world_area, scene.unit_settings)
-        
-        # 4. Résolution de texture
-        texture_resolution = get_texture_resolution(material)
-        
-        # 5. Calcul de la densité effective
-        # La surface UV occupe une fraction de la texture totale
-        effective_texture_pixels = math.sqrt(texture_resolution[0] * texture_resolution[1] * uv_area)
-        
-        # Densité = pixels par cm
-        texel_density = effective_texture_pixels / math.sqrt(world_area_cm2)
-        
-        result.update({
-            'texel_density': texel_density,
-            'uv_area': uv_area,
-            'world_area_cm2': world_area_cm2,
-            'texture_resolution': texture_resolution
-        })
-        
-    except Exception as e:
-        result['error'] = str(e)
-        logger.error("Erreur calcul texel density face: %s", e)
+    faces = texel_face_densities(snapshot['arrays'], snapshot['materials'], snapshot['cm2_per_unit'])
+    values = np.nan_to_num(faces['density'], nan=0.0).astype(np.float32)
     
-    return result
+    mesh = obj.data
+    attribute = mesh.attributes.get(TEXEL_DENSITY_ATTRIBUTE)
+    if attribute is not None and (attribute.domain != 'FACE' or attribute.data_type != 'FLOAT'):
+        mesh.attributes.remove(attribute)
+        attribute = None
+    if attribute is None:
+        attribute = mesh.attributes.new(TEXEL_DENSITY_ATTRIBUTE, 'FLOAT', 'FACE')
+    attribute.data.foreach_set('value', values)
+    mesh.update()
+    return True
 
 
-def analyze_object_texel_density(obj, context):
+def _texel_cache_extra(obj, context):
+    """Paramètres hors mesh entrant dans la clé du cache QC (unités, textures)."""
+    return {
+        'cm2_per_unit': convert_to_cm2(1.0, context.scene.unit_settings),
+        'materials': [(slot.material.name if slot.material else None,
+                       get_texture_resolution(slot.material))
+                      for slot in obj.material_slots]
+    }
+
+
+def analyze_object_texel_density(obj, context, histogram_only=False, snapshot=None):
     """
     Analyse la densité de texel pour un objet.
     
+    Calcul vectorisé sur les ``loop_triangles`` (voir
+    ``get_texel_density_snapshot`` et ``texel_density_report``) ; les
+    résultats sont mémorisés dans le cache QC (``PROD_qc_cache``).
+    
     Args:
         obj: Objet mesh Blender
         context: Context Blender
+        histogram_only: ne conserve pas la liste ``densities`` par face
+            (histogramme et percentiles uniquement)
+        snapshot: snapshot déjà lu (``get_texel_density_snapshot``), utilisé
+            si le résultat n'est pas en cache
         
     Returns:
         dict: Résultats d'analyse par matériau
@@ -251,94 +186,104 @@ def analyze_object_texel_density(obj, context):
     if obj.type != 'MESH':
         return {'error': 'Object is not a mesh'}
     
-    # Créer bmesh depuis l'objet
-    bm = bmesh.new()
+    from . import PROD_qc_cache
+    return PROD_qc_cache.cached_analysis(
+        obj, 'texel', {'histogram_only': histogram_only},
+        lambda: _analyze_object_texel_density(obj, context, histogram_only, snapshot),
+        extra=_texel_cache_extra(obj, context),
+        is_valid=lambda result: 'error' not in result
+    )
+
+
+def _analyze_object_texel_density(obj, context, histogram_only, snapshot=None):
     try:
-        bm.from_mesh(obj.data)
-        bm.transform(obj.matrix_world)
-        
-        # Vérifier les UVs
-        if not bm.loops.layers.uv:
+        if not obj.data.uv_layers:
             return {'error': 'No UV layers found'}
         
-        uv_layer = bm.loops.layers.uv.active
-        if not uv_layer:
+        if snapshot is None:
+            snapshot = get_texel_density_snapshot(obj, context)
+        if snapshot is None:
             return {'error': 'No active UV layer'}
         
-        # Grouper les faces par matériau
-        material_faces = defaultdict(list)
-        
-        for face in bm.faces:
-            material_index = face.material_index
-            material = obj.material_slots[material_index].material if material_index < len(obj.material_slots) else None
-            material_name = material.name if material else "No Material"
-            material_faces[material_name].append((face, material))
-        
-        # Analyser par matériau
-        results = {}
-        
-        for material_name, face_list in material_faces.items():
-            material_result = {
-                'face_count': len(face_list),
-                'densities': [],
-                'average_density': 0.0,
-                'min_density': float('inf'),
-                'max_density': 0.0,
-                'variance_percentage': 0.0,
-                'texture_resolution': (512, 512),
-                'total_uv_area': 0.0,
-                'total_world_area_cm2': 0.0,
-                'errors': []
-            }
-            
-            valid_densities = []
-            total_uv_area = 0.0
-            total_world_area = 0.0
-            
-            # Analyser chaque face
-            for face, material in face_list:
-                face_result = calculate_face_texel_density(
-                    face, uv_layer, material, obj.matrix_world, context.scene
-                )
-                
-                if face_result['error']:
-                    material_result['errors'].append(face_result['error'])
-                else:
-                    density = face_result['texel_density']
-                    valid_densities.append(density)
-                    total_uv_area += face_result['uv_area']
-                    total_world_area += face_result['world_area_cm2']
-                    
-                    # Mise à jour min/max
-                    material_result['min_density'] = min(material_result['min_density'], density)
-                    material_result['max_density'] = max(material_result['max_density'], density)
-                    material_result['texture_resolution'] = face_result['texture_resolution']
-            
-            # Calculs statistiques
-            if valid_densities:
-                material_result['densities'] = valid_densities
-                material_result['average_density'] = sum(valid_densities) / len(valid_densities)
-                material_result['total_uv_area'] = total_uv_area
-                material_result['total_world_area_cm2'] = total_world_area
-                
-                # Calcul de la variance
-                if len(valid_densities) > 1:
-                    avg = material_result['average_density']
-                    variance = sum((d - avg) ** 2 for d in valid_densities) / len(valid_densities)
-                    material_result['variance_percentage'] = (math.sqrt(variance) / avg) * 100.0 if avg > 0 else 0.0
-            else:
-                material_result['min_density'] = 0.0
-            
-            results[material_name] = material_result
-        
-        return results
+        return texel_density_report(snapshot['arrays'], snapshot['materials'],
+                                    snapshot['cm2_per_unit'], histogram_only)
         
     except Exception as e:
         logger.error("Erreur analyse texel density objet %s: %s", obj.name, e)
         return {'error': str(e)}
+
+
+def get_texel_density_snapshot(obj, context):
+    """
+    Snapshot NumPy (sans bpy) d'un objet pour le calcul de texel density.
+    
+    Les triangles Blender (``loop_triangles``), les UVs de la couche active,
+    les index de matériau et les coordonnées sont lus via ``foreach_get`` ;
+    les coordonnées sont exprimées en espace monde.
+    
+    Args:
+        obj: Objet mesh Blender
+        context: Context Blender
         
-    finally:
-        bm.free()
+    Returns:
+        dict: tableaux du mesh, slots matériaux et facteur d'unité, ou None
+        si l'objet n'a pas de couche UV active
+    """
+    mesh = obj.data
+    uv_layer = mesh.uv_layers.active
+    if not uv_layer:
+        return None
+    
+    face_count = len(mesh.polygons)
+    loop_count = len(mesh.loops)
+    
+    material_index = np.empty(face_count, dtype=np.int64)
+    mesh.polygons.foreach_get('material_index', material_index)
+    
+    loop_vertex = np.empty(loop_count, dtype=np.int64)
+    mesh.loops.foreach_get('vertex_index', loop_vertex)
+    
+    mesh.calc_loop_triangles()
+    tri_count = len(mesh.loop_triangles)
+    tri_loops = np.empty(tri_count * 3, dtype=np.int64)
+    tri_face = np.empty(tri_count, dtype=np.int64)
+    mesh.loop_triangles.foreach_get('loops', tri_loops)
+    mesh.loop_triangles.foreach_get('polygon_index', tri_face)
+    
+    uvs = np.empty(loop_count * 2, dtype=np.float32)
+    uv_layer.data.foreach_get('uv', uvs)
+    
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', coords)
+    
+    matrix = np.array(obj.matrix_world, dtype=np.float64)
+    world_coords = coords.astype(np.float64).reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+    
+    materials = [{
+        'name': slot.material.name if slot.material else "No Material",
+        'resolution': get_texture_resolution(slot.material)
+    } for slot in obj.material_slots]
+    
+    return {
+        'arrays': {
+            'material_index': material_index,
+            'loop_vertex': loop_vertex,
+            'tri_loops': tri_loops.reshape(-1, 3),
+            'tri_face': tri_face,
+            'uvs': uvs.astype(np.float64).reshape(-1, 2),
+            'world_coords': world_coords
+        },
+        'materials': materials,
+        'cm2_per_unit': convert_to_cm2(1.0, context.scene.unit_settings)
+    }
+
+
+def _iter_texel_snapshots(mesh_objects, context):
+    for obj in mesh_objects:
+        try:
+            yield obj.name, get_texel_density_snapshot(obj, context)
+        except Exception as e:
+            logger.error("Snapshot texel density impossible pour %s: %s", obj.name, e)
 
 
 def analyze_collection_texel_density(collection, context):
@@ -365,6 +310,10 @@ def analyze_collection_texel_density(collection, context):
             'min_density': float('inf'),
             'max_density': 0.0,
             'global_variance': 0.0,
+            'p5': 0.0,
+            'p50': 0.0,
+            'p95': 0.0,
+            'histogram': [],
             'density_status': 'GOOD'  # GOOD, WARNING, ERROR
         },
         'objects_results': {},
@@ -373,14 +322,10 @@ def analyze_collection_texel_density(collection, context):
     
     try:
         # Obtenir les préférences pour les seuils
-        try:
-            from . import PROD_Parameters
-            prefs = PROD_Parameters.get_addon_preferences()
-            target_density = getattr(prefs, 'texel_density_target', 10.24)
-            variance_threshold = getattr(prefs, 'texel_variance_threshold', 20.0)
-        except Exception:
-            target_density = 10.24
-            variance_threshold = 20.0
+        texel_prefs = get_texel_preferences()
+        variance_threshold = texel_prefs['variance_threshold']
+        histogram_only = texel_prefs['histogram_only']
+        options = {'histogram_only': histogram_only}
         
         mesh_objects = [obj for obj in collection.objects if obj.type == 'MESH']
         
@@ -388,14 +333,40 @@ def analyze_collection_texel_density(collection, context):
             collection_results['summary']['analysis_error'] = 'No mesh objects found in collection'
             return collection_results
         
-        all_densities = []
-        materials_data = defaultdict(list)
+        # Agrégats en flux (comptes, moyenne, M2, histogramme) : les listes de
+        # densités par face ne sont pas nécessaires au résumé
+        global_stats = empty_density_stats()
+        materials_stats = {}
+        
+        # Analyse parallèle si plusieurs processus QC sont configurés
+        pooled_results = {}
+        from . import PROD_qc_workers, PROD_qc_cache
+        if PROD_qc_workers.use_worker_pool(len(mesh_objects)):
+            pooled_results, cache_keys = PROD_qc_cache.partition_cached(
+                mesh_objects, 'texel', options,
+                extra_for=lambda obj: _texel_cache_extra(obj, context)
+            )
+            pending = [obj for obj in mesh_objects if obj.name not in pooled_results]
+            computed = PROD_qc_workers.run_snapshot_jobs(
+                _iter_texel_snapshots(pending, context), 'texel', options
+            )
+            PROD_qc_cache.store_results(computed, cache_keys)
+            pooled_results.update(computed)
         
         # Analyser chaque objet
         for obj in mesh_objects:
-            logger.info("Analyse texel density objet: %s", obj.name)
+            # Un seul snapshot par objet pour l'analyse et l'écriture de l'attribut
+            snapshot = None
+            if texel_prefs['write_attribute']:
+                try:
+                    snapshot = get_texel_density_snapshot(obj, context)
+                except Exception as e:
+                    logger.error("Snapshot texel density impossible pour %s: %s", obj.name, e)
             
-            obj_result = analyze_object_texel_density(obj, context)
+            obj_result = pooled_results.get(obj.name)
+            if obj_result is None:
+                logger.info("Analyse texel density objet: %s", obj.name)
+                obj_result = analyze_object_texel_density(obj, context, histogram_only, snapshot)
             
             if 'error' in obj_result:
                 collection_results['objects_results'][obj.name] = {
@@ -404,6 +375,13 @@ def analyze_collection_texel_density(collection, context):
                 }
                 continue
             
+            if texel_prefs['write_attribute']:
+                try:
+                    if snapshot is not None:
+                        write_texel_density_attribute(obj, context, snapshot)
+                except Exception as e:
+                    logger.error("Écriture attribut texel density impossible pour %s: %s", obj.name, e)
+            
             # Consolider les résultats par matériau
             obj_summary = {
                 'analysis_success': True,
@@ -412,25 +390,34 @@ def analyze_collection_texel_density(collection, context):
             }
             
             for material_name, mat_result in obj_result.items():
-                if mat_result['densities']:
-                    all_densities.extend(mat_result['densities'])
-                    materials_data[material_name].append(mat_result)
+                if mat_result['density_count']:
+                    global_stats = merge_density_stats(global_stats, mat_result)
+                    materials_stats[material_name] = merge_density_stats(
+                        materials_stats.get(material_name, empty_density_stats()), mat_result
+                    )
             
             collection_results['objects_results'][obj.name] = obj_summary
             collection_results['summary']['analyzed_objects'] += 1
         
         # Calculs globaux
-        if all_densities:
-            collection_results['summary']['analysis_success'] = True
-            collection_results['summary']['average_density'] = sum(all_densities) / len(all_densities)
-            collection_results['summary']['min_density'] = min(all_densities)
-            collection_results['summary']['max_density'] = max(all_densities)
-            collection_results['summary']['total_materials'] = len(materials_data)
+        count = global_stats['density_count']
+        if count:
+            avg = global_stats['average_density']
+            collection_results['summary'].update({
+                'analysis_success': True,
+                'average_density': avg,
+                'min_density': global_stats['min_density'],
+                'max_density': global_stats['max_density'],
+                'total_materials': len(materials_stats),
+                'histogram': global_stats['histogram']
+            })
+            collection_results['summary'].update(histogram_percentiles(
+                global_stats['histogram'], global_stats['min_density'], global_stats['max_density']
+            ))
             
             # Variance globale
-            avg = collection_results['summary']['average_density']
-            if len(all_densities) > 1 and avg > 0:
-                variance = sum((d - avg) ** 2 for d in all_densities) / len(all_densities)
+            if count > 1 and avg > 0:
+                variance = global_stats['density_m2'] / count
                 collection_results['summary']['global_variance'] = (math.sqrt(variance) / avg) * 100.0
             
             # Évaluation du statut
@@ -443,18 +430,18 @@ def analyze_collection_texel_density(collection, context):
                 collection_results['summary']['density_status'] = 'GOOD'
         
         # Résumé par matériau
-        for material_name, mat_data_list in materials_data.items():
-            all_mat_densities = []
-            for mat_data in mat_data_list:
-                all_mat_densities.extend(mat_data['densities'])
-            
-            if all_mat_densities:
-                collection_results['materials_summary'][material_name] = {
-                    'average_density': sum(all_mat_densities) / len(all_mat_densities),
-                    'min_density': min(all_mat_densities),
-                    'max_density': max(all_mat_densities),
-                    'face_count': sum(len(md['densities']) for md in mat_data_list)
-                }
+        for material_name, stats in materials_stats.items():
+            material_summary = {
+                'average_density': stats['average_density'],
+                'min_density': stats['min_density'],
+                'max_density': stats['max_density'],
+                'face_count': stats['density_count'],
+                'histogram': stats['histogram']
+            }
+            material_summary.update(histogram_percentiles(
+                stats['histogram'], stats['min_density'], stats['max_density']
+            ))
+            collection_results['materials_summary'][material_name] = material_summary
         
         logger.info("Analyse texel density terminée: %d objets analysés", 
                    collection_results['summary']['analyzed_objects'])
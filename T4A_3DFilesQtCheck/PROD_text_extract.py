@@ -0,0 +1,184 @@
+"""Extraction du texte des fiches techniques (PDF / TXT) pour l'analyse IA.
+
+Les PDF sont lus page par page (``PyPDF2``) et la lecture s'arrête dès que le
+nombre maximum de pages lues ou de caractères retenus est atteint. Avec le
+préfiltre, seules les pages qui ressemblent à des dimensions (patterns de
+``parse_ai_dimensions`` ou mot-clé + mesure) sont envoyées ; si aucune page
+ne correspond, les premières pages sont gardées.
+
+Le texte extrait est mis en cache par contenu de fichier (BLAKE2b) et
+paramètres dans ``<scan_path>/.t4a_ai_cache/text``.
+"""
+
+import hashlib
+import json
+import os
+import re
+
+
+class _SimpleLogger:
+    def debug(self, msg, *args):
+        try:
+            from . import PROD_Parameters
+            if PROD_Parameters.is_debug_mode():
+                print(f"[T4A] [DEBUG] [TEXT_EXTRACT] " + (msg % args if args else msg))
+        except Exception:
+            pass
+
+    def info(self, msg, *args):
+        print(f"[T4A] [INFO] [TEXT_EXTRACT] " + (msg % args if args else msg))
+
+    def error(self, msg, *args):
+        print(f"[T4A] [ERROR] [TEXT_EXTRACT] " + (msg % args if args else msg))
+
+
+logger = _SimpleLogger()
+
+# À incrémenter quand l'extraction ou le format du cache change
+EXTRACT_VERSION = 1
+
+_KEYWORD_RE = re.compile(r'\b(dimensions?|largeur|hauteur|profondeur|longueur|diam[eè]tre|'
+                         r'width|height|depth|length|diameter|size|taille)\b', re.IGNORECASE)
+_MEASURE_RE = re.compile(r'\d+(?:[.,]\d+)?\s*(?:mm|cm|m)\b', re.IGNORECASE)
+_dimension_res = None
+
+
+def get_extract_settings():
+    """``(max_pages, max_chars, prefilter)`` depuis les préférences."""
+    try:
+        from . import PROD_Parameters
+        prefs = PROD_Parameters.get_addon_preferences()
+        return (getattr(prefs, 'pdf_max_pages', 50), getattr(prefs, 'pdf_max_chars', 20000),
+                getattr(prefs, 'pdf_prefilter', True))
+    except Exception:
+        return 50, 20000, True
+
+
+def _get_dimension_res():
+    global _dimension_res
+    if _dimension_res is None:
+        from .PROD_dimension_analyzer import DIMENSION_PATTERNS
+        _dimension_res = [re.compile(p, re.IGNORECASE) for p in DIMENSION_PATTERNS]
+    return _dimension_res
+
+
+def page_has_dimensions(text):
+    """Indique si le texte d'une page contient vraisemblablement des dimensions."""
+    if not text:
+        return False
+    if any(pattern.search(text) for pattern in _get_dimension_res()):
+        return True
+    return bool(_KEYWORD_RE.search(text) and _MEASURE_RE.search(text))
+
+
+def _iter_pdf_pages(filepath):
+    import PyPDF2
+    reader = PyPDF2.PdfReader(filepath)
+    total = len(reader.pages)
+    for index in range(total):
+        try:
+            text = reader.pages[index].extract_text() or ''
+        except Exception:
+            text = ''
+        yield index, total, text
+
+
+def _select_pages(pages, max_pages, max_chars, prefilter):
+    """Parcourt ``pages`` en s'arrêtant aux limites ; retourne ``(textes, stats)``."""
+    kept = []
+    leading = []
+    kept_chars = 0
+    leading_chars = 0
+    pages_read = 0
+    pages_total = 0
+    for index, total, text in pages:
+        pages_total = total
+        pages_read += 1
+        if not prefilter or page_has_dimensions(text):
+            kept.append((index, text))
+            kept_chars += len(text)
+        elif leading_chars < max_chars:
+            leading.append((index, text))
+            leading_chars += len(text)
+        if kept_chars >= max_chars or (max_pages and pages_read >= max_pages):
+            break
+    # Aucune page pertinente : on garde le début du document
+    if not kept:
+        kept = leading
+    return kept, {'pages_total': pages_total, 'pages_read': pages_read, 'pages_kept': len(kept)}
+
+
+def _cache_path(filepath, max_pages, max_chars, prefilter):
+    from . import PROD_ai_cache
+    from .PROD_texture_consolidation import file_digest
+    settings = f"{EXTRACT_VERSION}|{max_pages}|{max_chars}|{int(bool(prefilter))}"
+    name = file_digest(filepath) + '_' + hashlib.blake2b(settings.encode('ascii'), digest_size=4).hexdigest()
+    return os.path.join(PROD_ai_cache.get_cache_subdirectory('text'), name + '.json')
+
+
+def extract_document_text(filepath, max_pages=None, max_chars=None, prefilter=None):
+    """Texte d'un fichier .txt ou .pdf, borné et préfiltré.
+
+    Args:
+        filepath: chemin du document
+        max_pages: nombre maximum de pages PDF lues (0 = toutes)
+        max_chars: nombre maximum de caractères retenus
+        prefilter: ne garder que les pages contenant des dimensions
+
+    Returns:
+        dict: ``{'text', 'pages_total', 'pages_read', 'pages_kept', 'truncated', 'cached'}``
+
+    Raises:
+        ImportError: PyPDF2 absent pour un PDF
+        ValueError: type de fichier non supporté
+    """
+    default_pages, default_chars, default_prefilter = get_extract_settings()
+    max_pages = default_pages if max_pages is None else max_pages
+    max_chars = default_chars if max_chars is None else max_chars
+    prefilter = default_prefilter if prefilter is None else prefilter
+
+    ext = os.path.splitext(filepath)[1].lower()
+    if ext == '.txt':
+        with open(filepath, 'r', encoding='utf-8', errors='ignore') as handle:
+            text = handle.read(max_chars + 1) if max_chars else handle.read()
+        truncated = bool(max_chars) and len(text) > max_chars
+        return {'text': text[:max_chars] if truncated else text, 'pages_total': 1, 'pages_read': 1,
+                'pages_kept': 1, 'truncated': truncated, 'cached': False}
+    if ext != '.pdf':
+        raise ValueError(f"Type de fichier non supporté: {ext}")
+
+    from . import PROD_ai_cache
+
+    cache_path = None
+    try:
+        cache_path = _cache_path(filepath, max_pages, max_chars, prefilter)
+        with open(cache_path, 'r', encoding='utf-8') as handle:
+            result = json.load(handle)
+        PROD_ai_cache.touch(cache_path)
+        result['cached'] = True
+        logger.debug("Texte relu du cache: %s", os.path.basename(filepath))
+        return result
+    except (OSError, ValueError):
+        pass
+
+    kept, stats = _select_pages(_iter_pdf_pages(filepath), max_pages, max_chars or float('inf'), prefilter)
+    text = '\n'.join(page_text for _, page_text in kept)
+    truncated = bool(max_chars) and len(text) > max_chars
+    if truncated:
+        text = text[:max_chars]
+    result = dict(stats, text=text, truncated=truncated or stats['pages_read'] < stats['pages_total'])
+    logger.info("%s: %d page(s) lue(s) sur %d, %d retenue(s), %d caractères",
+                os.path.basename(filepath), stats['pages_read'], stats['pages_total'], stats['pages_kept'], len(text))
+
+    if cache_path:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = cache_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as handle:
+                json.dump(result, handle, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+            PROD_ai_cache.evict_ai_cache()
+        except OSError as e:
+            logger.debug("Écriture du cache impossible %s: %s", cache_path, str(e))
+    result['cached'] = False
+    return result
@@ -0,0 +1,265 @@
+"""Moteur de consolidation des textures externes (sans ``bpy``).
+
+Les fichiers sources sont identifiés par leur contenu (BLAKE2b), avec un
+raccourci (chemin, taille, mtime) pour ne pas relire un fichier déjà haché.
+Chaque contenu unique n'est matérialisé qu'une fois par dossier de textures,
+dans un pool de threads, par reflink, lien physique ou copie selon ce que le
+système de fichiers permet. Un manifeste JSON associe chaque image à son
+fichier consolidé.
+"""
+
+import errno
+import hashlib
+import json
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+class _SimpleLogger:
+    def debug(self, msg, *args):
+        try:
+            from . import PROD_Parameters
+            if PROD_Parameters.is_debug_mode():
+                print(f"[T4A] [DEBUG] [Textures] " + (msg % args if args else msg))
+        except Exception:
+            pass
+
+    def info(self, msg, *args):
+        print(f"[T4A] [INFO] [Textures] " + (msg % args if args else msg))
+
+    def error(self, msg, *args):
+        print(f"[T4A] [ERROR] [Textures] " + (msg % args if args else msg))
+
+
+logger = _SimpleLogger()
+
+MANIFEST_NAME = 't4a_texture_manifest.json'
+
+# À incrémenter quand le format du manifeste change
+MANIFEST_VERSION = 1
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+MAX_THREADS = min(8, os.cpu_count() or 1)
+
+# ioctl Linux de clonage de fichier (copy-on-write : btrfs, XFS...)
+_FICLONE = 0x40049409
+
+LINK_MODES = ('AUTO', 'REFLINK', 'COPY')
+
+# Empreintes déjà calculées : chemin réel -> (taille, mtime_ns, empreinte)
+_digest_cache = {}
+
+
+def file_digest(path):
+    """Empreinte BLAKE2b du contenu de ``path`` (raccourci taille + mtime)."""
+    real_path = os.path.realpath(path)
+    stat = os.stat(real_path)
+    cached = _digest_cache.get(real_path)
+    if cached is not None and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+        return cached[2]
+
+    digest = hashlib.blake2b(digest_size=20)
+    with open(real_path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    value = digest.hexdigest()
+    _digest_cache[real_path] = (stat.st_size, stat.st_mtime_ns, value)
+    return value
+
+
+def _reflink(source, target):
+    if not sys.platform.startswith('linux'):
+        raise OSError(errno.EOPNOTSUPP, "reflink non supporté")
+    import fcntl
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            os.remove(target)
+            raise
+    shutil.copystat(source, target)
+
+
+def materialize(source, target, mode='AUTO'):
+    """Crée ``target`` à partir de ``source`` ; retourne la méthode utilisée.
+
+    ``AUTO`` essaie reflink puis lien physique puis copie, ``REFLINK`` ne
+    tente que le reflink avant la copie, ``COPY`` copie toujours.
+    """
+    if mode in ('AUTO', 'REFLINK'):
+        try:
+            _reflink(source, target)
+            return 'reflink'
+        except OSError:
+            pass
+    if mode == 'AUTO':
+        try:
+            os.link(source, target)
+            return 'hardlink'
+        except OSError:
+            pass
+    shutil.copy2(source, target)
+    return 'copy'
+
+
+class TextureConsolidator:
+    """Consolidation dédupliquée des textures d'un dossier de destination.
+
+    Usage : ``reserve_name`` pour les fichiers écrits par ailleurs (textures
+    packées), ``add`` pour chaque image à consolider, puis ``run``.
+    """
+
+    def __init__(self, texture_dir, mode='AUTO', max_workers=None):
+        self.texture_dir = texture_dir
+        self.mode = mode if mode in LINK_MODES else 'AUTO'
+        self.max_workers = max_workers or MAX_THREADS
+        self.manifest_path = os.path.join(texture_dir, MANIFEST_NAME)
+        self.files = {}
+        self.images = {}
+        self._jobs = []
+        try:
+            self._reserved = set(os.listdir(texture_dir))
+        except OSError:
+            self._reserved = set()
+        self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != MANIFEST_VERSION:
+            return
+        # Ne garder que les fichiers consolidés encore présents
+        self.files = {digest: name for digest, name in data.get('files', {}).items()
+                      if name in self._reserved}
+        self.images = data.get('images', {})
+
+    def reserve_name(self, original_name, texture_type=None):
+        """Nom de fichier libre dans le dossier (sans accès disque)."""
+        original_path = Path(original_name)
+        base_name = original_path.stem
+        extension = original_path.suffix
+
+        # Si on connaît le type de texture, l'intégrer dans le nom
+        if texture_type and texture_type != 'unknown':
+            if texture_type not in base_name.lower():
+                base_name = f"{base_name}_{texture_type}"
+
+        counter = 0
+        while True:
+            if counter == 0:
+                new_name = f"{base_name}{extension}"
+            else:
+                new_name = f"{base_name}_{counter:02d}{extension}"
+            if new_name not in self._reserved:
+                self._reserved.add(new_name)
+                return new_name
+            counter += 1
+
+    def record(self, image_name, target_path):
+        """Ajoute au manifeste une image écrite hors du moteur (extraction)."""
+        self.images[image_name] = os.path.basename(target_path)
+
+    def add(self, image_name, source_path, target_name, texture_type=None):
+        """Planifie la consolidation de ``source_path`` pour l'image ``image_name``."""
+        self._jobs.append((image_name, source_path, target_name, texture_type))
+
+    def run(self):
+        """Consolide les images planifiées.
+
+        Returns:
+            dict: par nom d'image, ``{'target', 'digest', 'method'}`` où
+            ``method`` vaut 'reflink', 'hardlink', 'copy', 'existing' (contenu
+            déjà présent dans le dossier) ou 'duplicate' (même contenu qu'une
+            autre image de ce lot) ; les images en erreur sont absentes
+        """
+        jobs, self._jobs = self._jobs, []
+        if not jobs:
+            return {}
+
+        sources = sorted({job[1] for job in jobs})
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            digests = {}
+            for source, digest in zip(sources, executor.map(self._safe_digest, sources)):
+                if digest is not None:
+                    digests[source] = digest
+
+            # Un seul fichier par contenu : le premier nom demandé l'emporte
+            results = {}
+            to_write = {}
+            for image_name, source, target_name, texture_type in jobs:
+                digest = digests.get(source)
+                if digest is None:
+                    continue
+                if digest in self.files:
+                    method = 'duplicate' if digest in to_write else 'existing'
+                else:
+                    self.files[digest] = self.reserve_name(target_name, texture_type)
+                    to_write[digest] = source
+                    method = None
+                results[image_name] = {
+                    'target': os.path.join(self.texture_dir, self.files[digest]),
+                    'digest': digest,
+                    'method': method
+                }
+
+            methods = {}
+            written = list(to_write.items())
+            for (digest, source), method in zip(written, executor.map(self._safe_materialize, written)):
+                if method is None:
+                    self.files.pop(digest, None)
+                methods[digest] = method
+
+        for image_name in list(results):
+            entry = results[image_name]
+            if entry['method'] is None or entry['method'] == 'duplicate':
+                method = methods.get(entry['digest'])
+                if method is None:
+                    del results[image_name]
+                    continue
+                entry['method'] = method if entry['method'] is None else 'duplicate'
+            self.images[image_name] = os.path.basename(entry['target'])
+
+        logger.info("Consolidation: %d image(s), %d fichier(s) écrit(s)", len(results),
+                    sum(1 for m in methods.values() if m))
+        self.save_manifest()
+        return results
+
+    def _safe_digest(self, source):
+        try:
+            return file_digest(source)
+        except OSError as e:
+            logger.error("Lecture impossible de %s: %s", source, str(e))
+            return None
+
+    def _safe_materialize(self, item):
+        digest, source = item
+        target = os.path.join(self.texture_dir, self.files[digest])
+        try:
+            method = materialize(source, target, self.mode)
+            logger.debug("Texture %s (%s): %s -> %s", digest[:8], method, source, target)
+            return method
+        except OSError as e:
+            logger.error("Erreur lors de la copie de %s: %s", source, str(e))
+            return None
+
+    def save_manifest(self):
+        """Écrit le manifeste (images -> fichiers consolidés, contenus -> fichiers)."""
+        try:
+            tmp_path = self.manifest_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as handle:
+                json.dump({
+                    'version': MANIFEST_VERSION,
+                    'images': self.images,
+                    'files': self.files
+                }, handle, indent=1, ensure_ascii=False)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            logger.debug("Écriture du manifeste impossible: %s", str(e))
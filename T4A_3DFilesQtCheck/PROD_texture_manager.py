@@ -8,12 +8,14 @@ Fonctionnalités :
 """
 
 import os
-import shutil
 import bpy
 import bmesh
 from typing import List, Dict, Tuple, Optional
 from pathlib import Path
 
+from . import PROD_file_scanner
+from .PROD_texture_consolidation import TextureConsolidator
+
 
 class _SimpleLogger:
     def debug(self, msg, *args):
@@ -93,44 +95,126 @@ def get_image_info(image: bpy.types.Image) -> Dict:
     return info
 
 
+class TextureNameIndex:
+    """Index des noms de textures d'un dossier pour la recherche de correspondances.
+
+    Reproduit le score de ``find_missing_textures`` (100 = nom identique,
+    80 = l'un contient l'autre, 50 = un mot du nom manquant est contenu dans
+    le nom du fichier) sans comparer chaque nom à tous les fichiers :
+
+    - dictionnaire nom -> fichiers pour les correspondances exactes et les
+      noms de fichier contenus dans le nom manquant (sous-chaînes de celui-ci) ;
+    - premier fichier contenant chaque n-gramme (1 à 3 caractères) et listes
+      de fichiers par trigramme, vérifiées par ``in``, pour les noms de
+      fichier contenant une chaîne donnée.
+
+    À score égal, le premier fichier dans l'ordre du scan est retenu.
+    """
+
+    def __init__(self, paths):
+        self.paths = list(paths)
+        self.stems = [os.path.splitext(os.path.basename(p))[0].lower() for p in self.paths]
+        self._by_stem = {}
+        self._first_gram = {}
+        self._trigrams = {}
+        self._max_stem_length = max((len(stem) for stem in self.stems), default=0)
+        for file_id, stem in enumerate(self.stems):
+            self._by_stem.setdefault(stem, file_id)
+            grams = set()
+            for size in (1, 2, 3):
+                grams.update(stem[i:i + size] for i in range(len(stem) - size + 1))
+            for gram in grams:
+                self._first_gram.setdefault(gram, file_id)
+                if len(gram) == 3:
+                    self._trigrams.setdefault(gram, []).append(file_id)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def _first_containing(self, text):
+        """Premier fichier dont le nom contient ``text`` (None si aucun)."""
+        if not text:
+            return 0 if self.paths else None
+        if len(text) <= 3:
+            return self._first_gram.get(text)
+        # Parcours de la liste du trigramme le plus rare, dans l'ordre du scan
+        postings = None
+        for i in range(len(text) - 2):
+            candidate = self._trigrams.get(text[i:i + 3])
+            if candidate is None:
+                return None
+            if postings is None or len(candidate) < len(postings):
+                postings = candidate
+        for file_id in postings:
+            if text in self.stems[file_id]:
+                return file_id
+        return None
+
+    def _first_contained_in(self, text):
+        """Premier fichier dont le nom est une sous-chaîne de ``text``."""
+        best = self._by_stem.get('')
+        for start in range(len(text)):
+            for stop in range(start + 1, min(len(text), start + self._max_stem_length) + 1):
+                file_id = self._by_stem.get(text[start:stop])
+                if file_id is not None and (best is None or file_id < best):
+                    best = file_id
+        return best
+
+    def best_match(self, missing_name):
+        """Retourne ``(chemin, score)`` pour une texture manquante, ou ``(None, 0)``."""
+        missing_stem = Path(missing_name).stem.lower()
+
+        file_id = self._by_stem.get(missing_stem)
+        if file_id is not None:
+            return self.paths[file_id], 100
+
+        candidates = [self._first_containing(missing_stem), self._first_contained_in(missing_stem)]
+        candidates = [c for c in candidates if c is not None]
+        if candidates:
+            return self.paths[min(candidates)], 80
+
+        candidates = [self._first_containing(word) for word in set(missing_stem.split('_'))]
+        candidates = [c for c in candidates if c is not None]
+        if candidates:
+            return self.paths[min(candidates)], 50
+
+        return None, 0
+
+
+# Index par dossier racine avec le mtime de ses dossiers : seul un dossier
+# modifié (fichier ajouté, supprimé ou renommé) provoque un nouveau parcours
+_texture_indexes = {}
+
+
+def get_texture_index(base_path: str) -> TextureNameIndex:
+    """Index des textures de ``base_path`` (réutilisé tant qu'aucun dossier n'a changé)."""
+    cached = _texture_indexes.get(base_path)
+    if cached is not None and PROD_file_scanner.directories_unchanged(cached[1]):
+        return cached[0]
+
+    directories = {}
+    paths = [entry.path for entry in
+             PROD_file_scanner.scan_directory(base_path, SUPPORTED_TEXTURE_EXTENSIONS, directories=directories)]
+    index = TextureNameIndex(paths)
+    _texture_indexes[base_path] = (index, directories)
+    return index
+
+
 def find_missing_textures(base_path: str, missing_names: List[str]) -> Dict[str, str]:
     """Recherche les textures manquantes dans le dossier et ses sous-dossiers."""
     found_textures = {}
-    base_path = Path(base_path)
     
-    if not base_path.exists():
+    if not missing_names or not os.path.isdir(base_path):
         return found_textures
     
-    # Construire une liste de tous les fichiers de texture
-    all_texture_files = []
-    for ext in SUPPORTED_TEXTURE_EXTENSIONS:
-        all_texture_files.extend(base_path.rglob(f"*{ext}"))
+    index = get_texture_index(os.path.abspath(base_path))
     
     logger.debug("Recherche de textures dans: %s", base_path)
-    logger.debug("Fichiers de texture trouvés: %d", len(all_texture_files))
+    logger.debug("Fichiers de texture trouvés: %d", len(index))
     
-    # Pour chaque texture manquante, chercher des correspondances
+    # Pour chaque texture manquante, chercher la meilleure correspondance
     for missing_name in missing_names:
-        missing_stem = Path(missing_name).stem.lower()
-        best_match = None
-        best_score = 0
-        
-        for texture_file in all_texture_files:
-            file_stem = texture_file.stem.lower()
-            
-            # Score de correspondance basé sur la similarité des noms
-            score = 0
-            if file_stem == missing_stem:
-                score = 100  # Correspondance exacte
-            elif missing_stem in file_stem or file_stem in missing_stem:
-                score = 80   # Correspondance partielle
-            elif any(word in file_stem for word in missing_stem.split('_')):
-                score = 50   # Correspondance de mots
-            
-            if score > best_score:
-                best_score = score
-                best_match = str(texture_file)
-        
+        best_match, best_score = index.best_match(missing_name)
         if best_match and best_score >= 50:  # Seuil de correspondance
             found_textures[missing_name] = best_match
             logger.debug("Correspondance trouvée: %s -> %s (score: %d)", missing_name, best_match, best_score)
@@ -150,6 +234,16 @@ def create_texture_directory(model_filepath: str) -> str:
     return str(texture_dir)
 
 
+def get_texture_link_mode() -> str:
+    """Mode de consolidation configuré ('AUTO', 'REFLINK' ou 'COPY')."""
+    try:
+        from . import PROD_Parameters
+        prefs = PROD_Parameters.get_addon_preferences()
+        return getattr(prefs, 'texture_link_mode', 'AUTO')
+    except Exception:
+        return 'AUTO'
+
+
 def generate_unique_filename(target_dir: str, original_name: str, texture_type: str = None) -> str:
     """Génère un nom de fichier unique en évitant les doublons."""
     target_path = Path(target_dir)
@@ -176,7 +270,8 @@ def generate_unique_filename(target_dir: str, original_name: str, texture_type:
         counter += 1
 
 
-def extract_packed_textures(collection: bpy.types.Collection, texture_dir: str) -> List[Dict]:
+def extract_packed_textures(collection: bpy.types.Collection, texture_dir: str,
+                            consolidator: Optional[TextureConsolidator] = None) -> List[Dict]:
     """Extrait les textures packées du modèle vers le dossier de destination."""
     extracted_textures = []
     
@@ -203,12 +298,17 @@ def extract_packed_textures(collection: bpy.types.Collection, texture_dir: str)
         try:
             # Générer un nom de fichier unique
             texture_type = get_texture_type_from_name(image.name)
-            unique_name = generate_unique_filename(texture_dir, image.name, texture_type)
+            if consolidator is not None:
+                unique_name = consolidator.reserve_name(image.name, texture_type)
+            else:
+                unique_name = generate_unique_filename(texture_dir, image.name, texture_type)
             target_path = os.path.join(texture_dir, unique_name)
             
             # Extraire l'image
             image.filepath_raw = target_path
             image.save()
+            if consolidator is not None:
+                consolidator.record(image.name, target_path)
             
             # Mettre à jour les informations de l'image
             info = get_image_info(image)
@@ -223,9 +323,16 @@ def extract_packed_textures(collection: bpy.types.Collection, texture_dir: str)
     return extracted_textures
 
 
-def consolidate_external_textures(collection: bpy.types.Collection, model_filepath: str, texture_dir: str) -> List[Dict]:
-    """Consolide les textures externes dans le dossier de destination."""
+def consolidate_external_textures(collection: bpy.types.Collection, model_filepath: str, texture_dir: str,
+                                  consolidator: Optional[TextureConsolidator] = None) -> List[Dict]:
+    """Consolide les textures externes dans le dossier de destination.
+
+    Chaque contenu unique n'est écrit qu'une fois (voir ``TextureConsolidator``) ;
+    les images partageant le même fichier source pointent vers la même copie.
+    """
     consolidated_textures = []
+    if consolidator is None:
+        consolidator = TextureConsolidator(texture_dir, get_texture_link_mode())
     
     # Identifier les textures manquantes ou externes
     materials = set()
@@ -246,8 +353,9 @@ def consolidate_external_textures(collection: bpy.types.Collection, model_filepa
                     if not (hasattr(image, 'packed_file') and image.packed_file):
                         # Texture externe
                         if image.filepath and os.path.exists(image.filepath):
-                            existing_textures.append(image)
-                        else:
+                            if image not in existing_textures:
+                                existing_textures.append(image)
+                        elif image.name not in missing_textures:
                             missing_textures.append(image.name)
     
     logger.info("Textures externes existantes: %d", len(existing_textures))
@@ -257,40 +365,44 @@ def consolidate_external_textures(collection: bpy.types.Collection, model_filepa
     model_dir = os.path.dirname(model_filepath)
     found_textures = find_missing_textures(model_dir, missing_textures)
     
-    # Copier les textures existantes
+    # Planifier les copies (hachage et copie en parallèle dans ``run``)
+    for image in existing_textures:
+        consolidator.add(image.name, image.filepath, os.path.basename(image.filepath),
+                         get_texture_type_from_name(image.name))
+    for missing_name, found_path in found_textures.items():
+        consolidator.add(missing_name, found_path, missing_name, get_texture_type_from_name(missing_name))
+    
+    results = consolidator.run()
+    
+    # Mettre à jour les chemins des images existantes
     for image in existing_textures:
+        entry = results.get(image.name)
+        if entry is None:
+            continue
         try:
-            texture_type = get_texture_type_from_name(image.name)
-            unique_name = generate_unique_filename(texture_dir, os.path.basename(image.filepath), texture_type)
-            target_path = os.path.join(texture_dir, unique_name)
-            
-            shutil.copy2(image.filepath, target_path)
-            
-            # Mettre à jour le chemin de l'image
-            image.filepath = target_path
+            source_path = image.filepath
+            image.filepath = entry['target']
             
             info = get_image_info(image)
-            info['consolidated_to'] = target_path
+            info['consolidated_to'] = entry['target']
+            info['consolidation_method'] = entry['method']
             consolidated_textures.append(info)
             
-            logger.debug("Texture copiée: %s -> %s", image.filepath, target_path)
+            logger.debug("Texture consolidée (%s): %s -> %s", entry['method'], source_path, entry['target'])
             
         except Exception as e:
             logger.error("Erreur lors de la copie de %s: %s", image.name, str(e))
     
-    # Copier les textures trouvées pour les manquantes
+    # Textures trouvées pour les manquantes
     for missing_name, found_path in found_textures.items():
+        entry = results.get(missing_name)
+        if entry is None:
+            continue
         try:
-            texture_type = get_texture_type_from_name(missing_name)
-            unique_name = generate_unique_filename(texture_dir, missing_name, texture_type)
-            target_path = os.path.join(texture_dir, unique_name)
-            
-            shutil.copy2(found_path, target_path)
-            
             # Créer une info factice pour cette texture
             info = {
                 'name': missing_name,
-                'filepath': target_path,
+                'filepath': entry['target'],
                 'resolution': 'unknown',
                 'width': 0,
                 'height': 0,
@@ -299,13 +411,14 @@ def consolidate_external_textures(collection: bpy.types.Collection, model_filepa
                 'is_packed': False,
                 'source': 'FILE',
                 'size_kb': os.path.getsize(found_path) / 1024.0,
-                'texture_type': texture_type,
+                'texture_type': get_texture_type_from_name(missing_name),
                 'exists': True,
-                'recovered_from': found_path
+                'recovered_from': found_path,
+                'consolidation_method': entry['method']
             }
             consolidated_textures.append(info)
             
-            logger.debug("Texture récupérée: %s -> %s", found_path, target_path)
+            logger.debug("Texture récupérée: %s -> %s", found_path, entry['target'])
             
         except Exception as e:
             logger.error("Erreur lors de la récupération de %s: %s", missing_name, str(e))
@@ -372,11 +485,14 @@ def analyze_and_consolidate_textures(collection: bpy.types.Collection, model_fil
         texture_dir = create_texture_directory(model_filepath)
         logger.info("Dossier textures: %s", texture_dir)
         
+        # Un seul moteur pour partager les noms réservés et le manifeste
+        consolidator = TextureConsolidator(texture_dir, get_texture_link_mode())
+        
         # Extraire les textures packées
-        extracted_textures = extract_packed_textures(collection, texture_dir)
+        extracted_textures = extract_packed_textures(collection, texture_dir, consolidator)
         
         # Consolider les textures externes
-        consolidated_textures = consolidate_external_textures(collection, model_filepath, texture_dir)
+        consolidated_textures = consolidate_external_textures(collection, model_filepath, texture_dir, consolidator)
         
         # Combiner toutes les textures
         all_textures = extracted_textures + consolidated_textures
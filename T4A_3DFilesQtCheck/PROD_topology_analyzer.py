@@ -14,8 +14,17 @@ Fonctionnalités:
 import bpy
 import bmesh
 import mathutils
+import numpy as np
 from mathutils import Vector
-from collections import defaultdict
+
+from .PROD_mesh_kernels import (
+    manifold_report,
+    face_normals_report,
+    isolated_vertices_report,
+    duplicate_vertices_report,
+    polygon_distribution_report,
+    analyze_topology_arrays,
+)
 
 # Import du logger personnalisé
 try:
@@ -94,10 +103,104 @@ def get_mesh_topology_data(mesh_obj):
     return topology_data
 
 
-def detect_manifold_issues(mesh_obj):
-    """Détecte les problèmes de manifold dans le mesh."""
+def get_mesh_topology_arrays(mesh_obj):
+    """Extrait en une passe les tableaux NumPy nécessaires à l'analyse topologique.
+
+    Toutes les données sont lues via ``foreach_get`` : sommets des polygones
+    (ordre des loops), ``loop_start`` / ``loop_total``, normales de faces,
+    sommets des edges, ``edge_index`` des loops et coordonnées des vertices.
+    """
+    mesh = mesh_obj.data
+    
+    # Normales à jour (calc_normals n'existe plus depuis Blender 4.0)
+    if not mesh.has_custom_normals and hasattr(mesh, 'calc_normals'):
+        mesh.calc_normals()
+    
+    vertex_count = len(mesh.vertices)
+    edge_count = len(mesh.edges)
+    face_count = len(mesh.polygons)
+    loop_count = len(mesh.loops)
+    
+    loop_start = np.empty(face_count, dtype=np.int64)
+    loop_total = np.empty(face_count, dtype=np.int64)
+    mesh.polygons.foreach_get('loop_start', loop_start)
+    mesh.polygons.foreach_get('loop_total', loop_total)
+    
+    loop_vertex = np.empty(loop_count, dtype=np.int64)
+    mesh.polygons.foreach_get('vertices', loop_vertex)
+    
+    loop_edge = np.empty(loop_count, dtype=np.int64)
+    mesh.loops.foreach_get('edge_index', loop_edge)
+    
+    face_normal = np.empty(face_count * 3, dtype=np.float32)
+    mesh.polygons.foreach_get('normal', face_normal)
+    
+    edge_vertices = np.empty(edge_count * 2, dtype=np.int64)
+    mesh.edges.foreach_get('vertices', edge_vertices)
+    
+    coords = np.empty(vertex_count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', coords)
+    
+    return {
+        'vertex_count': vertex_count,
+        'edge_count': edge_count,
+        'face_count': face_count,
+        'loop_start': loop_start,
+        'loop_total': loop_total,
+        'loop_face': np.repeat(np.arange(face_count), loop_total),
+        'loop_vertex': loop_vertex,
+        'loop_edge': loop_edge,
+        'face_normal': face_normal.astype(np.float64).reshape(-1, 3),
+        'edge_vertices': edge_vertices.reshape(-1, 2),
+        'coords': coords.reshape(-1, 3)
+    }
+
+
+def detect_manifold_issues(mesh_obj, arrays=None, validate=None):
+    """Détecte les problèmes de manifold dans le mesh.
+
+    Calcul basé sur les comptes d'incidence edge/face ; le chemin bmesh n'est
+    utilisé qu'en secours ou pour valider les résultats (``validate``, actif
+    par défaut en mode debug).
+    """
     logger.debug("Analyse manifold pour objet: %s", mesh_obj.name)
     
+    try:
+        if arrays is None:
+            arrays = get_mesh_topology_arrays(mesh_obj)
+        result = manifold_report(arrays)
+    except Exception as e:
+        logger.error("Analyse manifold par tableaux impossible (%s), repli bmesh", str(e))
+        return detect_manifold_issues_bmesh(mesh_obj)
+    
+    edge_issues = result['edge_issues_count']
+    vertex_issues = result['vertex_issues_count']
+    
+    if validate is None:
+        try:
+            from . import PROD_Parameters
+            validate = PROD_Parameters.is_debug_mode()
+        except Exception:
+            validate = False
+    if validate:
+        reference = detect_manifold_issues_bmesh(mesh_obj)
+        if (reference['edge_issues_count'] != edge_issues
+                or reference['vertex_issues_count'] != vertex_issues):
+            logger.error("Manifold %s: écart avec bmesh (edges %d/%d, vertices %d/%d)",
+                         mesh_obj.name, edge_issues, reference['edge_issues_count'],
+                         vertex_issues, reference['vertex_issues_count'])
+    
+    logger.debug("Manifold: %d erreurs détectées (%d bords, %d wire, %d >2 faces, %d bow-tie)",
+                 result['manifold_error_count'], result['boundary_edges_count'],
+                 result['wire_edges_count'], result['multi_face_edges_count'],
+                 result['bowtie_vertices_count'])
+    return result
+
+
+def detect_manifold_issues_bmesh(mesh_obj):
+    """Détecte les problèmes de manifold via une copie bmesh (référence de validation)."""
+    logger.debug("Analyse manifold bmesh pour objet: %s", mesh_obj.name)
+    
     # Créer une copie bmesh pour l'analyse
     bm = bmesh.new()
     bm.from_mesh(mesh_obj.data)
@@ -144,190 +247,47 @@ def detect_manifold_issues(mesh_obj):
     return result
 
 
-def analyze_face_normals(mesh_obj, threshold=0.5):
+def analyze_face_normals(mesh_obj, threshold=0.5, arrays=None):
     """Analyse la cohérence des normales de faces."""
     logger.debug("Analyse normales pour objet: %s", mesh_obj.name)
     
-    mesh = mesh_obj.data
-    mesh.calc_loop_triangles()
-    
-    # Calculer les normales si nécessaire
-    if not mesh.has_custom_normals:
-        mesh.calc_normals()
-    
-    inconsistent_faces = []
-    total_faces = len(mesh.polygons)
+    if arrays is None:
+        arrays = get_mesh_topology_arrays(mesh_obj)
+    result = face_normals_report(arrays, threshold)
     
-    if total_faces == 0:
-        return {
-            'normal_consistency': 100.0,
-            'inverted_faces_count': 0,
-            'has_normal_issues': False,
-            'inconsistent_faces': []
-        }
-    
-    # OPTIMISATION: Créer un dictionnaire edge -> faces pour éviter O(n²)
-    logger.debug("Construction du dictionnaire d'adjacence...")
-    edge_to_faces = {}
-    
-    for poly in mesh.polygons:
-        for edge_key in poly.edge_keys:
-            # Normaliser la clé d'edge (ordre des vertices)
-            normalized_edge = tuple(sorted(edge_key))
-            if normalized_edge not in edge_to_faces:
-                edge_to_faces[normalized_edge] = []
-            edge_to_faces[normalized_edge].append(poly)
-    
-    logger.debug("Analyse de %d faces avec dictionnaire d'adjacence", total_faces)
-    
-    # Analyser chaque face
-    for i, poly in enumerate(mesh.polygons):
-        # Log de progression tous les 1000 faces
-        if i > 0 and i % 1000 == 0:
-            logger.debug("Analysé %d/%d faces", i, total_faces)
-            
-        face_normal = poly.normal
-        
-        # Trouver les faces adjacentes RAPIDEMENT via le dictionnaire
-        adjacent_normals = []
-        for edge_key in poly.edge_keys:
-            normalized_edge = tuple(sorted(edge_key))
-            if normalized_edge in edge_to_faces:
-                for adjacent_poly in edge_to_faces[normalized_edge]:
-                    if adjacent_poly.index != poly.index:
-                        adjacent_normals.append(adjacent_poly.normal)
-        
-        # Calculer la cohérence moyenne
-        if adjacent_normals:
-            consistency_scores = []
-            for adj_normal in adjacent_normals:
-                dot_product = face_normal.dot(adj_normal)
-                consistency_scores.append(max(0, dot_product))
-            
-            avg_consistency = sum(consistency_scores) / len(consistency_scores)
-            
-            if avg_consistency < threshold:
-                inconsistent_faces.append({
-                    'index': poly.index,
-                    'normal': tuple(face_normal),
-                    'consistency': avg_consistency,
-                    'center': tuple(poly.center)
-                })
-    
-    inverted_count = len(inconsistent_faces)
-    consistency = ((total_faces - inverted_count) / total_faces) * 100
-    
-    result = {
-        'normal_consistency': consistency,
-        'inverted_faces_count': inverted_count,
-        'has_normal_issues': inverted_count > 0,
-        'inconsistent_faces': inconsistent_faces[:10]  # Limiter à 10 pour éviter surcharge
-    }
-    
-    logger.debug("Normales: %.1f%% cohérence, %d faces inversées", consistency, inverted_count)
+    logger.debug("Normales: %.1f%% cohérence, %d faces inversées",
+                 result['normal_consistency'], result['inverted_faces_count'])
     return result
 
 
-def find_isolated_vertices(mesh_obj):
+def find_isolated_vertices(mesh_obj, arrays=None):
     """Trouve les vertices isolés (non connectés à des faces)."""
     logger.debug("Recherche vertices isolés pour objet: %s", mesh_obj.name)
     
-    mesh = mesh_obj.data
-    connected_vertices = set()
-    
-    # Collecter tous les vertices utilisés par les faces
-    for poly in mesh.polygons:
-        for vertex_index in poly.vertices:
-            connected_vertices.add(vertex_index)
-    
-    # Trouver les vertices isolés
-    isolated_vertices = []
-    for i, vertex in enumerate(mesh.vertices):
-        if i not in connected_vertices:
-            isolated_vertices.append({
-                'index': i,
-                'coordinate': tuple(vertex.co)
-            })
+    if arrays is None:
+        arrays = get_mesh_topology_arrays(mesh_obj)
     
-    result = {
-        'isolated_vertices_count': len(isolated_vertices),
-        'has_isolated_vertices': len(isolated_vertices) > 0,
-        'isolated_vertices': isolated_vertices
-    }
+    result = isolated_vertices_report(arrays)
     
-    logger.debug("Vertices isolés: %d détectés", len(isolated_vertices))
+    logger.debug("Vertices isolés: %d détectés", result['isolated_vertices_count'])
     return result
 
 
-def detect_duplicate_vertices(mesh_obj, tolerance=0.0001):
-    """Détecte les vertices en superposition."""
+def detect_duplicate_vertices(mesh_obj, tolerance=0.0001, arrays=None):
+    """Détecte les vertices en superposition.
+
+    ``duplicate_vertices_count`` compte les vertices redondants (taille de
+    chaque cluster moins un), ce qui correspond au nombre de vertices
+    supprimés par un *Merge by Distance*.
+    """
     logger.debug("Détection doublons pour objet: %s (tolérance: %.6f)", mesh_obj.name, tolerance)
     
-    mesh = mesh_obj.data
-    vertices = mesh.vertices
-    duplicates = []
-    processed = set()
-    
-    # Utiliser un dictionnaire spatial pour optimiser la recherche
-    spatial_hash = defaultdict(list)
-    grid_size = tolerance * 10  # Grille plus large pour éviter les faux négatifs
-    
-    # Hash spatial des vertices
-    for i, vertex in enumerate(vertices):
-        grid_x = int(vertex.co.x / grid_size)
-        grid_y = int(vertex.co.y / grid_size)
-        grid_z = int(vertex.co.z / grid_size)
-        spatial_hash[(grid_x, grid_y, grid_z)].append(i)
-    
-    # Chercher les doublons dans chaque cellule et voisines
-    for grid_pos, vertex_indices in spatial_hash.items():
-        if len(vertex_indices) < 2:
-            continue
-            
-        # Vérifier aussi les cellules voisines
-        neighbor_indices = list(vertex_indices)
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                for dz in [-1, 0, 1]:
-                    if dx == dy == dz == 0:
-                        continue
-                    neighbor_pos = (grid_pos[0] + dx, grid_pos[1] + dy, grid_pos[2] + dz)
-                    if neighbor_pos in spatial_hash:
-                        neighbor_indices.extend(spatial_hash[neighbor_pos])
-        
-        # Comparer les distances réelles
-        for i in range(len(neighbor_indices)):
-            for j in range(i + 1, len(neighbor_indices)):
-                idx1, idx2 = neighbor_indices[i], neighbor_indices[j]
-                
-                if idx1 in processed or idx2 in processed:
-                    continue
-                
-                if idx1 == idx2:
-                    continue
-                
-                v1 = vertices[idx1].co
-                v2 = vertices[idx2].co
-                distance = (v1 - v2).length
-                
-                if distance <= tolerance:
-                    duplicates.append({
-                        'vertex1': idx1,
-                        'vertex2': idx2,
-                        'distance': distance,
-                        'coordinate': tuple(v1)
-                    })
-                    processed.add(idx1)
-                    processed.add(idx2)
-    
-    result = {
-        'duplicate_vertices_count': len(duplicates),
-        'has_duplicate_vertices': len(duplicates) > 0,
-        'duplicate_pairs': duplicates[:20],  # Limiter à 20 paires
-        'tolerance_used': tolerance
-    }
+    if arrays is None:
+        arrays = get_mesh_topology_arrays(mesh_obj)
+    result = duplicate_vertices_report(arrays, tolerance)
     
-    logger.debug("Vertices dupliqués: %d paires détectées", len(duplicates))
+    logger.debug("Vertices dupliqués: %d redondants dans %d clusters",
+                 result['duplicate_vertices_count'], result['duplicate_clusters_count'])
     return result
 
 
@@ -357,60 +317,46 @@ def check_vertex_colors(mesh_obj):
     return result
 
 
-def analyze_polygon_distribution(mesh_obj):
+def analyze_polygon_distribution(mesh_obj, arrays=None):
     """Analyse la distribution des types de polygones."""
     logger.debug("Analyse distribution polygones pour objet: %s", mesh_obj.name)
     
-    mesh = mesh_obj.data
-    polygons = mesh.polygons
+    if arrays is None:
+        arrays = get_mesh_topology_arrays(mesh_obj)
     
-    if not polygons:
-        return {
-            'total_polygons': 0,
-            'triangles_count': 0,
-            'quads_count': 0,
-            'ngons_count': 0,
-            'triangles_percentage': 0.0,
-            'quads_percentage': 0.0,
-            'ngons_percentage': 0.0,
-            'max_polygon_sides': 0
-        }
-    
-    triangles = 0
-    quads = 0
-    ngons = 0
-    max_sides = 0
-    
-    for poly in polygons:
-        sides = len(poly.vertices)
-        max_sides = max(max_sides, sides)
-        
-        if sides == 3:
-            triangles += 1
-        elif sides == 4:
-            quads += 1
-        else:
-            ngons += 1
-    
-    total = len(polygons)
+    result = polygon_distribution_report(arrays)
     
-    result = {
-        'total_polygons': total,
-        'triangles_count': triangles,
-        'quads_count': quads,
-        'ngons_count': ngons,
-        'triangles_percentage': (triangles / total) * 100 if total > 0 else 0,
-        'quads_percentage': (quads / total) * 100 if total > 0 else 0,
-        'ngons_percentage': (ngons / total) * 100 if total > 0 else 0,
-        'max_polygon_sides': max_sides
-    }
-    
-    logger.debug("Distribution: %d tris, %d quads, %d ngons", triangles, quads, ngons)
+    logger.debug("Distribution: %d tris, %d quads, %d ngons",
+                 result['triangles_count'], result['quads_count'], result['ngons_count'])
     return result
 
 
+def get_mesh_topology_snapshot(mesh_obj):
+    """Snapshot autonome (sans bpy) d'un mesh pour l'analyse en processus séparé."""
+    topology_data = get_mesh_topology_data(mesh_obj)
+    if not topology_data:
+        return None
+    return {
+        'topology_data': topology_data,
+        'arrays': get_mesh_topology_arrays(mesh_obj)
+    }
+
+
+def _iter_topology_snapshots(mesh_objects):
+    for mesh_obj in mesh_objects:
+        try:
+            yield mesh_obj.name, get_mesh_topology_snapshot(mesh_obj)
+        except Exception as e:
+            logger.error("Snapshot topologie impossible pour %s: %s", mesh_obj.name, str(e))
+
+
 def analyze_collection_topology(collection, context=None):
-    """Analyse la topologie de tous les mesh dans une collection avec progression."""
+    """Analyse la topologie de tous les mesh dans une collection avec progression.
+
+    Avec plusieurs processus QC configurés, les objets sont analysés en
+    parallèle (``PROD_qc_workers``) ; les objets en échec côté worker sont
+    repris en séquentiel.
+    """
     logger.info("Début analyse topologie pour collection: %s", collection.name)
     
     results = {
@@ -420,9 +366,14 @@ def analyze_collection_topology(collection, context=None):
         'objects_results': {},
         'summary': {
             'total_manifold_issues': 0,
+            'total_boundary_edges': 0,
+            'total_non_manifold_edges': 0,
+            'total_wire_edges': 0,
+            'total_bowtie_vertices': 0,
             'total_inverted_faces': 0,
             'total_isolated_vertices': 0,
             'total_duplicate_vertices': 0,
+            'total_duplicate_clusters': 0,
             'objects_with_vertex_colors': 0,
             'average_quad_percentage': 0.0,
             'analysis_success': True,
@@ -457,28 +408,55 @@ def analyze_collection_topology(collection, context=None):
         logger.info("Analyse de %d mesh objets...", total_meshes)
         
         total_manifold_issues = 0
+        manifold_totals = {
+            'total_boundary_edges': 0,
+            'total_non_manifold_edges': 0,
+            'total_wire_edges': 0,
+            'total_bowtie_vertices': 0
+        }
         total_inverted_faces = 0
         total_isolated_vertices = 0
         total_duplicate_vertices = 0
+        total_duplicate_clusters = 0
         objects_with_colors = 0
         quad_percentages = []
         
+        pooled_results = {}
+        from . import PROD_qc_workers, PROD_qc_cache
+        if PROD_qc_workers.use_worker_pool(total_meshes):
+            pooled_results, cache_keys = PROD_qc_cache.partition_cached(mesh_objects, 'topology', prefs)
+            pending = [obj for obj in mesh_objects if obj.name not in pooled_results]
+            computed = PROD_qc_workers.run_snapshot_jobs(
+                _iter_topology_snapshots(pending), 'topology', prefs,
+                progress=lambda done, total, name: update_topology_progress(context, done, total, name)
+            )
+            PROD_qc_cache.store_results(computed, cache_keys,
+                                        is_valid=lambda result: result.get('analysis_success', False))
+            pooled_results.update(computed)
+        
         for i, mesh_obj in enumerate(mesh_objects):
             try:
-                # Mise à jour de la progression
-                current_mesh = i + 1
-                update_topology_progress(context, current_mesh, total_meshes, mesh_obj.name)
-                
-                obj_result = analyze_mesh_topology(mesh_obj, prefs)
+                obj_result = pooled_results.get(mesh_obj.name)
+                if obj_result is None:
+                    # Mise à jour de la progression
+                    current_mesh = i + 1
+                    update_topology_progress(context, current_mesh, total_meshes, mesh_obj.name)
+                    
+                    obj_result = analyze_mesh_topology(mesh_obj, prefs)
                 if obj_result and obj_result['analysis_success']:
                     results['objects_results'][mesh_obj.name] = obj_result
                     results['analyzed_objects'] += 1
                     
                     # Accumuler les statistiques
                     total_manifold_issues += obj_result.get('manifold_error_count', 0)
+                    manifold_totals['total_boundary_edges'] += obj_result.get('boundary_edges_count', 0)
+                    manifold_totals['total_non_manifold_edges'] += obj_result.get('non_manifold_edges_count', 0)
+                    manifold_totals['total_wire_edges'] += obj_result.get('wire_edges_count', 0)
+                    manifold_totals['total_bowtie_vertices'] += obj_result.get('bowtie_vertices_count', 0)
                     total_inverted_faces += obj_result.get('inverted_faces_count', 0)
                     total_isolated_vertices += obj_result.get('isolated_vertices_count', 0)
                     total_duplicate_vertices += obj_result.get('duplicate_vertices_count', 0)
+                    total_duplicate_clusters += obj_result.get('duplicate_clusters_count', 0)
                     
                     if obj_result.get('has_vertex_colors', False):
                         objects_with_colors += 1
@@ -497,9 +475,11 @@ def analyze_collection_topology(collection, context=None):
         # Calculer le résumé global
         results['summary'].update({
             'total_manifold_issues': total_manifold_issues,
+            **manifold_totals,
             'total_inverted_faces': total_inverted_faces,
             'total_isolated_vertices': total_isolated_vertices,
             'total_duplicate_vertices': total_duplicate_vertices,
+            'total_duplicate_clusters': total_duplicate_clusters,
             'objects_with_vertex_colors': objects_with_colors,
             'average_quad_percentage': sum(quad_percentages) / len(quad_percentages) if quad_percentages else 0.0
         })
@@ -524,10 +504,23 @@ def analyze_collection_topology(collection, context=None):
 
 
 def analyze_mesh_topology(mesh_obj, preferences=None):
-    """Analyse topologique complète d'un mesh object."""
+    """Analyse topologique complète d'un mesh object.
+
+    Les résultats sont mémorisés dans le cache QC (``PROD_qc_cache``) : un
+    mesh inchangé depuis la dernière analyse n'est pas recalculé.
+    """
     if not preferences:
         preferences = get_topology_preferences()
     
+    from . import PROD_qc_cache
+    return PROD_qc_cache.cached_analysis(
+        mesh_obj, 'topology', preferences,
+        lambda: _analyze_mesh_topology(mesh_obj, preferences),
+        is_valid=lambda result: result.get('analysis_success', False)
+    )
+
+
+def _analyze_mesh_topology(mesh_obj, preferences):
     logger.debug("Analyse topologie complète de l'objet: %s", mesh_obj.name)
     
     try:
@@ -541,73 +534,36 @@ def analyze_mesh_topology(mesh_obj, preferences=None):
                 'total_polygons': 0
             }
         
-        result = {
-            'object_name': mesh_obj.name,
-            'total_vertices': topology_data['total_vertices'],
-            'total_edges': topology_data['total_edges'],
-            'total_polygons': topology_data['total_polygons'],
-            'analysis_success': True,
-            'analysis_error': ''
-        }
-        
-        # Analyse manifold
-        logger.debug("Analyse manifold...")
-        manifold_result = detect_manifold_issues(mesh_obj)
-        result.update({
-            'has_manifold_issues': manifold_result['has_manifold_issues'],
-            'manifold_error_count': manifold_result['manifold_error_count']
-        })
-        
-        # Analyse des normales
-        logger.debug("Analyse normales...")
-        normals_result = analyze_face_normals(mesh_obj, preferences['normal_threshold'])
-        result.update({
-            'normal_consistency': normals_result['normal_consistency'],
-            'inverted_faces_count': normals_result['inverted_faces_count'],
-            'has_normal_issues': normals_result['has_normal_issues']
-        })
-        
-        # Vertices isolés
-        logger.debug("Recherche vertices isolés...")
-        isolated_result = find_isolated_vertices(mesh_obj)
-        result.update({
-            'isolated_vertices_count': isolated_result['isolated_vertices_count'],
-            'has_isolated_vertices': isolated_result['has_isolated_vertices']
-        })
-        
-        # Vertices dupliqués
-        logger.debug("Détection vertices dupliqués...")
-        duplicates_result = detect_duplicate_vertices(mesh_obj, preferences['duplicate_tolerance'])
-        result.update({
-            'duplicate_vertices_count': duplicates_result['duplicate_vertices_count'],
-            'has_duplicate_vertices': duplicates_result['has_duplicate_vertices']
-        })
-        
-        # Vertex colors
-        if preferences['analyze_vertex_colors']:
-            logger.debug("Analyse vertex colors...")
-            colors_result = check_vertex_colors(mesh_obj)
-            result.update({
-                'has_vertex_colors': colors_result['has_vertex_colors'],
-                'vertex_color_layers_count': colors_result['vertex_color_layers_count']
-            })
-        else:
-            result.update({
-                'has_vertex_colors': False,
-                'vertex_color_layers_count': 0
-            })
+        # Snapshot NumPy partagé par toutes les analyses, même calcul qu'en processus QC séparé
+        try:
+            arrays = get_mesh_topology_arrays(mesh_obj)
+            result = analyze_topology_arrays(arrays, topology_data, preferences)
+        except Exception as e:
+            # Repli bmesh : seul le manifold reste calculable sans les tableaux
+            logger.error("Analyse topologie par tableaux impossible (%s), repli bmesh", str(e))
+            manifold_result = detect_manifold_issues_bmesh(mesh_obj)
+            return {
+                'object_name': mesh_obj.name,
+                'analysis_success': False,
+                'analysis_error': str(e),
+                'total_vertices': topology_data['total_vertices'],
+                'total_edges': topology_data['total_edges'],
+                'total_polygons': topology_data['total_polygons'],
+                'has_manifold_issues': manifold_result['has_manifold_issues'],
+                'manifold_error_count': manifold_result['manifold_error_count']
+            }
         
-        # Distribution des polygones
-        logger.debug("Analyse distribution polygones...")
-        poly_result = analyze_polygon_distribution(mesh_obj)
-        result.update({
-            'triangles_percentage': poly_result['triangles_percentage'],
-            'quads_percentage': poly_result['quads_percentage'],
-            'ngons_percentage': poly_result['ngons_percentage'],
-            'triangles_count': poly_result['triangles_count'],
-            'quads_count': poly_result['quads_count'],
-            'ngons_count': poly_result['ngons_count']
-        })
+        # Validation bmesh du manifold en mode debug
+        try:
+            from . import PROD_Parameters
+            validate = PROD_Parameters.is_debug_mode()
+        except Exception:
+            validate = False
+        if validate:
+            reference = detect_manifold_issues_bmesh(mesh_obj)
+            if reference['manifold_error_count'] != result['manifold_error_count']:
+                logger.error("Manifold %s: écart avec bmesh (%d/%d erreurs)", mesh_obj.name,
+                             result['manifold_error_count'], reference['manifold_error_count'])
         
         logger.debug("Analyse topologie complète terminée pour %s", mesh_obj.name)
         return result
@@ -667,9 +623,14 @@ class T4A_OT_AnalyzeTopology(bpy.types.Operator):
                             topo_res.analysis_error = summary.get('analysis_error', '')
                             topo_res.has_manifold_issues = summary['total_manifold_issues'] > 0
                             topo_res.manifold_error_count = summary['total_manifold_issues']
+                            topo_res.boundary_edges_count = summary['total_boundary_edges']
+                            topo_res.non_manifold_edges_count = summary['total_non_manifold_edges']
+                            topo_res.wire_edges_count = summary['total_wire_edges']
+                            topo_res.bowtie_vertices_count = summary['total_bowtie_vertices']
                             topo_res.inverted_faces_count = summary['total_inverted_faces']
                             topo_res.isolated_vertices_count = summary['total_isolated_vertices']
                             topo_res.duplicate_vertices_count = summary['total_duplicate_vertices']
+                            topo_res.duplicate_clusters_count = summary['total_duplicate_clusters']
                             topo_res.objects_with_vertex_colors = summary['objects_with_vertex_colors']
                             topo_res.average_quad_percentage = summary['average_quad_percentage']
                             
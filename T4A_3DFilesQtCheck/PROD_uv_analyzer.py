@@ -1,7 +1,7 @@
 """Module d'analyse des UV mappings pour les modèles 3D importés.
 
 Fonctionnalités :
-- Analyse des overlaps UV avec seuil configurable
+- Analyse des overlaps UV avec seuil configurable (grille ou intersection exacte)
 - Détection des UVs hors limites (0-1)
 - Analyse des proportions et distorsions
 - Détection UDIM automatique
@@ -12,10 +12,13 @@ Fonctionnalités :
 import bpy
 import bmesh
 import mathutils
+import numpy as np
 from mathutils import Vector
 from typing import List, Dict, Tuple, Optional, Set
 import time
 
+from .PROD_mesh_kernels import analyze_uv_data
+
 
 class _SimpleLogger:
     def debug(self, msg, *args):
@@ -45,18 +48,26 @@ def get_uv_preferences():
         return {
             'overlap_threshold': getattr(prefs, 'uv_overlap_threshold', 1.0) / 100.0,  # Convertir % en décimal
             'grid_resolution': getattr(prefs, 'uv_grid_resolution', 256),
-            'square_tolerance': getattr(prefs, 'uv_square_tolerance', 0.1)
+            'square_tolerance': getattr(prefs, 'uv_square_tolerance', 0.1),
+            'overlap_mode': getattr(prefs, 'uv_overlap_mode', 'GRID')
         }
     except Exception:
         return {
             'overlap_threshold': 0.01,  # 1%
             'grid_resolution': 256,
-            'square_tolerance': 0.1
+            'square_tolerance': 0.1,
+            'overlap_mode': 'GRID'
         }
 
 
 def get_mesh_uv_data(mesh_obj):
-    """Extrait toutes les données UV d'un mesh object."""
+    """Extrait toutes les données UV d'un mesh object.
+
+    Chaque couche UV est un snapshot NumPy plat construit via ``foreach_get`` :
+    ``uvs`` (loops x 2) plus les index d'offset ``loop_start`` / ``loop_total``
+    par face et les triangles ``tri_loops`` / ``tri_face``, partagés entre
+    toutes les couches du mesh.
+    """
     if not mesh_obj or mesh_obj.type != 'MESH':
         return None
     
@@ -64,261 +75,81 @@ def get_mesh_uv_data(mesh_obj):
     if not mesh.uv_layers:
         return None
     
+    face_count = len(mesh.polygons)
+    loop_count = len(mesh.loops)
+    
+    loop_start = np.empty(face_count, dtype=np.int64)
+    loop_total = np.empty(face_count, dtype=np.int64)
+    area_3d = np.empty(face_count, dtype=np.float32)
+    mesh.polygons.foreach_get('loop_start', loop_start)
+    mesh.polygons.foreach_get('loop_total', loop_total)
+    mesh.polygons.foreach_get('area', area_3d)
+    area_3d = area_3d.astype(np.float64)
+    
+    # Triangulation Blender (gère les n-gons concaves) pour la rasterisation
+    mesh.calc_loop_triangles()
+    tri_count = len(mesh.loop_triangles)
+    tri_loops = np.empty(tri_count * 3, dtype=np.int64)
+    tri_face = np.empty(tri_count, dtype=np.int64)
+    mesh.loop_triangles.foreach_get('loops', tri_loops)
+    mesh.loop_triangles.foreach_get('polygon_index', tri_face)
+    tri_loops = tri_loops.reshape(-1, 3)
+    
     uv_data = {
         'object_name': mesh_obj.name,
-        'total_faces': len(mesh.polygons),
+        'total_faces': face_count,
         'total_vertices': len(mesh.vertices),
         'uv_layers': {}
     }
     
     # Analyser chaque couche UV
+    active_layer = mesh.uv_layers.active
     for layer_index, uv_layer in enumerate(mesh.uv_layers):
-        layer_data = {
-            'name': uv_layer.name,
-            'is_active': uv_layer == mesh.uv_layers.active,
-            'coordinates': [],
-            'faces': [],
-            'bounds': {'min_u': float('inf'), 'max_u': float('-inf'), 
-                      'min_v': float('inf'), 'max_v': float('-inf')}
-        }
+        uvs = np.empty(loop_count * 2, dtype=np.float32)
+        uv_layer.data.foreach_get('uv', uvs)
+        uvs = uvs.astype(np.float64).reshape(-1, 2)
         
-        # Collecter les coordonnées UV pour chaque face
-        for poly in mesh.polygons:
-            face_uvs = []
-            for loop_index in poly.loop_indices:
-                uv_coord = uv_layer.data[loop_index].uv
-                face_uvs.append((uv_coord.x, uv_coord.y))
-                
-                # Mettre à jour les bounds
-                layer_data['bounds']['min_u'] = min(layer_data['bounds']['min_u'], uv_coord.x)
-                layer_data['bounds']['max_u'] = max(layer_data['bounds']['max_u'], uv_coord.x)
-                layer_data['bounds']['min_v'] = min(layer_data['bounds']['min_v'], uv_coord.y)
-                layer_data['bounds']['max_v'] = max(layer_data['bounds']['max_v'], uv_coord.y)
-            
-            layer_data['faces'].append({
-                'index': poly.index,
-                'uvs': face_uvs,
-                'area_3d': poly.area
-            })
+        if loop_count:
+            uv_min = uvs.min(axis=0)
+            uv_max = uvs.max(axis=0)
+            bounds = {'min_u': float(uv_min[0]), 'max_u': float(uv_max[0]),
+                      'min_v': float(uv_min[1]), 'max_v': float(uv_max[1])}
+        else:
+            bounds = {'min_u': float('inf'), 'max_u': float('-inf'),
+                      'min_v': float('inf'), 'max_v': float('-inf')}
         
-        uv_data['uv_layers'][layer_index] = layer_data
+        uv_data['uv_layers'][layer_index] = {
+            'name': uv_layer.name,
+            'is_active': uv_layer == active_layer,
+            'total_faces': face_count,
+            'uvs': uvs,
+            'loop_start': loop_start,
+            'loop_total': loop_total,
+            'area_3d': area_3d,
+            'tri_loops': tri_loops,
+            'tri_face': tri_face,
+            'bounds': bounds
+        }
     
     return uv_data
 
 
-def detect_uv_overlaps(uv_layer_data, grid_resolution=256, threshold=0.01):
-    """Détecte les overlaps UV en utilisant une grille de rasterisation."""
-    logger.debug("Détection overlaps avec grille %dx%d, seuil %.1f%%", 
-                grid_resolution, grid_resolution, threshold * 100)
-    
-    # Créer une grille pour tracker la couverture
-    grid = {}
-    face_coverage = {}
-    
-    for face_data in uv_layer_data['faces']:
-        face_index = face_data['index']
-        uvs = face_data['uvs']
-        
-        # Calculer la bounding box de la face en coordonnées grille
-        min_u = min(uv[0] for uv in uvs)
-        max_u = max(uv[0] for uv in uvs)
-        min_v = min(uv[1] for uv in uvs)
-        max_v = max(uv[1] for uv in uvs)
-        
-        # Convertir en coordonnées de grille
-        grid_min_u = int(min_u * grid_resolution)
-        grid_max_u = int(max_u * grid_resolution) + 1
-        grid_min_v = int(min_v * grid_resolution)
-        grid_max_v = int(max_v * grid_resolution) + 1
-        
-        # Marquer les cellules de grille occupées par cette face
-        occupied_cells = []
-        for gu in range(max(0, grid_min_u), min(grid_resolution, grid_max_u)):
-            for gv in range(max(0, grid_min_v), min(grid_resolution, grid_max_v)):
-                # Test point-in-polygon simpliste pour la cellule de grille
-                cell_center_u = (gu + 0.5) / grid_resolution
-                cell_center_v = (gv + 0.5) / grid_resolution
-                
-                if _point_in_polygon((cell_center_u, cell_center_v), uvs):
-                    cell_key = (gu, gv)
-                    occupied_cells.append(cell_key)
-                    
-                    if cell_key not in grid:
-                        grid[cell_key] = []
-                    grid[cell_key].append(face_index)
-        
-        face_coverage[face_index] = occupied_cells
-    
-    # Identifier les overlaps
-    overlapping_faces = set()
-    overlap_count = 0
-    
-    for cell_key, face_list in grid.items():
-        if len(face_list) > 1:
-            overlap_count += 1
-            overlapping_faces.update(face_list)
-    
-    # Calculer le pourcentage d'overlap
-    total_cells = sum(len(cells) for cells in face_coverage.values())
-    overlap_percentage = (overlap_count / max(1, total_cells)) * 100
-    
-    return {
-        'has_overlaps': overlap_percentage > (threshold * 100),
-        'overlap_percentage': overlap_percentage,
-        'overlap_count': overlap_count,
-        'overlapping_faces': list(overlapping_faces),
-        'total_overlapping_faces': len(overlapping_faces)
-    }
-
-
-def _point_in_polygon(point, polygon):
-    """Test simple point-in-polygon (ray casting algorithm)."""
-    x, y = point
-    n = len(polygon)
-    inside = False
-    
-    p1x, p1y = polygon[0]
-    for i in range(1, n + 1):
-        p2x, p2y = polygon[i % n]
-        if y > min(p1y, p2y):
-            if y <= max(p1y, p2y):
-                if x <= max(p1x, p2x):
-                    if p1y != p2y:
-                        xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
-                    if p1x == p2x or x <= xinters:
-                        inside = not inside
-        p1x, p1y = p2x, p2y
-    
-    return inside
-
-
-def detect_uvs_outside_bounds(uv_layer_data):
-    """Détecte les UVs en dehors de l'espace 0-1."""
-    outside_faces = []
-    total_faces = len(uv_layer_data['faces'])
-    
-    for face_data in uv_layer_data['faces']:
-        face_index = face_data['index']
-        uvs = face_data['uvs']
-        
-        has_outside = False
-        for u, v in uvs:
-            if u < 0 or u > 1 or v < 0 or v > 1:
-                has_outside = True
-                break
-        
-        if has_outside:
-            outside_faces.append({
-                'index': face_index,
-                'uvs': uvs,
-                'extent': {
-                    'min_u': min(uv[0] for uv in uvs),
-                    'max_u': max(uv[0] for uv in uvs),
-                    'min_v': min(uv[1] for uv in uvs),
-                    'max_v': max(uv[1] for uv in uvs)
-                }
-            })
-    
-    outside_percentage = (len(outside_faces) / max(1, total_faces)) * 100
-    
-    return {
-        'has_outside_uvs': len(outside_faces) > 0,
-        'outside_percentage': outside_percentage,
-        'outside_count': len(outside_faces),
-        'outside_faces': outside_faces
-    }
-
-
-def analyze_uv_proportions(uv_layer_data, square_tolerance=0.1):
-    """Analyse les proportions et distorsions UV."""
-    bounds = uv_layer_data['bounds']
-    
-    # Calculer le ratio d'aspect du layout UV global
-    width = bounds['max_u'] - bounds['min_u']
-    height = bounds['max_v'] - bounds['min_v']
-    
-    if height > 0:
-        aspect_ratio = width / height
-        is_square = abs(aspect_ratio - 1.0) <= square_tolerance
-    else:
-        aspect_ratio = float('inf')
-        is_square = False
-    
-    # Calculer la distorsion moyenne (aire UV vs aire 3D)
-    total_uv_area = 0
-    total_3d_area = 0
-    distortions = []
-    
-    for face_data in uv_layer_data['faces']:
-        uvs = face_data['uvs']
-        area_3d = face_data['area_3d']
-        
-        # Calculer l'aire UV de la face (approximation triangulation)
-        if len(uvs) >= 3:
-            uv_area = _calculate_polygon_area_2d(uvs)
-            total_uv_area += uv_area
-            total_3d_area += area_3d
-            
-            if area_3d > 0:
-                distortion = uv_area / area_3d
-                distortions.append(distortion)
-    
-    average_distortion = sum(distortions) / len(distortions) if distortions else 0
-    
-    return {
-        'is_square': is_square,
-        'aspect_ratio': aspect_ratio,
-        'layout_width': width,
-        'layout_height': height,
-        'total_uv_area': total_uv_area,
-        'total_3d_area': total_3d_area,
-        'average_distortion': average_distortion,
-        'distortion_range': (min(distortions), max(distortions)) if distortions else (0, 0)
-    }
+def _iter_uv_snapshots(mesh_objects):
+    for mesh_obj in mesh_objects:
+        try:
+            uv_data = get_mesh_uv_data(mesh_obj)
+            yield mesh_obj.name, {'uv_data': uv_data} if uv_data else None
+        except Exception as e:
+            logger.error("Snapshot UV impossible pour %s: %s", mesh_obj.name, str(e))
 
 
-def _calculate_polygon_area_2d(points):
-    """Calcule l'aire d'un polygone 2D en utilisant la formule shoelace."""
-    if len(points) < 3:
-        return 0
-    
-    area = 0
-    n = len(points)
-    for i in range(n):
-        j = (i + 1) % n
-        area += points[i][0] * points[j][1]
-        area -= points[j][0] * points[i][1]
-    return abs(area) / 2
-
-
-def detect_udim_usage(uv_layer_data):
-    """Détecte l'usage de UDIM en analysant les coordonnées UV."""
-    udim_tiles = set()
-    
-    # Analyser toutes les coordonnées UV pour détecter les tiles UDIM
-    for face_data in uv_layer_data['faces']:
-        for u, v in face_data['uvs']:
-            # Calculer l'index de tile UDIM
-            tile_u = int(u)
-            tile_v = int(v)
-            
-            # Format UDIM standard : 1001 + tile_u + (tile_v * 10)
-            udim_id = 1001 + tile_u + (tile_v * 10)
-            udim_tiles.add(udim_id)
-    
-    # Filtrer les tiles valides (généralement 1001-1100)
-    valid_tiles = [tile for tile in udim_tiles if 1001 <= tile <= 1100]
-    
-    return {
-        'uses_udim': len(valid_tiles) > 1,  # Plus d'une tile = UDIM
-        'udim_tiles': ','.join(map(str, sorted(valid_tiles))),
-        'udim_count': len(valid_tiles),
-        'tile_list': sorted(valid_tiles)
-    }
+def analyze_collection_uvs(collection, overlap_mode=None):
+    """Analyse tous les UVs des mesh dans une collection.
 
-
-def analyze_collection_uvs(collection):
-    """Analyse tous les UVs des mesh dans une collection."""
+    ``overlap_mode`` ('GRID' ou 'EXACT') remplace le mode des préférences.
+    Avec plusieurs processus QC configurés, les objets sont analysés en
+    parallèle (``PROD_qc_workers``).
+    """
     logger.info("Début analyse UV pour collection: %s", collection.name)
     
     results = {
@@ -340,6 +171,8 @@ def analyze_collection_uvs(collection):
     
     try:
         prefs = get_uv_preferences()
+        if overlap_mode:
+            prefs['overlap_mode'] = overlap_mode
         # Filtrer les objets mesh en excluant les BoundingBoxes et autres helpers
         mesh_objects = [obj for obj in collection.all_objects 
                        if obj.type == 'MESH' 
@@ -354,9 +187,23 @@ def analyze_collection_uvs(collection):
         global_udim = False
         aspect_ratios = []
         
+        pooled_results = {}
+        from . import PROD_qc_workers, PROD_qc_cache
+        if PROD_qc_workers.use_worker_pool(len(mesh_objects)):
+            pooled_results, cache_keys = PROD_qc_cache.partition_cached(mesh_objects, 'uv', prefs)
+            pending = [obj for obj in mesh_objects if obj.name not in pooled_results]
+            computed = PROD_qc_workers.run_snapshot_jobs(
+                _iter_uv_snapshots(pending), 'uv', prefs
+            )
+            PROD_qc_cache.store_results(computed, cache_keys,
+                                        is_valid=lambda result: result.get('analysis_success', False))
+            pooled_results.update(computed)
+        
         for mesh_obj in mesh_objects:
             try:
-                obj_result = analyze_mesh_uvs(mesh_obj, prefs)
+                obj_result = pooled_results.get(mesh_obj.name)
+                if obj_result is None:
+                    obj_result = analyze_mesh_uvs(mesh_obj, prefs)
                 if obj_result and obj_result['analysis_success']:
                     results['objects_results'][mesh_obj.name] = obj_result
                     results['analyzed_objects'] += 1
@@ -402,10 +249,23 @@ def analyze_collection_uvs(collection):
 
 
 def analyze_mesh_uvs(mesh_obj, preferences=None):
-    """Analyse complète des UVs d'un mesh object."""
+    """Analyse complète des UVs d'un mesh object.
+
+    Les résultats sont mémorisés dans le cache QC (``PROD_qc_cache``) : un
+    mesh inchangé depuis la dernière analyse n'est pas recalculé.
+    """
     if not preferences:
         preferences = get_uv_preferences()
     
+    from . import PROD_qc_cache
+    return PROD_qc_cache.cached_analysis(
+        mesh_obj, 'uv', preferences,
+        lambda: _analyze_mesh_uvs(mesh_obj, preferences),
+        is_valid=lambda result: result.get('analysis_success', False)
+    )
+
+
+def _analyze_mesh_uvs(mesh_obj, preferences):
     logger.debug("Analyse UV de l'objet: %s", mesh_obj.name)
     
     try:
@@ -418,47 +278,9 @@ def analyze_mesh_uvs(mesh_obj, preferences=None):
                 'layers': {}
             }
         
-        result = {
-            'object_name': mesh_obj.name,
-            'total_faces': uv_data['total_faces'],
-            'total_vertices': uv_data['total_vertices'],
-            'uv_layers_count': len(uv_data['uv_layers']),
-            'analysis_success': True,
-            'analysis_error': '',
-            'layers': {}
-        }
-        
-        # Analyser chaque couche UV
-        for layer_index, layer_data in uv_data['uv_layers'].items():
-            logger.debug("Analyse couche UV: %s", layer_data['name'])
-            
-            layer_result = {
-                'name': layer_data['name'],
-                'is_active': layer_data['is_active'],
-                'total_faces': len(layer_data['faces']),
-                'bounds': layer_data['bounds']
-            }
-            
-            # Analyse des overlaps
-            layer_result['overlaps'] = detect_uv_overlaps(
-                layer_data, 
-                preferences['grid_resolution'], 
-                preferences['overlap_threshold']
-            )
-            
-            # Analyse des UVs hors limites
-            layer_result['outside'] = detect_uvs_outside_bounds(layer_data)
-            
-            # Analyse des proportions
-            layer_result['proportions'] = analyze_uv_proportions(
-                layer_data, 
-                preferences['square_tolerance']
-            )
-            
-            # Détection UDIM
-            layer_result['udim'] = detect_udim_usage(layer_data)
-            
-            result['layers'][layer_index] = layer_result
+        logger.debug("Analyse de %d couche(s) UV, overlaps %s",
+                     len(uv_data['uv_layers']), preferences.get('overlap_mode', 'GRID'))
+        result = analyze_uv_data(uv_data, preferences)
         
         return result
         
@@ -485,6 +307,17 @@ class T4A_OT_AnalyzeUVs(bpy.types.Operator):
         default=""
     )
     
+    overlap_mode: bpy.props.EnumProperty(
+        name="Mode Overlap",
+        description="Méthode de détection des overlaps UV",
+        items=[
+            ('PREFERENCES', "Préférences", "Utilise le mode défini dans les préférences de l'addon"),
+            ('GRID', "Grille", "Rasterisation sur grille (rapide, approchée)"),
+            ('EXACT', "Exact", "Intersection exacte des triangles UV (aire en UV²)")
+        ],
+        default='PREFERENCES'
+    )
+    
     def execute(self, context):
         if not self.collection_name:
             self.report({'ERROR'}, "Nom de collection requis")
@@ -498,7 +331,8 @@ class T4A_OT_AnalyzeUVs(bpy.types.Operator):
         
         # Analyser les UVs
         start_time = time.time()
-        result = analyze_collection_uvs(collection)
+        overlap_mode = None if self.overlap_mode == 'PREFERENCES' else self.overlap_mode
+        result = analyze_collection_uvs(collection, overlap_mode)
         analysis_time = time.time() - start_time
         
         # Mettre à jour les résultats dans les propriétés de scène
@@ -11,8 +11,6 @@ bl_info = {
     "category": "3D View",
 }
 import bpy
-import os
-import json
 import time
 
 # Parameters module centralisé (doit être chargé en premier)
@@ -29,9 +27,11 @@ from . import (
     PROD_mesh_analysis,
     PROD_image_analysis,
     PROD_Files_manager,
+    PROD_batch_import,
     PROD_Utilitaire,
     PROD_dimension_checker,
     PROD_prompt_manager,
+    PROD_gemini_async,
     PROD_texture_manager,
     PROD_uv_analyzer,
     PROD_topology_analyzer,
@@ -45,9 +45,11 @@ _MODULES = (
     PROD_mesh_analysis,
     PROD_image_analysis,
     PROD_Files_manager,
+    PROD_batch_import,
     PROD_Utilitaire,
     PROD_dimension_checker,
     PROD_prompt_manager,
+    PROD_gemini_async,
     PROD_texture_manager,
     PROD_uv_analyzer,
     PROD_topology_analyzer,
@@ -61,9 +63,24 @@ _MODULES = (
     PROD_dependency_installer,
 )
 
+# Durée d'enregistrement par étape (secondes), voir _report_startup_timings
+_startup_timings = {}
+
+
+def _report_startup_timings(total):
+    """Affiche le coût de l'enregistrement, module par module (plus lents en premier)."""
+    slowest = sorted(_startup_timings.items(), key=lambda item: item[1], reverse=True)
+    details = ', '.join(f"{name} {duration * 1000.0:.1f} ms" for name, duration in slowest
+                        if duration >= 0.001 or PROD_Parameters.is_debug_mode())
+    print(f"[T4A] [INFO] [STARTUP] Enregistrement en {total * 1000.0:.1f} ms" + (f" ({details})" if details else ''))
+
+
 def register():
     import traceback
+    register_started = time.perf_counter()
+    _startup_timings.clear()
     # register scene properties and property groups first so modules can read them
+    started = time.perf_counter()
     try:
         PROD_Parameters.register_scene_props()
     except Exception:
@@ -72,8 +89,10 @@ def register():
         PROD_Parameters.register_all()
     except Exception:
         pass
+    _startup_timings['scene_props'] = time.perf_counter() - started
 
     for mod in _MODULES:
+        started = time.perf_counter()
         try:
             if hasattr(mod, "register"):
                 mod.register()
@@ -85,6 +104,7 @@ def register():
                     traceback.print_exc()
             except Exception:
                 pass
+        _startup_timings[getattr(mod, '__name__', str(mod)).rsplit('.', 1)[-1]] = time.perf_counter() - started
     try:
         bpy.utils.register_class(PROD_Parameters.T4A_AddonPreferences)
     except Exception as e:
@@ -96,47 +116,14 @@ def register():
         except Exception:
             pass
 
-    # Try to fetch available models at addon startup and persist them in prefs
+    # Liste des modèles : le cache des préférences est servi immédiatement,
+    # le rafraîchissement éventuel se fait en arrière-plan (jamais en --background)
+    started = time.perf_counter()
     try:
-        addon_name = 'T4A_3DFilesQtCheck'  # Must match bl_info["name"] and bl_idname
-        prefs = bpy.context.preferences.addons[addon_name].preferences
-        api_key = getattr(prefs, 'google_api_key', '') or os.environ.get('GOOGLE_API_KEY', '')
-        try:
-            from . import PROD_gemini
-            res = PROD_gemini.list_models(api_key)
-            if res.get('success'):
-                detail = res.get('detail')
-                # detail is now a list of dicts with 'name' and 'compatible' keys
-                if detail and isinstance(detail, list):
-                    try:
-                        # Store the full list (with compatibility info) in JSON format
-                        prefs.model_list_json = json.dumps(detail)
-                        prefs.model_list_ts = time.time()
-                        
-                        # Set selected model if empty - use first compatible model
-                        if not getattr(prefs, 'model_name', None):
-                            try:
-                                # Find first compatible model, fallback to first model
-                                first_compatible = None
-                                first_model = None
-                                for model_info in detail:
-                                    if isinstance(model_info, dict):
-                                        name = model_info.get('name', '')
-                                        if name:
-                                            if first_model is None:
-                                                first_model = name
-                                            if model_info.get('compatible', False) and first_compatible is None:
-                                                first_compatible = name
-                                
-                                prefs.model_name = first_compatible or first_model or 'models/gemini-2.5-flash-lite'
-                            except Exception:
-                                prefs.model_name = 'models/gemini-2.5-flash-lite'
-                    except Exception:
-                        pass
-        except Exception:
-            pass
+        PROD_gemini_async.refresh_models_if_stale()
     except Exception:
         pass
+    _startup_timings['models'] = time.perf_counter() - started
 
     # Ensure scene units are set to meters on addon startup
     try:
@@ -174,6 +161,11 @@ def register():
         # bpy may not be available in test/static analysis environments
         pass
 
+    try:
+        _report_startup_timings(time.perf_counter() - register_started)
+    except Exception:
+        pass
+
 
 def unregister():
     import traceback
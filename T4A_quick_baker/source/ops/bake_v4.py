@@ -2,7 +2,6 @@ import contextlib
 import json
 import os
 import queue
-import subprocess
 import sys
 import threading
 import time
@@ -10,12 +9,15 @@ import uuid
 from collections import defaultdict
 
 import bpy
-from bpy.props import BoolProperty, StringProperty
+from bpy.props import BoolProperty, IntProperty, StringProperty
 from bpy.types import Operator
 
 from ...qbpy import Image, Material, ShaderNode
-from ..utils.addon import package, preferences
+from ..utils import bake_ipc, channel_buffer
+from ..utils.addon import preferences
 from ..utils.bake import post_bake
+from ..utils.bake_pool import BakeWorker, pool, worker_command
+from ..utils.bake_scheduler import BakeScheduler, estimate_cost, image_pixels
 from ..utils.bake_v4 import Bake
 from ..utils.export_uv import ExportUVLayout
 
@@ -144,14 +146,12 @@ class QBAKER_OT_bake(Operator, Bake, ExportUVLayout):
     baked_maps = 0
 
     # temp_blend_path = os.path.join(bpy.app.tempdir, 'qbaker.blend')
-    to_bake = queue.Queue()  # contains string as tuple of (active_bake_group_index, map_id, duplicate_maps); duplicate_maps are the maps that bake the same data, for Channel_Pack this attribute contain the channel_maps_ids
+    scheduler = BakeScheduler()  # bakeables (index, map_id, duplicate_maps) as JSON strings, see utils.bake_scheduler
     processes = []
     baked = queue.Queue()
     images = queue.Queue()
     errors = queue.Queue()
-    finished_maps = set()
     baking_schedule = {}
-    finished_maps_lock = threading.Lock()
     old_image_filepaths = []
 
     MAP_TO_PRINCIPLED_BSDF = {
@@ -261,7 +261,7 @@ class QBAKER_OT_bake(Operator, Bake, ExportUVLayout):
                 continue
 
             if map.type != "CHANNEL_PACK":
-                normal_maps.append((map.type, map.name))
+                normal_maps.append((map.type, map.name, map))
                 map_table[map.type].add(map.name)
                 continue
 
@@ -269,24 +269,24 @@ class QBAKER_OT_bake(Operator, Bake, ExportUVLayout):
             if map.channel_pack.mode == "RGBA":
                 if map.channel_pack.r_channel != "NONE":
                     map_name = f"{map.name}_r"
-                    privileged_maps.append((map.channel_pack.r_channel, map_name))
+                    privileged_maps.append((map.channel_pack.r_channel, map_name, map))
                     map_table[map.channel_pack.r_channel].add(map_name)
                 if map.channel_pack.g_channel != "NONE":
                     map_name = f"{map.name}_g"
-                    privileged_maps.append((map.channel_pack.g_channel, map_name))
+                    privileged_maps.append((map.channel_pack.g_channel, map_name, map))
                     map_table[map.channel_pack.g_channel].add(map_name)
                 if map.channel_pack.b_channel != "NONE":
                     map_name = f"{map.name}_b"
-                    privileged_maps.append((map.channel_pack.b_channel, map_name))
+                    privileged_maps.append((map.channel_pack.b_channel, map_name, map))
                     map_table[map.channel_pack.b_channel].add(map_name)
             elif map.channel_pack.rgb_channel != "NONE":
                 map_name = f"{map.name}_rgb"
-                privileged_maps.append((map.channel_pack.rgb_channel, map_name))
+                privileged_maps.append((map.channel_pack.rgb_channel, map_name, map))
                 map_table[map.channel_pack.rgb_channel].add(map_name)
 
             if map.channel_pack.a_channel != "NONE":
                 map_name = f"{map.name}_a"
-                privileged_maps.append((map.channel_pack.a_channel, map_name))
+                privileged_maps.append((map.channel_pack.a_channel, map_name, map))
                 map_table[map.channel_pack.a_channel].add(map_name)
 
         self.add_to_bake(map_table, privileged_maps, active_bake_group_index, baked_maps)
@@ -306,25 +306,35 @@ class QBAKER_OT_bake(Operator, Bake, ExportUVLayout):
             if map.channel_pack.a_channel != "NONE":
                 channels.append(baked_maps[map.channel_pack.a_channel])
 
-            self.to_bake.put_nowait(json.dumps((active_bake_group_index, map.name, channels)))
+            pack_settings = map.channel_pack.bake if map.channel_pack.custom else self.bake_settings
+            self.scheduler.add(
+                active_bake_group_index,
+                map.name,
+                channels,
+                cost=image_pixels(pack_settings),
+                requires=[f"{active_bake_group_index}_{channel}" for channel in channels],
+            )
 
     def add_to_bake(self, map_table: dict, maps: list, active_bake_group_index: int, bake_maps: dict):
-        for type, map_id in maps:
+        for type, map_id, map in maps:
             maps_same_type: set = map_table.get(type)
             if maps_same_type is None:
                 continue
             bake_maps[type] = map_id
-            self.to_bake.put_nowait(
-                json.dumps(
-                    (
-                        active_bake_group_index,
-                        map_id,
-                        list(maps_same_type.difference([map_id])),
-                    )
-                )
+            self.scheduler.add(
+                active_bake_group_index,
+                map_id,
+                list(maps_same_type.difference([map_id])),
+                cost=self.get_map_cost(map, type),
             )
             del map_table[type]
 
+    def get_map_cost(self, map, type: str) -> int:
+        if map.type == "CHANNEL_PACK":
+            bake_settings = map.channel_pack.bake if map.channel_pack.custom else self.bake_settings
+            return estimate_cost(getattr(map.channel_pack, type.lower(), None), bake_settings)
+        return estimate_cost(getattr(map, type.lower(), None), self.bake_settings)
+
     def remove_unused_images(self, filepaths: list):
         for filepath in filepaths:
             bake_dir = os.path.dirname(filepath)
@@ -402,6 +412,10 @@ class QBAKER_OT_bake(Operator, Bake, ExportUVLayout):
             return {"CANCELLED"}
 
         self.temp_blend_path = self.create_temp_blend_file(context)
+        if self.debug:
+            for worker, map_id, start, end in self.scheduler.plan(self.bake_settings.processes):
+                print(f"QB: Plan: worker {worker} bakes {map_id} ({start} - {end})")
+
         context.window_manager.modal_handler_add(self)
         self.timer = context.window_manager.event_timer_add(0.1, window=context.window)
         return {"RUNNING_MODAL"}
@@ -580,94 +594,52 @@ class QBAKER_OT_bake(Operator, Bake, ExportUVLayout):
                 node_tree.links.new(material_output.inputs["Displacement"], output_socket)
         return output_socket
 
-    def handle_process_data(self, data, images: queue.Queue):
-        data_type = data["type"]
-        if data_type == self.TYPE_IMAGE:
-            images.put(data)
-
-    def schedule_next_task(
-        self, process: subprocess.Popen, finished_maps: set, baking_schedule: dict, to_bake: queue.Queue
-    ):
-        active_bake_group_index, main_map_id, duplicate_maps_ids = json.loads(baking_schedule[process.pid])
-        finished_maps.add(f"{active_bake_group_index}_{main_map_id}")
-        finished_maps.update(f"{active_bake_group_index}_{id}" for id in duplicate_maps_ids)
-        next_task = None if to_bake.empty() else to_bake.get()
+    def schedule_next_task(self, process: BakeWorker, baking_schedule: dict):
+        self.scheduler.complete(baking_schedule[process.pid])
+        next_task = self.scheduler.wait_next_job()
         baking_schedule[process.pid] = next_task
-        process.stdin.write("%s\n" % next_task)
-        process.stdin.flush()
-
-    def wait_for_map(self, process: subprocess.Popen, finished_maps: set, wait_maps: list):
-        while True:
-            if not wait_maps:
-                return
-            with self.finished_maps_lock:
-                if any((map not in finished_maps) for map in wait_maps):
-                    time.sleep(0.1)
-                    continue
-            process.stdin.write("QB: Continue\n")
-            process.stdin.flush()
-            wait_maps.clear()
-            return
+        process.send(bake_ipc.NEXT, bakeable=next_task)
 
     def handle_background_baking(
         self,
-        process: subprocess.Popen,
+        process: BakeWorker,
         baked: queue.Queue,
         images: queue.Queue,
-        finished_maps: set,
         baking_schedule: dict,
-        to_bake: queue.Queue,
         errors: queue.Queue,
     ):
-        wait_maps = []
-        wait_thread = None
-
-        while process.poll() is None:
-            for line in process.stdout:
-                if "QB: Baked Map" in line:
-                    baked.put(1)
-                elif "QB: Next Map" in line:
-                    self.schedule_next_task(process, finished_maps, baking_schedule, to_bake)
-                elif "QB: Wait Map" in line:
-                    wait_maps.extend(json.loads(line.rsplit(":", 1)[1].replace("'", '"')))
-                    wait_thread = threading.Thread(
-                        target=self.wait_for_map,
-                        args=(process, finished_maps, wait_maps),
-                        daemon=True,
-                    )
-                    wait_thread.start()
-                elif "System is out of GPU memory" in line:
-                    print(line)
+        for message in process.iter_session():
+            message_type = message["type"]
+            if message_type == bake_ipc.BAKED:
+                baked.put(1)
+                if self.debug:
+                    print(f"QB: Baked {message['map']} ({message['percent']}%)")
+            elif message_type == bake_ipc.NEXT_MAP:
+                self.schedule_next_task(process, baking_schedule)
+            elif message_type == bake_ipc.IMAGE:
+                images.put(message)
+            elif message_type == bake_ipc.ERROR:
+                print(message["message"])
+                errors.put(message["message"])
+                if message["out_of_memory"]:
                     print("Reduce the number of process in preference")
-                    errors.put(line)
                     errors.put("Reduce the number of process in preference")
+            elif self.debug and message_type == bake_ipc.PROGRESS:
+                print(f"QB: Baking {message['map']} ({message['percent']}%)")
 
-                if line.startswith("{") and line.endswith("}\n"):  # check for json format
-                    self.handle_process_data(json.loads(line), images)
-                elif self.debug:
-                    print(line)  # DEBUG print lines without image data
-
-        outs, errs = process.communicate()
-        baked_count = 0
-
-        for line in outs.split("\n"):
-            baked_count += "QB: Baked Map" in line
-
-            if line.startswith("{") and line.endswith("}\n"):  # check for json format
-                self.handle_process_data(json.loads(line), images)
-            elif self.debug:
-                print(line)  # DEBUG print lines without image data
+        # The session ended before its last job finished: drop the channel packs waiting for it
+        if bakeable := baking_schedule.get(process.pid):
+            baking_schedule[process.pid] = None
+            if dropped := self.scheduler.fail(bakeable):
+                errors.put(f"Skipped {', '.join(dropped)}: a map they need failed to bake")
 
-        baked.put(baked_count)
-
-        if wait_thread is not None and wait_thread.is_alive():
-            wait_maps.clear()
-            wait_thread.join()
+        if process.poll() is not None:
+            errors.put(f"Bake worker {process.pid} exited unexpectedly")
 
+        errs = process.take_errors()
         if errs != "":
             print(errs)
             errors.put(errs)
-            return
 
     def modal(self, context, event):
         if BakePanel.cancel_baking:
@@ -692,36 +664,15 @@ class QBAKER_OT_bake(Operator, Bake, ExportUVLayout):
         # env["BLENDER_USER_EXTENSIONS"] = os.path.join(os.path.dirname(__file__), "../../../../")
         env["TBB_MALLOC_DISABLE_REPLACEMENT"] = "1"
 
-        while len(self.processes) < self.bake_settings.processes and not self.to_bake.empty():
-            bakeable = self.to_bake.get()
-            expression = (
-                "import bpy;bpy.ops.qbaker.background_bake('INVOKE_DEFAULT', first_bakeable='%s', bake_path='%s')"
-                % (
-                    bakeable,
-                    self.bake_path.replace("\\", "\\\\"),
-                )
-            )
-            process = subprocess.Popen(
-                [
-                    bpy.app.binary_path,
-                    # "--factory-startup",
-                    "-b",
-                    self.temp_blend_path,
-                    "-E",
-                    "CYCLES",
-                    "--addons",
-                    package,
-                    "--python-expr",
-                    expression,
-                    "--",
-                    "--cycles-device",
-                    cycle_device,
-                ],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                stdin=subprocess.PIPE,
-                encoding="utf-8",
-                env=env,
+        while len(self.processes) < self.bake_settings.processes and (bakeable := self.scheduler.next_job()):
+            process = pool.acquire(worker_command(cycle_device), env)
+            process.verbose = self.debug
+            process.start_session(
+                self.temp_blend_path,
+                "background_bake",
+                bakeable,
+                self.bake_path,
+                pack_memory_budget=preferences().qbaker.bake.pack_memory_budget,
             )
             thread = threading.Thread(
                 target=self.handle_background_baking,
@@ -729,9 +680,7 @@ class QBAKER_OT_bake(Operator, Bake, ExportUVLayout):
                     process,
                     self.baked,
                     self.images,
-                    self.finished_maps,
                     self.baking_schedule,
-                    self.to_bake,
                     self.errors,
                 ),
                 daemon=True,
@@ -744,6 +693,7 @@ class QBAKER_OT_bake(Operator, Bake, ExportUVLayout):
             if thread.is_alive():
                 continue
             self.processes.remove((index, process, thread))
+            pool.release(process, self.bake_settings.processes)
 
         while not self.baked.empty():
             try:
@@ -800,7 +750,7 @@ class QBAKER_OT_bake(Operator, Bake, ExportUVLayout):
                 continue
 
         baker = context.scene.qbaker
-        if not len(self.processes) and self.to_bake.empty() and self.images.empty():
+        if not len(self.processes) and self.scheduler.empty() and self.images.empty():
             return self.finish(context)
         baker.progress = int(self.baked_maps / self.total_maps * 100)
         if context.area:
@@ -815,6 +765,7 @@ class QBAKER_OT_bake(Operator, Bake, ExportUVLayout):
         except Exception:
             pass
         self.clear(context)
+        channel_buffer.remove_buffers(self.bake_path)
 
         if context.area:
             context.area.tag_redraw()
@@ -838,6 +789,7 @@ class QBAKER_OT_bake(Operator, Bake, ExportUVLayout):
         return {"FINISHED"}
 
     def cancel(self, context):
+        self.scheduler.clear()  # wake up the threads waiting for a job
         for index, process, thread in self.processes:
             process.kill()
             thread.join()
@@ -854,6 +806,7 @@ class QBAKER_OT_bake(Operator, Bake, ExportUVLayout):
             self.report({"INFO"}, "Baking: Cancelled")
 
         self.clear(context)
+        channel_buffer.remove_buffers(self.bake_path)
 
         if self.debug and sys.platform != "darwin":  # Skip console toggle on macOS
             bpy.ops.wm.console_toggle()
@@ -874,13 +827,11 @@ class QBAKER_OT_bake(Operator, Bake, ExportUVLayout):
         BakePanel.cancel_baking = False
 
         self.processes.clear()
-        with self.to_bake.mutex:
-            self.to_bake.queue.clear()
+        self.scheduler.clear()
         with self.baked.mutex:
             self.baked.queue.clear()
         with self.images.mutex:
             self.images.queue.clear()
-        self.finished_maps.clear()
         self.baking_schedule.clear()
 
 
@@ -905,12 +856,9 @@ class QBAKER_OT_background_bake(Operator, Bake):
     bl_idname = "qbaker.background_bake"
     bl_options = {"REGISTER", "INTERNAL"}
 
-    first_bakeable: StringProperty(name="bakeable to start with before checking stdin")
+    first_bakeable: StringProperty(name="bakeable to start with before asking the coordinator")
     bake_path: StringProperty(name="path ot bake the maps to")
-
-    def read_input_line(self):
-        for line in sys.stdin:
-            return line
+    pack_memory_budget: IntProperty(name="memory budget of channel packing in MiB", default=1024)
 
     def get_map_tuple(self, map_id):
         split = map_id.split("_")
@@ -924,6 +872,8 @@ class QBAKER_OT_background_bake(Operator, Bake):
         bakeable = json.loads(self.first_bakeable)
 
         while bakeable:
+            # Class-level state, kept by a pooled worker across jobs and sessions
+            self.baked_maps.clear()
             active_bake_group_index, map_id, duplicate_maps = bakeable
             self.index = active_bake_group_index
             bake_group = baker.bake_groups[active_bake_group_index]
@@ -933,12 +883,6 @@ class QBAKER_OT_background_bake(Operator, Bake):
             maps_to_bake = [(main_map, channel)]
 
             if main_map.type == "CHANNEL_PACK" and channel is None:
-                print(f"QB: Wait Map:{[f'{active_bake_group_index}_{map_name}' for map_name in duplicate_maps]}")
-                sys.stdout.flush()
-
-                while "QB: Continue" not in (line := self.read_input_line()):
-                    print(f"Missed Input: {line}")
-
                 channel_labels = []
                 if main_map.channel_pack.mode == "RGBA":
                     if main_map.channel_pack.r_channel != "NONE":
@@ -961,25 +905,27 @@ class QBAKER_OT_background_bake(Operator, Bake):
                     maps_to_bake.append((maps[duplicate_map_id], channel))
 
             main_map.name = f"{active_bake_group_index}_{map_id}"
+            bake_ipc.begin_job(main_map.name, len(maps_to_bake))
 
-            if bake_group.use_high_to_low:
-                self.bake_high_to_low(context, bake_group, maps_to_bake, self.bake_path)
-            elif any("_decal" in child.name.lower() for item in bake_group.objects for child in item.object.children):
-                self.bake_decals(context, bake_group, maps_to_bake, self.bake_path)
-            else:
-                self.bake_objects(context, bake_group, maps_to_bake, self.bake_path)
-
-            print("QB: Next Map")
-            sys.stdout.flush()
-
-            line = self.read_input_line()
-            if "None" in line:
-                bakeable = None
+            try:
+                if bake_group.use_high_to_low:
+                    self.bake_high_to_low(context, bake_group, maps_to_bake, self.bake_path)
+                elif any(
+                    "_decal" in child.name.lower() for item in bake_group.objects for child in item.object.children
+                ):
+                    self.bake_decals(context, bake_group, maps_to_bake, self.bake_path)
+                else:
+                    self.bake_objects(context, bake_group, maps_to_bake, self.bake_path)
+            finally:
+                main_map.name = map_id
+
+            bake_ipc.send(bake_ipc.NEXT_MAP)
+
+            message = bake_ipc.receive()
+            if message is None or message["bakeable"] is None:
                 break
 
-            bakeable = json.loads(line)
-            self.baked_maps.clear()
-            main_map.name = map_id
+            bakeable = json.loads(message["bakeable"])
 
         return {"FINISHED"}
 
@@ -1,6 +1,6 @@
 import bpy
 
-from . import icon, manual, prefs
+from . import bake_pool, icon, manual, prefs
 
 if bpy.app.version >= (4, 0, 0):
     from . import props_v4 as props
@@ -13,9 +13,11 @@ def register():
     props.register()
     manual.register()
     prefs.register()
+    bake_pool.register()
 
 
 def unregister():
+    bake_pool.unregister()
     icon.unregister()
     props.unregister()
     manual.unregister()
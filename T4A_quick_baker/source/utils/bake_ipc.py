@@ -0,0 +1,193 @@
+"""Framed message protocol between the bake coordinator and its workers.
+
+Messages are JSON objects with a ``type`` key. They travel over a localhost
+TCP connection as frames: a 4-byte big-endian payload length followed by the
+UTF-8 JSON payload. The worker stdout is left to Blender's own log and is
+never parsed.
+
+The coordinator listens on an ephemeral port (:class:`Listener`) and starts
+the worker with ``--qb-ipc <port>:<token>`` after ``--``. The worker connects
+(:func:`connect`) and sends ``HELLO`` with the token before anything else.
+"""
+
+import contextlib
+import json
+import secrets
+import socket
+import struct
+import sys
+import threading
+import time
+
+HEADER = struct.Struct("!I")
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+IPC_ARGUMENT = "--qb-ipc"
+HOST = "127.0.0.1"
+
+# Coordinator -> worker
+PING = "ping"
+LOAD = "load"  # path
+BAKE = "bake"  # operator, bakeable, bake_path, properties
+NEXT = "next"  # bakeable, None ends the session
+QUIT = "quit"
+
+# Worker -> coordinator
+HELLO = "hello"  # token
+PONG = "pong"
+LOADED = "loaded"  # digest
+PROGRESS = "progress"  # map, percent
+BAKED = "baked"  # map, percent, skipped
+NEXT_MAP = "next_map"
+IMAGE = "image"  # image data, see Bake.passthrough_image
+ERROR = "error"  # message, out_of_memory
+SESSION_DONE = "session_done"
+
+
+class Channel:
+    """Framed message connection, usable from several threads."""
+
+    def __init__(self, sock: socket.socket):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock = sock
+        self.reader = sock.makefile("rb")
+        self.send_lock = threading.Lock()
+
+    def send(self, message_type: str, **payload):
+        """Send a message.
+
+        Raises:
+            OSError: The connection is closed.
+        """
+        payload["type"] = message_type
+        data = json.dumps(payload).encode("utf-8")
+        with self.send_lock:
+            self.sock.sendall(HEADER.pack(len(data)) + data)
+
+    def receive(self) -> dict:
+        """Wait for the next message.
+
+        Returns:
+            dict: The message, None once the connection is closed.
+        """
+        try:
+            header = self.reader.read(HEADER.size)
+            if len(header) < HEADER.size:
+                return None
+            (size,) = HEADER.unpack(header)
+            if size > MAX_FRAME_SIZE:
+                raise ValueError(f"Frame of {size} bytes is too large")
+            data = self.reader.read(size)
+            if len(data) < size:
+                return None
+            return json.loads(data)
+        except (OSError, ValueError):
+            return None
+
+    def close(self):
+        with contextlib.suppress(OSError):
+            self.sock.shutdown(socket.SHUT_RDWR)
+        with contextlib.suppress(OSError):
+            self.reader.close()
+            self.sock.close()
+
+
+class Listener:
+    """Coordinator side: accept the connection of one worker."""
+
+    def __init__(self):
+        self.token = secrets.token_hex(16)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.bind((HOST, 0))
+        self.sock.listen(1)
+        self.sock.settimeout(1.0)
+
+    @property
+    def arguments(self) -> list:
+        """Worker arguments, to append after ``--``."""
+        return [IPC_ARGUMENT, f"{self.sock.getsockname()[1]}:{self.token}"]
+
+    def accept(self, timeout: float, alive) -> Channel:
+        """Wait for the worker to connect and authenticate.
+
+        Args:
+            timeout: Seconds to wait for the worker.
+            alive: Callable returning False once the worker has exited.
+
+        Returns:
+            Channel: The worker connection, None if it never connected.
+        """
+        deadline = time.monotonic() + timeout
+        try:
+            while time.monotonic() < deadline and alive():
+                try:
+                    sock, _ = self.sock.accept()
+                except socket.timeout:
+                    continue
+                sock.settimeout(None)
+                channel = Channel(sock)
+                hello = channel.receive()
+                if hello and hello.get("type") == HELLO and secrets.compare_digest(hello.get("token", ""), self.token):
+                    return channel
+                channel.close()
+            return None
+        except OSError:
+            return None
+        finally:
+            self.sock.close()
+
+
+# Worker side
+_channel = None
+_job = {"map": None, "count": 1, "baked": 0}
+
+
+def connect(argv: list = None) -> Channel:
+    """Connect to the coordinator given by the ``--qb-ipc`` argument.
+
+    Args:
+        argv: Command line, ``sys.argv`` by default.
+
+    Returns:
+        Channel: The coordinator connection, None without ``--qb-ipc``.
+    """
+    global _channel
+
+    argv = sys.argv if argv is None else argv
+    if IPC_ARGUMENT not in argv[:-1]:
+        return None
+    port, token = argv[argv.index(IPC_ARGUMENT) + 1].split(":", 1)
+    _channel = Channel(socket.create_connection((HOST, int(port))))
+    _channel.send(HELLO, token=token)
+    return _channel
+
+
+def send(message_type: str, **payload) -> bool:
+    """Send a message to the coordinator, if connected.
+
+    Returns:
+        bool: True if the message was sent.
+    """
+    if _channel is None:
+        return False
+    try:
+        _channel.send(message_type, **payload)
+    except OSError:
+        return False
+    return True
+
+
+def receive() -> dict:
+    """Wait for the next coordinator message, None when not connected."""
+    return None if _channel is None else _channel.receive()
+
+
+def begin_job(map_name: str, map_count: int):
+    """Start reporting the progress of a bake job of ``map_count`` maps."""
+    _job.update(map=map_name, count=max(map_count, 1), baked=0)
+    send(PROGRESS, map=map_name, percent=0)
+
+
+def map_baked(skipped: bool = False):
+    """Report a baked (or skipped) map of the current job."""
+    _job["baked"] += 1
+    send(BAKED, map=_job["map"], percent=min(100, _job["baked"] * 100 // _job["count"]), skipped=skipped)
@@ -0,0 +1,428 @@
+"""Persistent pool of background Blender bake workers.
+
+A worker is a ``blender -b`` process running :func:`serve`. It stays alive
+between bake sessions, so only the first bake pays for Blender startup and
+addon registration. Messages go through a :mod:`.bake_ipc` channel. Each
+session sends two of them:
+
+- ``LOAD``: open the temp .blend, skipped when the worker already holds a
+  file with the same content digest.
+- ``BAKE``: run the background bake operator. It reports its maps until the
+  coordinator answers ``NEXT`` with no bakeable.
+
+Once the session has ended (``SESSION_DONE``), the worker reopens its file
+while idle. The next session then starts from an unmodified scene without
+waiting for a reload.
+
+Idle workers are health-checked from background threads, so acquiring one
+never blocks the UI. A worker still reloading, or not checked yet, can be
+handed out too: it runs the messages in order, so the next session just
+starts once the reload is done. The pool keeps at most as many idle workers
+as the bake uses processes.
+"""
+
+import hashlib
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+import bpy
+
+from . import bake_ipc
+from .addon import package, preferences
+
+CONNECT_TIMEOUT = 120.0
+PING_TIMEOUT = 20.0
+CHECK_TIMEOUT = 300.0  # the ping is answered after the reload of the .blend
+REAP_INTERVAL = 30.0
+HASH_CHUNK_SIZE = 1024 * 1024
+
+SERVE_EXPRESSION = "import importlib;importlib.import_module('%s.source.utils.bake_pool').serve()"
+
+
+def file_digest(filepath: str) -> str:
+    """Get the content digest of a file.
+
+    Args:
+        filepath: Path of the file.
+
+    Returns:
+        str: BLAKE2b hex digest of the file content.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def worker_command(cycle_device: str, factory_startup: bool = False) -> list:
+    """Get the command line of a pooled bake worker.
+
+    Args:
+        cycle_device: Cycles compute device type (CPU, CUDA, OPTIX...).
+        factory_startup: Start Blender with ``--factory-startup``, as the material bake workers do. The worker
+            then ignores the user preferences, so settings it needs are sent with the session.
+
+    Returns:
+        list: Command line to start the worker.
+    """
+    return [
+        bpy.app.binary_path,
+        *(("--factory-startup",) if factory_startup else ()),
+        "-b",
+        "--addons",
+        package,
+        "--python-expr",
+        SERVE_EXPRESSION % package,
+        "--",
+        "--cycles-device",
+        cycle_device,
+    ]
+
+
+class BakeWorker:
+    """Background Blender process serving bake sessions.
+
+    ``pid`` and ``poll`` mirror ``subprocess.Popen``. Messages are sent with
+    :meth:`send` and read with :meth:`iter_session`; the worker stdout is only
+    echoed when ``verbose`` is set.
+    """
+
+    def __init__(self, command: list, env: dict):
+        self.command = tuple(command)
+        self.listener = bake_ipc.Listener()
+        self.process = subprocess.Popen(
+            [*command, *self.listener.arguments],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            stdin=subprocess.DEVNULL,
+            encoding="utf-8",
+            env=env,
+        )
+        self.pid = self.process.pid
+        self.digest = None
+        self.verbose = False
+        self.checked = False
+        self.last_used = time.monotonic()
+        self.channel = None
+        self._pending = []
+        self._channel_lock = threading.Lock()
+        self._messages = queue.Queue()
+        self._pong = threading.Event()
+        self._disconnected = False
+        self._errors = []
+        self._errors_lock = threading.Lock()
+        threading.Thread(target=self._read_channel, daemon=True).start()
+        threading.Thread(target=self._read_stdout, daemon=True).start()
+        threading.Thread(target=self._read_stderr, daemon=True).start()
+
+    def _read_channel(self):
+        channel = self.listener.accept(CONNECT_TIMEOUT, lambda: self.poll() is None)
+        with self._channel_lock:
+            if channel is not None:
+                try:
+                    for message_type, payload in self._pending:
+                        channel.send(message_type, **payload)
+                except OSError:
+                    channel.close()
+            self.channel = channel
+            self._pending = None
+        if channel is not None:
+            while (message := channel.receive()) is not None:
+                # Answers to pings and reloads are handled here, so pinging never reads the session messages
+                if message["type"] == bake_ipc.PONG:
+                    self._pong.set()
+                elif message["type"] == bake_ipc.LOADED:
+                    self.digest = message["digest"]
+                else:
+                    self._messages.put(message)
+        else:
+            print(f"QB: Bake worker {self.pid} did not connect")
+            self.kill()
+        self._disconnected = True
+        self._pong.set()
+        self._messages.put(None)
+
+    def _read_stdout(self):
+        for line in self.process.stdout:
+            if self.verbose:
+                print(line, end="")
+
+    def _read_stderr(self):
+        for line in self.process.stderr:
+            with self._errors_lock:
+                self._errors.append(line)
+
+    def poll(self):
+        return self.process.poll()
+
+    def send(self, message_type: str, **payload):
+        """Send a message, queued until the worker has connected.
+
+        Raises:
+            OSError: The connection is closed.
+        """
+        with self._channel_lock:
+            if self._pending is not None:
+                self._pending.append((message_type, payload))
+                return
+        if self.channel is None:
+            raise OSError(f"Bake worker {self.pid} is not connected")
+        self.channel.send(message_type, **payload)
+
+    def _next_message(self) -> dict:
+        """Get the next message, ``None`` once the connection is closed."""
+        message = self._messages.get()
+        if message is None:
+            # Keep the end marker for later readers
+            self._messages.put(None)
+        return message
+
+    def ping(self, timeout: float = PING_TIMEOUT) -> bool:
+        """Check that the worker is alive and answering.
+
+        Safe during a session: the answer comes after the queued messages, but is not read from the session ones.
+
+        Returns:
+            bool: True if the worker answered within ``timeout`` seconds.
+        """
+        if self.poll() is not None:
+            return False
+        self._pong.clear()
+        try:
+            self.send(bake_ipc.PING)
+        except OSError:
+            return False
+        return self._pong.wait(timeout) and not self._disconnected
+
+    def start_session(self, blend_path: str, operator: str, bakeable: str, bake_path: str, **properties):
+        """Load the temp .blend if it changed, then start a background bake session.
+
+        Args:
+            blend_path: Temp .blend to bake from.
+            operator: Name of the background bake operator in ``bpy.ops.qbaker``.
+            bakeable: First bakeable (JSON) of the session.
+            bake_path: Directory to bake the maps to.
+            **properties: Other properties of the operator (e.g. ``pack_memory_budget``).
+        """
+        self.take_errors()
+        self.send(bake_ipc.LOAD, path=blend_path)
+        self.send(bake_ipc.BAKE, operator=operator, bakeable=bakeable, bake_path=bake_path, properties=properties)
+
+    def iter_session(self):
+        """Yield the messages of the current session until it ends or the worker exits."""
+        while (message := self._next_message()) is not None:
+            if message["type"] == bake_ipc.SESSION_DONE:
+                return
+            yield message
+
+    def take_errors(self) -> str:
+        """Get and clear the stderr output collected since the last call."""
+        with self._errors_lock:
+            errors, self._errors = "".join(self._errors), []
+        return errors
+
+    def kill(self):
+        if self.poll() is None:
+            self.process.kill()
+        if self.channel is not None:
+            self.channel.close()
+
+    def close(self):
+        """Ask the worker to quit, kill it if it does not."""
+        if self.poll() is None:
+            try:
+                self.send(bake_ipc.QUIT)
+                self.process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+        self.kill()
+
+
+class BakeWorkerPool:
+    """Idle bake workers kept warm between bake sessions."""
+
+    def __init__(self):
+        self.idle = []
+        self.lock = threading.Lock()
+
+    def acquire(self, command: list, env: dict) -> BakeWorker:
+        """Get an idle worker started with ``command``, or spawn a new one.
+
+        Prefers checked workers, then the most recently used. Does not block: a worker still reloading
+        or being checked is handed out as is, its session starts once the reload is done.
+
+        Args:
+            command: Worker command line (see :func:`worker_command`).
+            env: Environment of a newly spawned worker.
+
+        Returns:
+            BakeWorker: Worker ready for :meth:`BakeWorker.start_session`.
+        """
+        command = tuple(command)
+        with self.lock:
+            worker = max(
+                (w for w in self.idle if w.command == command and w.poll() is None),
+                key=lambda w: (w.checked, w.last_used),
+                default=None,
+            )
+            if worker is not None:
+                self.idle.remove(worker)
+                worker.checked = False
+                return worker
+        return BakeWorker(list(command), env)
+
+    def release(self, worker: BakeWorker, max_idle: int):
+        """Give a worker back after its session, or close it if the pool is disabled.
+
+        Args:
+            worker: Worker whose session has ended.
+            max_idle: Number of idle workers to keep (the bake processes), the least recently used are closed.
+        """
+        if worker.poll() is not None:
+            return
+        if not use_worker_pool():
+            worker.close()
+            return
+        worker.last_used = time.monotonic()
+        worker.checked = False
+        with self.lock:
+            self.idle.append(worker)
+            self.idle.sort(key=lambda w: w.last_used)
+            extra = self.idle[: max(len(self.idle) - max_idle, 0)]
+            del self.idle[: len(extra)]
+        for extra_worker in extra:
+            extra_worker.close()
+        if worker in self.idle:
+            self.check(worker)
+
+    def check(self, worker: BakeWorker):
+        """Ping an idle worker from a background thread, close it if it does not answer."""
+        threading.Thread(target=self._check, args=(worker,), daemon=True).start()
+
+    def _check(self, worker: BakeWorker):
+        answered = worker.ping(CHECK_TIMEOUT)
+        with self.lock:
+            if worker not in self.idle:
+                return  # acquired meanwhile, or already closed by reap or shutdown
+            if answered:
+                worker.checked = True
+                return
+            self.idle.remove(worker)
+        print(f"QB: Closing unresponsive bake worker {worker.pid}")
+        worker.kill()
+
+    def reap(self, idle_timeout: float):
+        """Close the workers idle for more than ``idle_timeout`` seconds, check the others again."""
+        now = time.monotonic()
+        with self.lock:
+            expired = [w for w in self.idle if w.poll() is not None or now - w.last_used > idle_timeout]
+            self.idle = [w for w in self.idle if w not in expired]
+            recheck = [w for w in self.idle if w.checked]
+            for worker in recheck:
+                worker.checked = False
+        for worker in expired:
+            worker.close()
+        for worker in recheck:
+            self.check(worker)
+
+    def shutdown(self):
+        with self.lock:
+            workers, self.idle = self.idle, []
+        for worker in workers:
+            worker.close()
+
+
+pool = BakeWorkerPool()
+
+
+def use_worker_pool() -> bool:
+    try:
+        return preferences().qbaker.bake.use_worker_pool
+    except (AttributeError, KeyError):
+        return True
+
+
+def reap_timer() -> float:
+    """Close the workers idle for too long (``bpy.app.timers`` callback)."""
+    try:
+        idle_timeout = preferences().qbaker.bake.worker_idle_timeout * 60
+    except (AttributeError, KeyError):
+        idle_timeout = 600
+    pool.reap(idle_timeout if use_worker_pool() else 0)
+    return REAP_INTERVAL
+
+
+def _load_blend(filepath: str) -> str:
+    digest = file_digest(filepath)
+    bpy.ops.wm.open_mainfile(filepath=filepath, load_ui=False)
+    # Same as the ``-E CYCLES`` argument of one-shot workers
+    bpy.context.scene.render.engine = "CYCLES"
+    return digest
+
+
+def _bake_error(err: Exception):
+    message = str(err)
+    if not bake_ipc.send(bake_ipc.ERROR, message=message, out_of_memory="out of GPU memory" in message):
+        print(f"QB: Bake failed: {message}", file=sys.stderr)
+
+
+def serve():
+    """Worker loop: run the coordinator messages until ``QUIT`` or disconnection."""
+    if bake_ipc.connect() is None:
+        print(f"QB: Missing {bake_ipc.IPC_ARGUMENT} argument", file=sys.stderr)
+        return
+
+    filepath = None
+    digest = None
+
+    while (message := bake_ipc.receive()) is not None:
+        message_type = message["type"]
+        if message_type == bake_ipc.PING:
+            bake_ipc.send(bake_ipc.PONG)
+        elif message_type == bake_ipc.LOAD:
+            try:
+                if message["path"] != filepath or file_digest(message["path"]) != digest:
+                    filepath = message["path"]
+                    digest = _load_blend(filepath)
+            except Exception as err:
+                _bake_error(err)
+                filepath = digest = None
+            bake_ipc.send(bake_ipc.LOADED, digest=digest)
+        elif message_type == bake_ipc.BAKE:
+            if filepath is not None:
+                try:
+                    getattr(bpy.ops.qbaker, message["operator"])(
+                        "INVOKE_DEFAULT",
+                        first_bakeable=message["bakeable"],
+                        bake_path=message["bake_path"],
+                        **message.get("properties", {}),
+                    )
+                except Exception as err:
+                    _bake_error(err)
+            bake_ipc.send(bake_ipc.SESSION_DONE)
+
+            # Reopen the file while idle so the next session starts from a clean scene
+            if filepath is not None:
+                try:
+                    digest = _load_blend(filepath)
+                except Exception as err:
+                    _bake_error(err)
+                    filepath = digest = None
+                bake_ipc.send(bake_ipc.LOADED, digest=digest)
+        elif message_type == bake_ipc.QUIT:
+            break
+
+
+def register():
+    if not bpy.app.background and not bpy.app.timers.is_registered(reap_timer):
+        bpy.app.timers.register(reap_timer, first_interval=REAP_INTERVAL, persistent=True)
+
+
+def unregister():
+    if bpy.app.timers.is_registered(reap_timer):
+        bpy.app.timers.unregister(reap_timer)
+    pool.shutdown()
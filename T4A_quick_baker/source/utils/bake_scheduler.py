@@ -0,0 +1,191 @@
+"""Dependency-aware scheduling of background bake jobs.
+
+A job bakes one map (and the maps that bake the same data) and is sent to a
+worker as a bakeable: the JSON string ``[index, map_id, duplicate_maps]``.
+Channel pack jobs require the jobs baking their channels and are only handed
+out once those are finished, so no worker ever waits for another.
+
+Ready jobs are dispatched by rank: their estimated cost (pixels x samples)
+plus the rank of the most expensive job they unblock. Long chains and
+expensive maps start first, which keeps the makespan short across
+``bake_settings.processes`` workers.
+"""
+
+import heapq
+import json
+import threading
+
+
+def image_pixels(bake_settings) -> int:
+    """Get the number of pixels baked with the given bake settings.
+
+    Args:
+        bake_settings: ``QBAKER_PG_bake_settings`` (size, width, height, anti-aliasing).
+
+    Returns:
+        int: Pixel count, anti-aliasing included.
+    """
+    anti_aliasing = int(bake_settings.anti_aliasing)
+    if bake_settings.size == "CUSTOM":
+        return bake_settings.width * anti_aliasing * bake_settings.height * anti_aliasing
+    return (int(bake_settings.size) * anti_aliasing) ** 2
+
+
+def estimate_cost(settings, bake_settings) -> int:
+    """Estimate the cost of baking a map: resolution x samples.
+
+    Args:
+        settings: Settings of the map type (``map.normal``...), may be None.
+        bake_settings: Bake settings used unless the map type has custom ones.
+
+    Returns:
+        int: Estimated cost.
+    """
+    if getattr(settings, "custom", False):
+        bake_settings = settings.bake
+    return image_pixels(bake_settings) * max(getattr(settings, "samples", 1), 1)
+
+
+class BakeJob:
+    def __init__(self, index: int, map_id: str, duplicates: list, cost: int, requires: set):
+        self.index = index
+        self.map_id = map_id
+        self.bakeable = json.dumps((index, map_id, list(duplicates)))
+        self.cost = cost
+        self.requires = set(requires)
+        # The duplicates of a channel pack are its inputs, not maps it bakes
+        self.provides = {f"{index}_{map_id}", *(f"{index}_{id}" for id in duplicates)} - self.requires
+
+
+class BakeScheduler:
+    """Thread-safe queue of bake jobs released as their dependencies finish."""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.clear()
+
+    def clear(self):
+        """Drop every job and wake up the threads waiting for one."""
+        with self.condition:
+            self.jobs = []
+            self.ready = []
+            self.blocked = []
+            self.running = {}
+            self.finished = set()
+            self.ranks = {}
+            self.condition.notify_all()
+
+    def add(self, index: int, map_id: str, duplicates: list = (), cost: int = 1, requires: list = ()):
+        """Add a job.
+
+        Args:
+            index: Bake group (or material) index.
+            map_id: Map baked by the job.
+            duplicates: Maps baking the same data, or the channel maps of a channel pack.
+            cost: Estimated cost (see :func:`estimate_cost`).
+            requires: Maps (``<index>_<map_id>``) that must be baked first.
+        """
+        job = BakeJob(index, map_id, duplicates, cost, requires)
+        with self.condition:
+            self.jobs.append(job)
+            self.ranks.clear()
+            if job.requires <= self.finished:
+                self.ready.append(job)
+            else:
+                self.blocked.append(job)
+            self.condition.notify_all()
+
+    def _rank(self, job: BakeJob) -> int:
+        if (rank := self.ranks.get(job)) is None:
+            dependents = (other for other in self.jobs if other.requires & job.provides)
+            rank = self.ranks[job] = job.cost + max((self._rank(other) for other in dependents), default=0)
+        return rank
+
+    def _pop_ready(self) -> str:
+        job = max(self.ready, key=self._rank)
+        self.ready.remove(job)
+        self.running[job.bakeable] = job
+        return job.bakeable
+
+    def next_job(self) -> str:
+        """Get the next ready bakeable, None if no job is ready."""
+        with self.condition:
+            return self._pop_ready() if self.ready else None
+
+    def wait_next_job(self) -> str:
+        """Get the next bakeable, waiting for running jobs to unblock one.
+
+        Returns:
+            str: The bakeable, None once no job is left for this worker.
+        """
+        with self.condition:
+            while not self.ready and self.blocked and self.running:
+                self.condition.wait()
+            return self._pop_ready() if self.ready else None
+
+    def complete(self, bakeable: str):
+        """Mark a job as finished and release the jobs waiting for it."""
+        with self.condition:
+            if (job := self.running.pop(bakeable, None)) is None:
+                return
+            self.finished.update(job.provides)
+            released = [job for job in self.blocked if job.requires <= self.finished]
+            self.blocked = [job for job in self.blocked if job not in released]
+            self.ready.extend(released)
+            self.condition.notify_all()
+
+    def fail(self, bakeable: str) -> list:
+        """Mark a job as failed and drop the jobs depending on it.
+
+        Returns:
+            list: The map ids of the dropped jobs.
+        """
+        with self.condition:
+            if (job := self.running.pop(bakeable, None)) is None:
+                return []
+            failed = set(job.provides)
+            dropped = []
+            while dependents := [job for job in self.blocked if job.requires & failed]:
+                for job in dependents:
+                    self.blocked.remove(job)
+                    failed.update(job.provides)
+                    dropped.append(job.map_id)
+            self.condition.notify_all()
+            return dropped
+
+    def empty(self) -> bool:
+        """Check that no job is left to dispatch."""
+        with self.condition:
+            return not self.ready and not self.blocked
+
+    def plan(self, workers: int) -> list:
+        """Simulate the dispatch of the pending jobs on ``workers`` workers.
+
+        Returns:
+            list: ``(worker, map_id, start, end)`` in dispatch order; start
+            and end are cumulated estimated costs.
+        """
+        with self.condition:
+            pending = self.ready + self.blocked
+            done = dict.fromkeys(self.finished, 0)
+            ranks = {job: self._rank(job) for job in pending}
+
+        free = [(0, worker) for worker in range(max(workers, 1))]
+        plan = []
+        while pending:
+            time, worker = heapq.heappop(free)
+            available = [job for job in pending if all(done.get(id, time + 1) <= time for id in job.requires)]
+            if not available:
+                # Wait for the earliest running job the pending ones depend on
+                waits = [done[id] for job in pending for id in job.requires if done.get(id, 0) > time]
+                if not waits:
+                    break
+                heapq.heappush(free, (min(waits), worker))
+                continue
+            job = max(available, key=ranks.get)
+            pending.remove(job)
+            end = time + job.cost
+            done.update(dict.fromkeys(job.provides, end))
+            plan.append((worker, job.map_id, time, end))
+            heapq.heappush(free, (end, worker))
+        return plan
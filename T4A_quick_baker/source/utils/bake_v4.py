@@ -1,4 +1,3 @@
-import json
 import os
 import sys
 import time
@@ -8,13 +7,13 @@ import bpy
 import numpy
 
 from ...qbpy import Collection, Image, Material, Modifier, Object, Property, ShaderNode
+from . import bake_ipc, channel_buffer
 from .map_v4 import Map
 from .udim_bake import Udim
 
 
 class Bake(Udim, Map):
     baked_maps = {}
-    TYPE_IMAGE = 0
 
     def prepare_render_settings(
         self, context, view_from: str = "ABOVE_SURFACE", samples: int = 1, tile_size: int = 2048
@@ -1321,8 +1320,7 @@ class Bake(Udim, Map):
         """
         if image_id := self.baked_maps.get(channel):
             channel_image = bpy.data.images[image_id]
-            print("QB: Baked Map")
-            sys.stdout.flush()
+            bake_ipc.map_baked()
             return channel_image
 
         origin_map_id = map.name
@@ -1422,9 +1420,12 @@ class Bake(Udim, Map):
                 file_format=map.channel_pack.bake.format if map.channel_pack.custom else self.bake_settings.format,
             )
 
+            if "<UDIM>" not in name:
+                # Hand the pixels over to the channel pack, see channel_buffer
+                channel_buffer.save_image(channel_image, channel_buffer.buffer_path(self.bake_path, name))
+
             self.baked_maps[channel] = f"{map.name}_{channel_label}"
-            print("QB: Baked Map")
-            sys.stdout.flush()
+            bake_ipc.map_baked()
 
         self.baked_maps.pop("CHANNEL_PACK", None)
         return channel_image
@@ -1447,77 +1448,91 @@ class Bake(Udim, Map):
             image = bpy.data.images.load(filepath, check_existing=False)
         return image
 
-    def pack_image_channels(self, context, map: bpy.types.PropertyGroup) -> bpy.types.Image:
-        image_rgb = image_r = image_g = image_b = image_a = None
+    def load_channel_pixels(self, image_id: str, file_format: str) -> numpy.ndarray:
+        """Get the pixels of a baked channel map.
 
-        file_format = map.channel_pack.bake.format if map.channel_pack.custom else self.bake_settings.format
-        if file_format == "OPEN_EXR":
-            file_format = "EXR"
+        Maps the raw buffer written by the worker that baked the channel. If
+        there is none, the saved image is loaded and converted to one, so it
+        can be packed in bands too.
+
+        Args:
+            image_id (str): The channel map id, with the UDIM tile if any.
+            file_format (str): File format of the saved channel map.
 
+        Returns:
+            numpy.ndarray: (height, width, 4) float32 pixels.
+        """
+        name = f"{self.index}_{image_id}"
+        path = channel_buffer.buffer_path(self.bake_path, name)
+        if (pixels := channel_buffer.load(path)) is not None:
+            return pixels
+
+        image = self.safe_load_image(f"{self.bake_path}{name}.{file_format.lower()}", check_existing=True)
+        if channel_buffer.save_image(image, path) and (pixels := channel_buffer.load(path)) is not None:
+            image.buffers_free()
+            return pixels
+        return channel_buffer.image_pixels(image)
+
+    def channel_pack_order(self, map: bpy.types.PropertyGroup) -> list:
+        """Get the channels of a channel pack.
+
+        Returns:
+            list: (channel map type, ((src_channel, dst_channel), ...)).
+        """
         if map.channel_pack.mode == "RGBA":
-            if id_image_r := self.baked_maps.get(map.channel_pack.r_channel):
-                path = f"{self.bake_path}{self.index}_{id_image_r}.{file_format.lower()}"
-                image_r = self.safe_load_image(path, check_existing=True)
-
-            if id_image_g := self.baked_maps.get(map.channel_pack.g_channel):
-                path = f"{self.bake_path}{self.index}_{id_image_g}.{file_format.lower()}"
-                image_g = self.safe_load_image(path, check_existing=True)
-
-            if id_image_b := self.baked_maps.get(map.channel_pack.b_channel):
-                path = f"{self.bake_path}{self.index}_{id_image_b}.{file_format.lower()}"
-                image_b = self.safe_load_image(path, check_existing=True)
-
-            if id_image_a := self.baked_maps.get(map.channel_pack.a_channel):
-                path = f"{self.bake_path}{self.index}_{id_image_a}.{file_format.lower()}"
-                image_a = self.safe_load_image(path, check_existing=True)
-
-            pack_order = [
-                (image_r, (0, 0)),
-                (image_g, (0, 1)),
-                (image_b, (0, 2)),
-                (image_a, (0, 3)),
-            ]
-        else:
-            if id_image_rgb := self.baked_maps.get(map.channel_pack.rgb_channel):
-                path = f"{self.bake_path}{self.index}_{id_image_rgb}.{file_format.lower()}"
-                image_rgb = self.safe_load_image(path, check_existing=True)
-            if id_image_a := self.baked_maps.get(map.channel_pack.a_channel):
-                path = f"{self.bake_path}{self.index}_{id_image_a}.{file_format.lower()}"
-                image_a = self.safe_load_image(path, check_existing=True)
-
-            pack_order = [
-                (image_rgb, (0, 0), (1, 1), (2, 2)),
-                (image_a, (0, 3)),
+            return [
+                (map.channel_pack.r_channel, ((0, 0),)),
+                (map.channel_pack.g_channel, ((0, 1),)),
+                (map.channel_pack.b_channel, ((0, 2),)),
+                (map.channel_pack.a_channel, ((0, 3),)),
             ]
+        return [
+            (map.channel_pack.rgb_channel, ((0, 0), (1, 1), (2, 2))),
+            (map.channel_pack.a_channel, ((0, 3),)),
+        ]
 
-        dst_array = None
+    def pack_channel_pixels(
+        self, map: bpy.types.PropertyGroup, file_format: str, scratch_path: str, udim: int = None
+    ) -> numpy.ndarray:
+        """Pack the baked channels of a channel pack within ``pack_memory_budget``.
 
-        # Build the packed pixel array
-        for pack_item in pack_order:
-            image = pack_item[0]
-            if not image:
-                continue
+        Args:
+            map (bpy.types.PropertyGroup): The channel pack map.
+            file_format (str): File format of the saved channel maps.
+            scratch_path (str): Scratch buffer used to pack in bands, to remove once packed.
+            udim (int, optional): UDIM tile to pack.
 
-            # Initialize arrays on the first iteration
-            if dst_array is None:
-                width, height = image.size
-                src_array = numpy.empty(width * height * 4, dtype=numpy.float32)
-                dst_array = numpy.ones(width * height * 4, dtype=numpy.float32)
+        Returns:
+            numpy.ndarray: (height, width, 4) float32 pixels, memory-mapped when packed in bands.
+        """
+        tile = "" if udim is None else f".{udim}"
+        sources = [
+            (self.load_channel_pixels(f"{image_id}{tile}", file_format), channels)
+            for channel, channels in self.channel_pack_order(map)
+            if (image_id := self.baked_maps.get(channel))
+        ]
+        return channel_buffer.pack(sources, scratch_path, self.pack_memory_budget)
 
-            assert image.size[:] == (width, height), "Images must be same size"
+    def pack_image_channels(self, context, map: bpy.types.PropertyGroup) -> bpy.types.Image:
+        file_format = map.channel_pack.bake.format if map.channel_pack.custom else self.bake_settings.format
+        if file_format == "OPEN_EXR":
+            file_format = "EXR"
 
-            # Fetch pixels from the source image and copy channels
-            image.pixels.foreach_get(src_array)
-            for src_chan, dst_chan in pack_item[1:]:
-                dst_array[dst_chan::4] = src_array[src_chan::4]
+        # Build the packed pixel array
+        scratch_path = channel_buffer.buffer_path(self.bake_path, f"{map.name}_packed")
+        pixels = self.pack_channel_pixels(map, file_format, scratch_path)
+        height, width = pixels.shape[:2]
+        has_alpha = bool(self.baked_maps.get(map.channel_pack.a_channel))
 
         # Create image from the packed pixels
-        image = Image.new_image(name=map.name, width=width, height=height, non_color=True, alpha=(image_a is not None))
+        image = Image.new_image(name=map.name, width=width, height=height, non_color=True, alpha=has_alpha)
         image.alpha_mode = "CHANNEL_PACKED"
-        image.pixels.foreach_set(dst_array)
+        image.pixels.foreach_set(pixels.reshape(-1))
         image.pack()
+        del pixels
+        channel_buffer.remove(scratch_path)
         self.baked_maps[map.type] = map.name
-        print("QB: Baked Map")
+        bake_ipc.map_baked()
         return image
 
     def pack_udim_image_channels(self, context, map: bpy.types.PropertyGroup) -> bpy.types.Image:
@@ -1552,88 +1567,20 @@ class Bake(Udim, Map):
         for udim in self.udims:
             dest_image = self.safe_load_image(f"{self.bake_path}{map.name}.{udim}.png")
 
-            if map.channel_pack.mode == "RGBA":
-                red_image = green_image = blue_image = alpha_image = None
-                if id_image_r := self.baked_maps.get(map.channel_pack.r_channel):
-                    if image_r := self.safe_load_image(
-                        f"{self.bake_path}{self.index}_{id_image_r}.{udim}.{file_format.lower()}"
-                    ):
-                        red_image = image_r
-
-                if id_image_g := self.baked_maps.get(map.channel_pack.g_channel):
-                    if image_g := self.safe_load_image(
-                        f"{self.bake_path}{self.index}_{id_image_g}.{udim}.{file_format.lower()}"
-                    ):
-                        green_image = image_g
-
-                if id_image_b := self.baked_maps.get(map.channel_pack.b_channel):
-                    if image_b := self.safe_load_image(
-                        f"{self.bake_path}{self.index}_{id_image_b}.{udim}.{file_format.lower()}"
-                    ):
-                        blue_image = image_b
-
-                if id_image_a := self.baked_maps.get(map.channel_pack.a_channel):
-                    if image_a := self.safe_load_image(
-                        f"{self.bake_path}{self.index}_{id_image_a}.{udim}.{file_format.lower()}"
-                    ):
-                        alpha_image = image_a
-
-                pack_order = [
-                    (red_image, (0, 0)),
-                    (green_image, (0, 1)),
-                    (blue_image, (0, 2)),
-                    (alpha_image, (0, 3)),
-                ]
-            else:
-                rgb_image = alpha_image = None
-                if id_image_rgb := self.baked_maps.get(map.channel_pack.rgb_channel):
-                    if image_rgb := self.safe_load_image(
-                        f"{self.bake_path}{self.index}_{id_image_rgb}.{udim}.{file_format.lower()}"
-                    ):
-                        rgb_image = image_rgb
-
-                if id_image_a := self.baked_maps.get(map.channel_pack.a_channel):
-                    if image_a := self.safe_load_image(
-                        f"{self.bake_path}{self.index}_{id_image_a}.{udim}.{file_format.lower()}"
-                    ):
-                        alpha_image = image_a
-
-                pack_order = [
-                    (rgb_image, (0, 0), (1, 1), (2, 2)),
-                    (alpha_image, (0, 3)),
-                ]
-
-            dst_array = None
-            has_alpha = False
-
             # Build the packed pixel array
-            for pack_item in pack_order:
-                src_image = pack_item[0]
-                if not src_image:
-                    continue
-
-                # Initialize arrays on the first iteration
-                if dst_array is None:
-                    width, height = src_image.size
-                    src_array = numpy.empty(width * height * 4, dtype=numpy.float32)
-                    dst_array = numpy.ones(width * height * 4, dtype=numpy.float32)
-
-                assert src_image.size[:] == (width, height), "Images must be same size"
-
-                # Fetch pixels from the source src_image and copy channels
-                src_image.pixels.foreach_get(src_array)
-                for src_chan, dst_chan in pack_item[1:]:
-                    if dst_chan == 3:
-                        has_alpha = True
-                    dst_array[dst_chan::4] = src_array[src_chan::4]
-            dest_image.pixels.foreach_set(dst_array)
+            scratch_path = channel_buffer.buffer_path(self.bake_path, f"{map.name}.{udim}_packed")
+            pixels = self.pack_channel_pixels(map, file_format, scratch_path, udim=udim)
+            dest_image.pixels.foreach_set(pixels.reshape(-1))
             dest_image.pack()
             dest_image.save()
+            dest_image.buffers_free()
+            del pixels
+            channel_buffer.remove(scratch_path)
 
         image.pack()
         image.reload()
         self.baked_maps[map.type] = map.name
-        print("QB: Baked Map")
+        bake_ipc.map_baked()
         return image
 
     def setup_channel_pack(self, context, map: bpy.types.PropertyGroup, channel):
@@ -1718,8 +1665,7 @@ class Bake(Udim, Map):
                     or map.combined.use_pass_emit
                 )
             ):
-                print("QB: Baked Map (Skipped not valid)")
-                sys.stdout.flush()
+                bake_ipc.map_baked(skipped=True)
                 return
             return func(context, map)
 
@@ -1858,8 +1804,7 @@ class Bake(Udim, Map):
 
             Image.save_image(image=image, path=self.bake_path, name=name)
 
-            print("QB: Baked Map")
-            sys.stdout.flush()
+            bake_ipc.map_baked()
 
     def passthrough_image(
         self,
@@ -1928,19 +1873,17 @@ class Bake(Udim, Map):
         source = "TILED" if self.bake_settings.use_auto_udim and len(self.udims) > 1 else "FILE"
         color_space = "sRGB" if image.alpha_mode == "CHANNEL_PACKED" else image.colorspace_settings.name
 
-        print("%s\n" % json.dumps({
-            "type": self.TYPE_IMAGE,
-            "active_bake_group_index": self.index,
-            "name": batch_name,
-            "suffix": suffix,
-            "path": filepath,
-            "source": source,
-            "color_space": color_space,
-            "alpha_mode": image.alpha_mode,
-            "map_name": map_name,
-        }))
-
-        sys.stdout.flush()
+        bake_ipc.send(
+            bake_ipc.IMAGE,
+            active_bake_group_index=self.index,
+            name=batch_name,
+            suffix=suffix,
+            path=filepath,
+            source=source,
+            color_space=color_space,
+            alpha_mode=image.alpha_mode,
+            map_name=map_name,
+        )
 
     def save_map_image(
         self,
@@ -0,0 +1,183 @@
+"""Raw pixel buffers handed over between bake workers for channel packing.
+
+The worker baking a channel of a channel pack also writes the channel pixels
+to ``<bake_path><name>.qbraw``: a NumPy ``.npy`` file of shape
+``(height, width, 4)`` float32, filled through a memory map and renamed into
+place once complete. The worker packing the channels maps these files and
+copies their channels straight into one preallocated RGBA array, without
+decoding the saved images or polling for them: the scheduler only dispatches
+a channel pack once its channels are baked.
+
+Packing is bounded by a memory budget. When the packed buffer and its
+sources do not fit in it, the channels are copied in row bands into a
+memory-mapped scratch buffer, flushed after each band. Only mapped file
+pages are touched then, which the system can write back and reclaim, so a
+16K map packs without holding its 4 GiB float buffers in memory.
+"""
+
+import contextlib
+import glob
+import os
+
+import numpy
+
+SUFFIX = ".qbraw"
+MIB = 1024 * 1024
+
+
+def buffer_path(bake_path: str, name: str) -> str:
+    """Get the path of the raw buffer of a baked channel.
+
+    Args:
+        bake_path: Directory the maps are baked to, with a trailing separator.
+        name: Name of the channel image (``<index>_<map_id>``).
+
+    Returns:
+        str: Path of the raw buffer.
+    """
+    return f"{bake_path}{name}{SUFFIX}"
+
+
+def save_image(image, path: str) -> bool:
+    """Write the pixels of an image to a raw buffer.
+
+    Args:
+        image (bpy.types.Image): The image.
+        path: Path of the raw buffer (see :func:`buffer_path`).
+
+    Returns:
+        bool: True if the buffer was written.
+    """
+    width, height = image.size
+    temp_path = f"{path}.tmp"
+    try:
+        pixels = numpy.lib.format.open_memmap(temp_path, mode="w+", dtype=numpy.float32, shape=(height, width, 4))
+        image.pixels.foreach_get(pixels.reshape(-1))
+        pixels.flush()
+        del pixels  # close the mapping before the rename (Windows)
+        os.replace(temp_path, path)
+    except (OSError, ValueError, RuntimeError) as err:
+        print(f"QB: Failed to write {path}: {err}")
+        remove(temp_path)
+        return False
+    return True
+
+
+def load(path: str) -> numpy.ndarray:
+    """Map a raw buffer read-only.
+
+    Args:
+        path: Path of the raw buffer.
+
+    Returns:
+        numpy.ndarray: ``(height, width, 4)`` float32 pixels, None if the buffer is missing or invalid.
+    """
+    try:
+        pixels = numpy.load(path, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    if pixels.dtype != numpy.float32 or pixels.ndim != 3 or pixels.shape[2] != 4:
+        return None
+    return pixels
+
+
+def image_pixels(image) -> numpy.ndarray:
+    """Get the pixels of an image, for channels without raw buffer.
+
+    Args:
+        image (bpy.types.Image): The image.
+
+    Returns:
+        numpy.ndarray: ``(height, width, 4)`` float32 pixels.
+    """
+    width, height = image.size
+    pixels = numpy.empty((height, width, 4), dtype=numpy.float32)
+    image.pixels.foreach_get(pixels.reshape(-1))
+    return pixels
+
+
+def band_rows(width: int, buffers: int, budget: int) -> int:
+    """Get the number of rows to pack at once.
+
+    Args:
+        width: Width of the buffers.
+        buffers: Number of buffers read or written per row.
+        budget: Memory budget in bytes.
+
+    Returns:
+        int: Rows per band, at least one.
+    """
+    return max(1, budget // (width * 4 * numpy.dtype(numpy.float32).itemsize * buffers))
+
+
+def pack_channels(sources: list, out: numpy.ndarray = None, rows: int = None) -> numpy.ndarray:
+    """Copy channels of several buffers into one RGBA buffer.
+
+    Args:
+        sources: ``(pixels, ((src_channel, dst_channel), ...))`` with ``(height, width, 4)`` pixels.
+        out: Buffer to pack into, a new array by default.
+        rows: Rows copied at once, all of them by default. A memory-mapped ``out`` is flushed after each band.
+
+    Returns:
+        numpy.ndarray: ``(height, width, 4)`` float32 pixels, 1.0 in the channels without source.
+
+    Raises:
+        ValueError: No source, or sources of different sizes.
+    """
+    if not sources:
+        raise ValueError("No channel to pack")
+
+    shape = sources[0][0].shape
+    if any(pixels.shape != shape for pixels, _ in sources):
+        raise ValueError("Images must be same size")
+
+    packed = numpy.empty(shape, dtype=numpy.float32) if out is None else out
+    rows = rows or shape[0]
+    for start in range(0, shape[0], rows):
+        band = packed[start : start + rows]
+        band.fill(1.0)
+        for pixels, channels in sources:
+            for src_channel, dst_channel in channels:
+                band[..., dst_channel] = pixels[start : start + rows, :, src_channel]
+        if isinstance(packed, numpy.memmap):
+            packed.flush()
+    return packed
+
+
+def pack(sources: list, scratch_path: str, budget: int) -> numpy.ndarray:
+    """Pack channels within a memory budget.
+
+    Args:
+        sources: See :func:`pack_channels`.
+        scratch_path: Scratch buffer used when packing in memory exceeds the budget.
+        budget: Memory budget in MiB.
+
+    Returns:
+        numpy.ndarray: ``(height, width, 4)`` float32 pixels, memory-mapped from
+        ``scratch_path`` when packed in bands.
+
+    Raises:
+        ValueError: No source, or sources of different sizes.
+    """
+    if not sources:
+        raise ValueError("No channel to pack")
+
+    height, width = sources[0][0].shape[:2]
+    budget *= MIB
+    if band_rows(width, len(sources) + 1, budget) >= height:
+        return pack_channels(sources)
+
+    out = numpy.lib.format.open_memmap(scratch_path, mode="w+", dtype=numpy.float32, shape=(height, width, 4))
+    return pack_channels(sources, out=out, rows=band_rows(width, len(sources) + 1, budget))
+
+
+def remove(path: str):
+    """Remove a buffer, if possible."""
+    with contextlib.suppress(OSError):
+        os.remove(path)
+
+
+def remove_buffers(bake_path: str):
+    """Remove the raw buffers left in a bake directory."""
+    for path in glob.glob(f"{glob.escape(bake_path)}*{SUFFIX}*"):
+        remove(path)
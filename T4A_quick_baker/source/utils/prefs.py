@@ -1,5 +1,5 @@
 import bpy
-from bpy.props import BoolProperty, FloatVectorProperty, PointerProperty, StringProperty
+from bpy.props import BoolProperty, FloatVectorProperty, IntProperty, PointerProperty, StringProperty
 from bpy.types import AddonPreferences, PropertyGroup
 
 from .addon import package
@@ -24,6 +24,28 @@ class QBAKER_AP_bake(PropertyGroup):
         default=False,
     )
 
+    use_worker_pool: BoolProperty(
+        name="Keep Workers Warm",
+        description="Keep the background Blender processes running between bakes, so the next bake skips Blender startup\nThe temp blend file is reloaded only when it changed",
+        default=True,
+    )
+
+    worker_idle_timeout: IntProperty(
+        name="Idle Timeout (min)",
+        description="Close the warm background processes after this many minutes without baking",
+        default=10,
+        min=1,
+        max=240,
+    )
+
+    pack_memory_budget: IntProperty(
+        name="Packing Memory (MiB)",
+        description="Memory a worker may use to pack the channels of a map\nLarger maps are packed in row bands through scratch files next to the baked maps",
+        default=1024,
+        min=64,
+        max=65536,
+    )
+
 
 class QBAKER_AP_cage(PropertyGroup):
     color: FloatVectorProperty(
@@ -69,6 +91,13 @@ class QBAKER_AP_preferences(AddonPreferences):
         col.prop(self.qbaker.bake, "use_auto_udim")
         col.prop(self.qbaker.bake, "use_remove_disabled_maps")
 
+        col = layout.column(heading="Workers")
+        col.prop(self.qbaker.bake, "use_worker_pool")
+        sub = col.column()
+        sub.active = self.qbaker.bake.use_worker_pool
+        sub.prop(self.qbaker.bake, "worker_idle_timeout")
+        col.prop(self.qbaker.bake, "pack_memory_budget")
+
         col = layout.column(heading="Cage")
         col.prop(self.qbaker.cage, "color")
         col.prop(self.qbaker.cage, "show_wireframe")